@@ -0,0 +1,58 @@
+"""
+Microbenchmark per page extraction time: per element WebDriver calls vs one execute_script
+
+Serves the local fixture site, opens one listing page in headless Chrome and times both
+extraction paths of ActuaryListScraper on it. Needs Chrome installed.
+
+    python benchmark_extraction.py --repeat 5
+"""
+
+import argparse
+import threading
+import time
+
+from selenium.webdriver.common.by import By
+
+from fixture_site import serve
+from scrape import ActuaryListScraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare per page job card extraction time')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    server = serve(0, 1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    scraper = ActuaryListScraper(headless=True)
+    driver = scraper.create_driver()
+    try:
+        driver.get(f'http://127.0.0.1:{server.server_port}/?page=1')
+
+        def per_element():
+            return [scraper.extract_job_data(article) for article in driver.find_elements(By.TAG_NAME, 'article')]
+
+        def single_call():
+            return scraper.extract_page_jobs(driver)
+
+        assert per_element() == single_call(), 'Both extraction paths must produce the same jobs'
+
+        results = {}
+        for label, extract in (('per element', per_element), ('single execute_script', single_call)):
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                jobs = extract()
+                timings.append(time.perf_counter() - start)
+            results[label] = min(timings)
+            print(f"{label:<24}{min(timings) * 1000:>10.1f} ms per page ({len(jobs)} cards)")
+
+        print(f"\nSpeedup: {results['per element'] / results['single execute_script']:.1f}x")
+    finally:
+        driver.quit()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Persistent store of listings already seen by the scraper, used by the incremental mode
+
+Maps each listing's (title, company) key to a hash of its title, company, location and tags,
+so a crawl can tell new and changed listings from known ones without touching the database.
+"""
+
+import hashlib
+import json
+import os
+
+
+def listing_key(job_data):
+    return f"{job_data['title']}\x1f{job_data['company']}"
+
+
+def listing_fingerprint(job_data):
+    """Hash of the fields that make a listing count as changed"""
+    fields = (job_data['title'], job_data['company'], job_data.get('location') or '', job_data.get('tags') or '')
+    return hashlib.sha1('\x1f'.join(fields).encode('utf-8')).hexdigest()
+
+
+class FingerprintStore:
+    def __init__(self, path):
+        self.path = path
+        self.fingerprints = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as state:
+                self.fingerprints = json.load(state)
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+    def is_known(self, job_data):
+        """True when the listing was seen before with the same fingerprint"""
+        return self.fingerprints.get(listing_key(job_data)) == listing_fingerprint(job_data)
+
+    def update(self, jobs_data):
+        for job_data in jobs_data:
+            self.fingerprints[listing_key(job_data)] = listing_fingerprint(job_data)
+
+    def save(self):
+        """Write the store atomically so a crash never leaves a truncated file"""
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as state:
+            json.dump(self.fingerprints, state)
+        os.replace(temp_path, self.path)
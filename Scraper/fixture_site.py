@@ -0,0 +1,153 @@
+"""
+Local stand-in for actuarylist.com used to try the scraper without hitting the real site
+
+Serves numbered listing pages (/?page=N) of generated job cards using the same markup and
+CSS classes the scraper looks for, with a Next button on every page but the last. With
+--embed-json the pages also carry the listings as Next.js style __NEXT_DATA__ JSON, and
+--pages-dir serves saved copies of real pages (page-1.html, page-2.html, ...) instead.
+
+    python fixture_site.py --port 8000 --pages 20
+    python scrape.py --url http://localhost:8000/ --page-url "http://localhost:8000/?page={page}" --workers 4 --pages 20
+    python scrape.py --mode http --url http://localhost:8000/ --workers 8 --pages 20
+
+Point DATABASE_URL at a SQLite file to keep the scraped rows out of the real database.
+"""
+
+import argparse
+import html
+import json
+import os
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+JOBS_PER_PAGE = 30
+TITLES = ['Pricing Actuary', 'Reserving Analyst', 'Actuarial Intern', 'Senior Life Actuary',
+          'Part-time Pension Consultant', 'Capital Modelling Contractor']
+COMPANIES = ['Acme Re', 'Northwind Life', 'Contoso Insurance', 'Fabrikam Mutual', 'Globex Partners']
+LOCATIONS = [['London', 'UK'], ['New York', 'USA'], ['Remote'], ['Toronto', 'Canada']]
+TAGS = [['Life', 'Pricing'], ['P&C', 'Reserving'], ['Pension'], ['Health', 'Excel', 'SQL']]
+POSTED = ['1 day ago', '2 days ago', '1 week ago', 'Recently posted']
+
+
+def fixture_job(page, position):
+    """Deterministic job for a card position, every (page, position) gives a distinct listing"""
+    n = (page - 1) * JOBS_PER_PAGE + position
+    return {
+        'title': f'{TITLES[n % len(TITLES)]} {n}',
+        'company': COMPANIES[n % len(COMPANIES)],
+        'locations': LOCATIONS[n % len(LOCATIONS)],
+        'salary': f'${50 + n % 100}k' if n % 3 == 0 else None,
+        'posted': POSTED[n % len(POSTED)],
+        'tags': TAGS[n % len(TAGS)],
+    }
+
+
+def render_card(job):
+    locations = ''.join(f'<p>{html.escape(location)}</p>' for location in job['locations'])
+    if job['salary']:
+        locations += f'<p>\U0001F4B0 {html.escape(job["salary"])}</p>'
+    tags = ''.join(f'<a href="#">{html.escape(tag)}</a> ' for tag in job['tags'])
+    return (
+        '<article class="Job_job-card__x">'
+        f'<p class="Job_job-card__company__7T9qY">{html.escape(job["company"])}</p>'
+        f'<p class="Job_job-card__position__ic1rc">{html.escape(job["title"])}</p>'
+        f'<div class="Job_job-card__locations__x1exr">{locations}</div>'
+        f'<p class="Job_job-card__posted-on__NCZaJ">{html.escape(job["posted"])}</p>'
+        f'<div class="Job_job-card__tags__zfriA">{tags}</div>'
+        '</article>'
+    )
+
+
+def render_page_data(jobs):
+    """Embedded page data in the shape of a Next.js __NEXT_DATA__ script"""
+    data = {'props': {'pageProps': {'jobs': [
+        {
+            'position': job['title'],
+            'company': {'name': job['company']},
+            'locations': job['locations'],
+            'postedOn': job['posted'],
+            'tags': [{'name': tag} for tag in job['tags']],
+        }
+        for job in jobs
+    ]}}}
+    payload = json.dumps(data).replace('</', '<\\/')
+    return f'<script id="__NEXT_DATA__" type="application/json">{payload}</script>'
+
+
+def render_page(page, total_pages, embed_json=False):
+    jobs = [fixture_job(page, position) for position in range(JOBS_PER_PAGE)]
+    cards = '\n'.join(render_card(job) for job in jobs)
+    next_button = ''
+    if page < total_pages:
+        next_button = f'<button class="relative" onclick="location.href=\'/?page={page + 1}\'">Next</button>'
+    page_data = render_page_data(jobs) if embed_json else ''
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Actuary List fixture</title></head>'
+        f'<body><main>{cards}</main><nav>{next_button}</nav>{page_data}</body></html>'
+    )
+
+
+def load_page(page, total_pages, embed_json=False, pages_dir=None):
+    """HTML of a listing page or None when it does not exist"""
+    if pages_dir:
+        path = os.path.join(pages_dir, f'page-{page}.html')
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as saved:
+            return saved.read()
+
+    if not 1 <= page <= total_pages:
+        return None
+    return render_page(page, total_pages, embed_json)
+
+
+def make_handler(total_pages, embed_json=False, pages_dir=None):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            try:
+                page = int(query.get('page', ['1'])[0])
+            except ValueError:
+                page = 1
+
+            page_html = load_page(page, total_pages, embed_json, pages_dir)
+            if page_html is None:
+                self.send_error(404, 'No such page')
+                return
+
+            body = page_html.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def serve(port=8000, pages=20, embed_json=False, pages_dir=None):
+    """Create the fixture server, call serve_forever() on the result (port 0 picks a free port)"""
+    return ThreadingHTTPServer(('127.0.0.1', port), make_handler(pages, embed_json, pages_dir))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a local stand-in for actuarylist.com')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--embed-json', action='store_true', help='Also embed the listings as __NEXT_DATA__ JSON')
+    parser.add_argument('--pages-dir', default=None, help='Serve saved pages named page-N.html from this directory')
+    args = parser.parse_args()
+
+    server = serve(args.port, args.pages, args.embed_json, args.pages_dir)
+    print(f"Fixture site with {args.pages} pages at http://127.0.0.1:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Parse job cards out of a listing page fetched over plain HTTP
+
+Prefers the JSON the page embeds for client side rendering (Next.js __NEXT_DATA__) and falls
+back to parsing the card markup. Both return raw cards in the shape used by
+ActuaryListScraper.build_job_data: company, title, locations, posted and tags, None when missing.
+"""
+
+import json
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+TITLE_KEYS = ('position', 'title', 'jobTitle')
+COMPANY_KEYS = ('company', 'companyName', 'company_name')
+LOCATION_KEYS = ('locations', 'location')
+POSTED_KEYS = ('postedOn', 'posted_on', 'postedAt', 'posted', 'date')
+
+
+def parse_cards(html):
+    """Return the raw job cards of a listing page"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    cards = cards_from_embedded_json(soup)
+    if cards is None:
+        cards = cards_from_html(soup)
+    return cards
+
+
+def cards_from_embedded_json(soup):
+    """Cards from the embedded page data, None when the page has none we recognize"""
+    script = soup.find('script', id='__NEXT_DATA__')
+    if script is None or not script.string:
+        return None
+    try:
+        data = json.loads(script.string)
+    except ValueError:
+        return None
+
+    jobs = find_job_list(data)
+    if jobs is None:
+        return None
+    return [card_from_json(job) for job in jobs]
+
+
+def find_job_list(node):
+    """Depth first search for the first list of objects that look like job listings"""
+    if isinstance(node, list):
+        if node and all(isinstance(item, dict) for item in node) and looks_like_job(node[0]):
+            return node
+        children = node
+    elif isinstance(node, dict):
+        children = node.values()
+    else:
+        return None
+
+    for child in children:
+        found = find_job_list(child)
+        if found is not None:
+            return found
+    return None
+
+
+def looks_like_job(item):
+    return any(key in item for key in TITLE_KEYS) and any(key in item for key in COMPANY_KEYS)
+
+
+def first_value(item, keys):
+    for key in keys:
+        if item.get(key) is not None:
+            return item[key]
+    return None
+
+
+def as_text(value):
+    """Flatten a JSON value (string, {name: ...} object or list of them) to card text lines"""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('title') or ''
+    if isinstance(value, list):
+        return '\n'.join(filter(None, (as_text(item) for item in value)))
+    return str(value)
+
+
+def card_from_json(job):
+    tags = first_value(job, ('tags', 'keywords'))
+    return {
+        'company': as_text(first_value(job, COMPANY_KEYS)),
+        'title': as_text(first_value(job, TITLE_KEYS)),
+        'locations': as_text(first_value(job, LOCATION_KEYS)),
+        'posted': as_text(first_value(job, POSTED_KEYS)),
+        'tags': [as_text(tag) for tag in tags] if isinstance(tags, list) else None,
+    }
+
+
+def cards_from_html(soup):
+    """Cards from the article markup, the same selectors the WebDriver extraction uses"""
+    def text(root, selector):
+        element = root.select_one(selector)
+        return element.get_text('\n', strip=True) if element is not None else None
+
+    cards = []
+    for article in soup.find_all('article'):
+        tags_div = article.select_one('div.Job_job-card__tags__zfriA')
+        cards.append({
+            'company': text(article, 'p.Job_job-card__company__7T9qY'),
+            'title': text(article, 'p.Job_job-card__position__ic1rc'),
+            'locations': text(article, 'div.Job_job-card__locations__x1exr'),
+            'posted': text(article, 'p.Job_job-card__posted-on__NCZaJ'),
+            'tags': [a.get_text(strip=True) for a in tags_div.find_all('a')] if tags_div is not None else None,
+        })
+    return cards
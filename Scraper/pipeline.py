@@ -0,0 +1,104 @@
+"""
+Producer/consumer pipeline between page extraction and the database
+
+The scraper puts each page's jobs on a bounded queue while a writer thread upserts them in
+the background, so the browser moves on to the next page during the DB write and memory
+stays bounded by the queue size. A checkpoint file records the last page written so an
+interrupted crawl can resume after it.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+from bulk import upsert_jobs
+
+
+class Checkpoint:
+    """Last fully saved page of a crawl, keyed by the listing URL"""
+
+    def __init__(self, path, url):
+        self.path = path
+        self.url = url
+
+    def load(self):
+        """Return the last saved page for this URL, 0 when there is no matching checkpoint"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding='utf-8') as checkpoint:
+            data = json.load(checkpoint)
+        return data.get('last_page', 0) if data.get('url') == self.url else 0
+
+    def save(self, page):
+        if not self.path:
+            return
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as checkpoint:
+            json.dump({'url': self.url, 'last_page': page, 'saved_at': time.strftime('%Y-%m-%d %H:%M:%S')}, checkpoint)
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ScrapePipeline:
+    """Bounded queue of (page, jobs) drained by a writer thread that upserts each page"""
+
+    def __init__(self, app, checkpoint=None, max_pending_pages=4, on_saved=None):
+        self.app = app
+        self.checkpoint = checkpoint
+        self.on_saved = on_saved
+        self.queue = queue.Queue(maxsize=max_pending_pages)
+        self.counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'expired': 0}
+        self.rows_written = 0
+        self.write_time = 0.0
+        self.error = None
+        self._writer = threading.Thread(target=self._write_loop, name='scrape-db-writer', daemon=True)
+
+    def start(self):
+        self._writer.start()
+        return self
+
+    def put(self, page, jobs):
+        """Queue a page for writing, blocks while the writer is max_pending_pages behind"""
+        if self.error is not None:
+            raise RuntimeError(f"Database writer failed: {self.error}")
+        self.queue.put((page, jobs))
+
+    def close(self):
+        """Wait for every queued page to be written and return the upsert counts"""
+        self.queue.put(None)
+        self._writer.join()
+        return self.counts
+
+    def _write_loop(self):
+        with self.app.app_context():
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                # After a failure keep draining so the producer never blocks on a full queue
+                if self.error is not None:
+                    continue
+
+                page, jobs = item
+                try:
+                    started = time.perf_counter()
+                    counts = upsert_jobs(jobs) if jobs else {}
+                    self.write_time += time.perf_counter() - started
+                except Exception as e:
+                    self.error = str(e)
+                    print(f"  Error saving page {page}: {self.error}")
+                    continue
+
+                for name, value in counts.items():
+                    self.counts[name] += value
+                self.rows_written += len(jobs)
+                if self.checkpoint is not None:
+                    self.checkpoint.save(page)
+                if self.on_saved is not None:
+                    self.on_saved(page, jobs)
+                print(f"  Saved page {page}: {counts.get('inserted', 0)} new, {counts.get('updated', 0)} updated")
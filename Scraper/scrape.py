@@ -11,9 +11,17 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.chrome.options import Options
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import re
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from itertools import islice
+import argparse
+import threading
 import sys
 import os
 
@@ -24,42 +32,120 @@ sys.path.insert(0, backend_dir)
 
 from flask import Flask
 from flask_cors import CORS
-from config import Config
+from config import get_config
 from db import db
-from models.job import Job
+from models.job import parse_posting_date
+from bulk import upsert_jobs, touch_jobs
+from page_parser import parse_cards
+from fingerprints import FingerprintStore
+from pipeline import ScrapePipeline, Checkpoint
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Returns the raw text of every job card on the page in one WebDriver round-trip,
+# null marks a missing element so defaults match the per element extraction
+EXTRACT_CARDS_SCRIPT = """
+const text = (root, selector) => {
+    const element = root.querySelector(selector);
+    return element ? element.innerText : null;
+};
+return Array.from(document.querySelectorAll('article')).map(article => {
+    const tagsDiv = article.querySelector('div.Job_job-card__tags__zfriA');
+    return {
+        company: text(article, 'p.Job_job-card__company__7T9qY'),
+        title: text(article, 'p.Job_job-card__position__ic1rc'),
+        locations: text(article, 'div.Job_job-card__locations__x1exr'),
+        posted: text(article, 'p.Job_job-card__posted-on__NCZaJ'),
+        tags: tagsDiv ? Array.from(tagsDiv.querySelectorAll('a')).map(a => a.innerText) : null
+    };
+});
+"""
+
+def element_text(element, selector):
+    """Text of the first match of a CSS selector inside element or None when there is none"""
+    try:
+        return element.find_element(By.CSS_SELECTOR, selector).text
+    except Exception:
+        return None
 
 def create_app():
     """Create Flask app for database operations"""
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(get_config())
     CORS(app)
     db.init_app(app)
     return app
 
+class RateLimiter:
+    """Global politeness limit shared by all scraper workers, at most one page load per interval"""
+    
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+    
+    def wait(self):
+        """Block until the calling worker is allowed to load the next page"""
+        with self._lock:
+            now = time.monotonic()
+            wait_for = self._next_allowed - now
+            self._next_allowed = max(now, self._next_allowed) + self.min_interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
 class ActuaryListScraper:
-    def __init__(self, headless=True):
-        """Initialize the scraper with Chrome WebDriver"""
-        self.url = "https://www.actuarylist.com/"
+    def __init__(self, headless=True, url=None, page_url_template=None, delay=1.0,
+                 state_file=None, stop_after_pages=2):
+        """Initialize the scraper with Chrome WebDriver
+        
+        page_url_template (e.g. "https://site/?page={page}") lets parallel workers open their
+        pages directly, without it they reach their first page by clicking Next.
+        delay is the minimum number of seconds between page loads across all workers.
+        state_file turns on the incremental mode: listings recorded there with the same
+        fingerprint are skipped, only their last_seen_at is refreshed, and the crawl stops after
+        stop_after_pages consecutive pages with nothing new or changed.
+        """
+        self.url = url or "https://www.actuarylist.com/"
+        self.page_url_template = page_url_template
         self.driver = None
         self.jobs_data = []
         self.headless = headless
         self.failed_extractions = []
+        self.seen_keys = set()  # (title, company) of every collected job, shared by the workers
+        self.rate_limiter = RateLimiter(delay)
+        self._lock = threading.Lock()
         
-    def setup_driver(self):
-        """Configure and return Chrome WebDriver"""
+        # Incremental mode state
+        self.fingerprints = FingerprintStore(state_file) if state_file else None
+        self.stop_after_pages = stop_after_pages
+        self.unchanged_count = 0
+        self.known_keys = []  # (title, company) of the skipped listings, marked as seen after the crawl
+        self.stale_pages = 0
+        
+        # Streaming mode state, see run()
+        self.pipeline = None
+        self.streamed_count = 0
+    
+    def create_driver(self, headless=None):
+        """Configure and return a new Chrome WebDriver"""
         chrome_options = Options()
         
-        if self.headless:
+        if self.headless if headless is None else headless:
             chrome_options.add_argument('--headless=new')
         
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        chrome_options.add_argument(f'--user-agent={USER_AGENT}')
         chrome_options.add_argument('--window-size=1920,1080')
         
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.set_page_load_timeout(30)
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.set_page_load_timeout(30)
+        return driver
+        
+    def setup_driver(self):
+        """Configure the Chrome WebDriver used by the sequential mode"""
+        self.driver = self.create_driver()
         print("✓ WebDriver initialized successfully")
         
     def load_page(self):
@@ -86,59 +172,87 @@ class ActuaryListScraper:
             print(f"Error loading page: {str(e)}")
             return False
     
-    def scroll_and_load_more(self, target_pages=10):
+    def click_next(self, driver):
+        """Click the Next button and wait for the next page, returns False when there is none"""
+        #Scroll to bottom first to ensure that the pagination is visible
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        time.sleep(2)
+        
+        # Try multiple selectors for the Next button
+        next_button = None
+        selectors = [
+            (By.XPATH, "//button[contains(text(), 'Next')]"),
+            (By.CSS_SELECTOR, "button:contains('Next')"),
+            (By.XPATH, "//button[contains(@class, 'relative') and contains(text(), 'Next')]"),
+        ]
+        
+        for selector_type, selector in selectors:
+            try:
+                next_button = driver.find_element(selector_type, selector)
+                if next_button.is_displayed():
+                    break
+            except:
+                continue
+        
+        if not (next_button and next_button.is_displayed() and next_button.is_enabled()):
+            return False
+        
+        # Scroll to button
+        driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
+        time.sleep(1)
+        
+        # Click 
+        driver.execute_script("arguments[0].click();", next_button)
+        
+        # Wait for new jobs to load 
+        try:
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.TAG_NAME, "article"))
+            )
+            time.sleep(2)  # Small buffer for full render
+        except TimeoutException:
+            time.sleep(4)  # Fallback to fixed wait
+        return True
+    
+    def skip_to_page(self, page):
+        """Move the loaded listing to a later page without scraping, used when resuming"""
+        print(f"\nResuming at page {page}...")
+        if self.page_url_template:
+            self.driver.get(self.page_url(page))
+            WebDriverWait(self.driver, 20).until(
+                EC.presence_of_element_located((By.TAG_NAME, "article"))
+            )
+            return True
+        for _ in range(page - 1):
+            if not self.click_next(self.driver):
+                return False
+        return True
+    
+    def scroll_and_load_more(self, target_pages=10, start_page=1):
         """Click the Next button to load more pages and scrape each page"""
         print(f"\nLoading and scraping multiple pages (target: {target_pages} pages)...")
+        started = time.perf_counter()
+        
+        if start_page > 1 and not self.skip_to_page(start_page):
+            print("  Could not reach the resume page")
+            return 0
         
         # Scrape the first page
-        print(f"\nScraping page 1...")
-        self.scrape_current_page()
-        pages_loaded = 1
+        print(f"\nScraping page {start_page}...")
+        page_jobs_count = self.scrape_current_page()
+        self.flush_page(start_page)
+        pages_loaded = start_page
         
-        while pages_loaded < target_pages:
+        while pages_loaded < target_pages and not self.should_stop(page_jobs_count):
             try:
-                #Scroll to bottom first to ensure that the pagination is visible
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                
-                # Try multiple selectors for the Next button
-                next_button = None
-                selectors = [
-                    (By.XPATH, "//button[contains(text(), 'Next')]"),
-                    (By.CSS_SELECTOR, "button:contains('Next')"),
-                    (By.XPATH, "//button[contains(@class, 'relative') and contains(text(), 'Next')]"),
-                ]
-                
-                for selector_type, selector in selectors:
-                    try:
-                        next_button = self.driver.find_element(selector_type, selector)
-                        if next_button.is_displayed():
-                            break
-                    except:
-                        continue
-                
-                if next_button and next_button.is_displayed() and next_button.is_enabled():
-                    # Scroll to button
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-                    time.sleep(1)
-                    
-                    # Click 
-                    self.driver.execute_script("arguments[0].click();", next_button)
+                if self.click_next(self.driver):
                     pages_loaded += 1
                     print(f"  Clicked Next - Loading page {pages_loaded}")
                     
-                    # Wait for new jobs to load 
-                    try:
-                        WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((By.TAG_NAME, "article"))
-                        )
-                        time.sleep(2)  # Small buffer for full render
-                    except TimeoutException:
-                        time.sleep(4)  # Fallback to fixed wait
-                    
                     # Scrape this page
                     print(f"\nScraping page {pages_loaded}...")
-                    self.scrape_current_page()
+                    page_jobs_count = self.scrape_current_page()
+                    self.flush_page(pages_loaded)
                 else:
                     print("  Next button not available reached end")
                     break
@@ -150,120 +264,334 @@ class ActuaryListScraper:
                 print(f"  Error clicking Next: {str(e)}")
                 break
         
-        print(f"\nFinished loading and scraping {pages_loaded} pages")
-        print(f"Total jobs collected: {len(self.jobs_data)}")
+        pages_loaded = pages_loaded - start_page + 1
+        self.report_progress(pages_loaded, time.perf_counter() - started)
         return pages_loaded
     
-    def scrape_current_page(self):
-        """Scrape all job listings on the current page"""
-        # Find all job article elements on current page
-        job_articles = self.driver.find_elements(By.TAG_NAME, "article")
+    def scrape_parallel(self, target_pages=10, workers=4):
+        """Scrape pages 1..target_pages with a pool of headless Chrome workers
         
-        page_jobs_count = 0
+        Pages are split into contiguous ranges, one per worker. Workers merge their jobs through
+        the shared seen_keys dedupe set and share the global rate limiter.
+        """
+        workers = max(1, min(workers, target_pages))
+        pages = list(range(1, target_pages + 1))
+        chunk = -(-len(pages) // workers)  # Ceiling division
+        page_ranges = [pages[i:i + chunk] for i in range(0, len(pages), chunk)]
         
-        for idx, job_article in enumerate(job_articles):
-            try:
-                job_data = self.extract_job_data(job_article)
-                
-                if job_data and job_data['title'] and job_data['company']:
-                    # Check for if we already have this job to avoid duplicates across the pages
-                    job_key = (job_data['title'], job_data['company'])
-                    existing_keys = [(j['title'], j['company']) for j in self.jobs_data]
-                    
-                    if job_key not in existing_keys:
-                        self.jobs_data.append(job_data)
-                        page_jobs_count += 1
-                        
-            except Exception as e:
-                self.failed_extractions.append({
-                    'page_position': idx + 1,
-                    'error': str(e)
-                })
-                continue
+        print(f"\nScraping {target_pages} pages with {len(page_ranges)} parallel workers...")
+        started = time.perf_counter()
+        
+        with ThreadPoolExecutor(max_workers=len(page_ranges)) as pool:
+            pages_loaded = sum(pool.map(self.scrape_page_range, page_ranges))
         
-        print(f"  Scraped {page_jobs_count} jobs from this page (Total: {len(self.jobs_data)})")
+        self.report_progress(pages_loaded, time.perf_counter() - started)
+        return pages_loaded
     
-    def extract_job_data(self, job_element):
-        """Extract all relevant data from a single job card element"""
+    def scrape_page_range(self, pages):
+        """Worker: scrape a contiguous range of pages with its own headless driver, returns pages scraped"""
+        driver = None
+        scraped = 0
         try:
-            job_data = {}
-            
-            # Extract Company Name from paragraph with specific class
-            try:
-                company = job_element.find_element(By.CSS_SELECTOR, "p.Job_job-card__company__7T9qY").text.strip()
-                job_data['company'] = company if company else "Company Name Not Listed"
-            except:
-                job_data['company'] = "Company Name Not Listed"
-            
-            # Extract Job Title/Position from paragraph with specific class
-            try:
-                title = job_element.find_element(By.CSS_SELECTOR, "p.Job_job-card__position__ic1rc").text.strip()
-                job_data['title'] = title if title else "Actuary Position"
-            except:
-                job_data['title'] = "Actuary Position"
+            driver = self.create_driver(headless=True)
             
-            # Extract Location from the locations div (improved with regex)
-            try:
-                locations_div = job_element.find_element(By.CSS_SELECTOR, "div.Job_job-card__locations__x1exr")
-                location_text = locations_div.text.strip()
-                lines = location_text.split('\n')
+            for position, page in enumerate(pages):
+                self.rate_limiter.wait()
                 
-                # Filter out lines that start with emojis or contain only emojis/salary info
-                # Using regex to match the emoji patterns
-                location_parts = []
-                for line in lines:
-                    line = line.strip()
-                    # Skip empty lines + salary lines with the moneybag emoji + emoji-only lines
-                    if line and not re.match(r'^[\U0001F300-\U0001F9FF\U0001F600-\U0001F64F\U0001F680-\U0001F6FF]', line):
-                        location_parts.append(line)
+                if self.page_url_template:
+                    driver.get(self.page_url_template.format(page=page))
+                elif position == 0:
+                    # No page URLs, walk from the first page to the start of the range
+                    driver.get(self.url)
+                    for _ in range(page - 1):
+                        self.rate_limiter.wait()
+                        if not self.click_next(driver):
+                            return scraped
+                elif not self.click_next(driver):
+                    print(f"  [worker {pages[0]}-{pages[-1]}] Next button not available reached end")
+                    break
                 
-                job_data['location'] = ', '.join(location_parts[:3]) if location_parts else "Not Specified"
-            except:
-                job_data['location'] = "Remote / Not Specified"
+                WebDriverWait(driver, 20).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "article"))
+                )
+                print(f"\nScraping page {page}...")
+                self.scrape_current_page(driver)
+                scraped += 1
+                
+        except Exception as e:
+            print(f"  [worker {pages[0]}-{pages[-1]}] Error: {str(e)}")
+        finally:
+            if driver:
+                driver.quit()
+        return scraped
+    
+    def create_session(self, pool_size=4):
+        """Keep-alive HTTP session with a connection pool sized for the workers and retries"""
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers['User-Agent'] = USER_AGENT
+        return session
+    
+    def page_url(self, page):
+        """URL of a listing page, defaults to <url>?page=N when no template is configured"""
+        if self.page_url_template:
+            return self.page_url_template.format(page=page)
+        if page == 1:
+            return self.url
+        return f"{self.url}?page={page}"
+    
+    def fetch_page_jobs(self, session, page):
+        """Fetch one listing page over HTTP and return its jobs, an empty list past the last page"""
+        self.rate_limiter.wait()
+        response = session.get(self.page_url(page), timeout=30)
+        if response.status_code == 404:
+            return []
+        response.raise_for_status()
+        return [self.build_job_data(card) for card in parse_cards(response.text)]
+    
+    def scrape_http(self, target_pages=10, workers=4, start_page=1):
+        """Scrape pages start_page..target_pages over plain HTTP without a browser, concurrently across pages"""
+        workers = max(1, min(workers, target_pages - start_page + 1))
+        print(f"\nFetching {target_pages} pages over HTTP with {workers} concurrent requests...")
+        started = time.perf_counter()
+        session = self.create_session(workers)
+        
+        pages_loaded = 0
+        pages = iter(range(start_page, target_pages + 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Keep at most `workers` pages in flight so an early stop wastes little
+            in_flight = deque(
+                (page, pool.submit(self.fetch_page_jobs, session, page))
+                for page in islice(pages, workers)
+            )
             
-            # Extract Posting Date
+            # Merge in page order so dedupe keeps the first occurrence like the sequential mode
+            while in_flight:
+                page, future = in_flight.popleft()
+                next_page = next(pages, None)
+                if next_page is not None:
+                    in_flight.append((next_page, pool.submit(self.fetch_page_jobs, session, next_page)))
+                
+                try:
+                    page_jobs = future.result()
+                except Exception as e:
+                    print(f"  Error fetching page {page}: {str(e)}")
+                    if self.pipeline is not None:
+                        # Streaming keeps the checkpoint contiguous, stop here so a resume retries this page
+                        for _, pending in in_flight:
+                            pending.cancel()
+                        raise
+                    continue
+                if not page_jobs:
+                    continue
+                
+                pages_loaded += 1
+                page_jobs_count = sum(1 for job_data in page_jobs if self.add_job(job_data))
+                print(f"  Page {page}: scraped {page_jobs_count} jobs (Total: {self.collected_count})")
+                self.flush_page(page)
+                
+                if self.should_stop(page_jobs_count):
+                    for _, pending in in_flight:
+                        pending.cancel()
+                    break
+        
+        session.close()
+        self.report_progress(pages_loaded, time.perf_counter() - started)
+        return pages_loaded
+    
+    def report_progress(self, pages_loaded, elapsed):
+        pages_per_minute = pages_loaded / elapsed * 60 if elapsed > 0 else 0
+        print(f"\nFinished loading and scraping {pages_loaded} pages in {elapsed:.1f}s ({pages_per_minute:.1f} pages/min)")
+        print(f"Total jobs collected: {self.collected_count}")
+    
+    @property
+    def collected_count(self):
+        """Jobs collected so far, including the ones already handed to the pipeline"""
+        return self.streamed_count + len(self.jobs_data)
+    
+    def flush_page(self, page):
+        """Streaming mode: hand the jobs collected since the previous page to the DB writer"""
+        if self.pipeline is None:
+            return
+        with self._lock:
+            page_jobs, self.jobs_data = self.jobs_data, []
+            # Cross page duplicates are absorbed by the upsert, this keeps memory flat
+            self.seen_keys.clear()
+        self.streamed_count += len(page_jobs)
+        self.pipeline.put(page, page_jobs)
+    
+    def on_page_saved(self, page, page_jobs):
+        """Called by the DB writer once a page is committed"""
+        if self.fingerprints is not None:
+            with self._lock:
+                self.fingerprints.update(page_jobs)
+    
+    def add_job(self, job_data):
+        """Collect a job unless its (title, company) was already seen, safe to call from workers
+        
+        In incremental mode listings known from previous runs and unchanged are skipped too.
+        """
+        job_key = (job_data['title'], job_data['company'])
+        with self._lock:
+            if job_key in self.seen_keys:
+                return False
+            self.seen_keys.add(job_key)
+            if self.fingerprints is not None and self.fingerprints.is_known(job_data):
+                self.unchanged_count += 1
+                self.known_keys.append(job_key)
+                return False
+            self.jobs_data.append(job_data)
+            return True
+    
+    def touch_known_listings(self, app):
+        """Incremental mode: refresh last_seen_at of the skipped listings, archive-jobs --unseen-days relies on it"""
+        if not self.known_keys:
+            return
+        with app.app_context():
             try:
-                date = job_element.find_element(By.CSS_SELECTOR, "p.Job_job-card__posted-on__NCZaJ").text.strip()
-                job_data['posting_date'] = date if date else "Recently posted"
-            except:
-                job_data['posting_date'] = "Recently posted"
-            
-            # Extract Job Type infer from title and tags 
-            title_lower = job_data['title'].lower()
-            tags_text = ''
-            
-            # Get tags to help with job type inference
-            tags_list = []
+                touch_jobs(self.known_keys)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error marking known listings as seen: {str(e)}")
+                return
+        print(f"Marked {len(self.known_keys)} known listings as seen")
+        self.known_keys = []
+    
+    def should_stop(self, page_jobs_count):
+        """Incremental mode: stop once enough consecutive pages had no new or changed listings"""
+        if self.fingerprints is None:
+            return False
+        self.stale_pages = self.stale_pages + 1 if page_jobs_count == 0 else 0
+        if self.stale_pages >= self.stop_after_pages:
+            print(f"  {self.stale_pages} consecutive pages without new listings, stopping early")
+            return True
+        return False
+    
+    def scrape_current_page(self, driver=None):
+        """Scrape all job listings on the current page"""
+        driver = driver or self.driver
+        
+        # Pull every card in a single WebDriver round-trip, fall back to per element extraction
+        try:
+            page_jobs = self.extract_page_jobs(driver)
+        except Exception as e:
+            print(f"  Single call extraction failed ({str(e)}), extracting card by card")
+            page_jobs = None
+        
+        if page_jobs is None:
+            # Find all job article elements on current page
+            page_jobs = []
+            for idx, job_article in enumerate(driver.find_elements(By.TAG_NAME, "article")):
+                try:
+                    page_jobs.append(self.extract_job_data(job_article))
+                except Exception as e:
+                    with self._lock:
+                        self.failed_extractions.append({
+                            'page_position': idx + 1,
+                            'error': str(e)
+                        })
+        
+        page_jobs_count = 0
+        for job_data in page_jobs:
+            # Skip jobs we already have to avoid duplicates across the pages
+            if job_data and job_data['title'] and job_data['company']:
+                if self.add_job(job_data):
+                    page_jobs_count += 1
+        
+        print(f"  Scraped {page_jobs_count} jobs from this page (Total: {self.collected_count})")
+        return page_jobs_count
+    
+    def extract_page_jobs(self, driver):
+        """Extract every job card on the current page with one execute_script call"""
+        cards = driver.execute_script(EXTRACT_CARDS_SCRIPT)
+        return [self.build_job_data(card) for card in cards]
+    
+    def extract_job_data(self, job_element):
+        """Extract all relevant data from a single job card element (one WebDriver call per field)"""
+        try:
+            card = {
+                'company': element_text(job_element, "p.Job_job-card__company__7T9qY"),
+                'title': element_text(job_element, "p.Job_job-card__position__ic1rc"),
+                'locations': element_text(job_element, "div.Job_job-card__locations__x1exr"),
+                'posted': element_text(job_element, "p.Job_job-card__posted-on__NCZaJ"),
+                'tags': None,
+            }
             try:
                 tags_div = job_element.find_element(By.CSS_SELECTOR, "div.Job_job-card__tags__zfriA")
-                tag_links = tags_div.find_elements(By.TAG_NAME, "a")
-                tags_list = [tag.text.strip() for tag in tag_links if tag.text.strip()]
-                tags_text = ' '.join(tags_list).lower()
+                card['tags'] = [tag.text for tag in tags_div.find_elements(By.TAG_NAME, "a")]
             except:
                 pass
             
-            # ---Improved job type inference
-            if 'intern' in title_lower or 'intern' in tags_text:
-                job_data['job_type'] = 'Internship'
-            elif 'part-time' in title_lower or 'part time' in title_lower or 'part-time' in tags_text:
-                job_data['job_type'] = 'Part-time'
-            elif 'contract' in title_lower or 'contractor' in tags_text:
-                job_data['job_type'] = 'Contract'
-            else:
-                job_data['job_type'] = 'Full-time'
-            
-            # If no tags were extracted we add default ones
-            if not tags_list:
-                tags_list = ['Actuary', 'Insurance']
-            
-            job_data['tags'] = ','.join(tags_list[:8])  # Limit to 8 tags
-            
-            return job_data
+            return self.build_job_data(card)
             
         except Exception as e:
             print(f"  Error extracting job data: {str(e)}")
             return None
     
+    def build_job_data(self, card):
+        """Build a job dict from the raw text of a card, fields are None when the element is missing"""
+        job_data = {}
+        
+        # Company Name from paragraph with specific class
+        company = (card.get('company') or '').strip()
+        job_data['company'] = company if company else "Company Name Not Listed"
+        
+        # Job Title/Position from paragraph with specific class
+        title = (card.get('title') or '').strip()
+        job_data['title'] = title if title else "Actuary Position"
+        
+        # Location from the locations div (improved with regex)
+        if card.get('locations') is not None:
+            lines = card['locations'].strip().split('\n')
+            
+            # Filter out lines that start with emojis or contain only emojis/salary info
+            # Using regex to match the emoji patterns
+            location_parts = []
+            for line in lines:
+                line = line.strip()
+                # Skip empty lines + salary lines with the moneybag emoji + emoji-only lines
+                if line and not re.match(r'^[\U0001F300-\U0001F9FF\U0001F600-\U0001F64F\U0001F680-\U0001F6FF]', line):
+                    location_parts.append(line)
+            
+            job_data['location'] = ', '.join(location_parts[:3]) if location_parts else "Not Specified"
+        else:
+            job_data['location'] = "Remote / Not Specified"
+        
+        # Posting Date
+        date = (card.get('posted') or '').strip()
+        job_data['posting_date'] = date if date else "Recently posted"
+        # Relative dates are resolved now, at scrape time, rather than when the row is written
+        job_data['posted_at'] = parse_posting_date(job_data['posting_date'])
+        
+        # Job Type infer from title and tags 
+        title_lower = job_data['title'].lower()
+        
+        # Get tags to help with job type inference
+        tags_list = [tag.strip() for tag in (card.get('tags') or []) if tag and tag.strip()]
+        tags_text = ' '.join(tags_list).lower()
+        
+        # ---Improved job type inference
+        if 'intern' in title_lower or 'intern' in tags_text:
+            job_data['job_type'] = 'Internship'
+        elif 'part-time' in title_lower or 'part time' in title_lower or 'part-time' in tags_text:
+            job_data['job_type'] = 'Part-time'
+        elif 'contract' in title_lower or 'contractor' in tags_text:
+            job_data['job_type'] = 'Contract'
+        else:
+            job_data['job_type'] = 'Full-time'
+        
+        # If no tags were extracted we add default ones
+        if not tags_list:
+            tags_list = ['Actuary', 'Insurance']
+        
+        job_data['tags'] = ','.join(tags_list[:8])  # Limit to 8 tags
+        
+        return job_data
+    
     def scrape_jobs(self):
         """Legacy method now handled by scrape_current_page()"""
         # method no longer needed but kept for compatibility
@@ -271,7 +599,7 @@ class ActuaryListScraper:
         print("\n" + "="*60)
         print("SCRAPING COMPLETE")
         print("="*60)
-        print(f"Successfully scraped {len(self.jobs_data)} total jobs")
+        print(f"Successfully scraped {self.collected_count} total jobs")
         
         # Show failed extractions if any
         if self.failed_extractions:
@@ -291,69 +619,45 @@ class ActuaryListScraper:
         return self.jobs_data
     
     def save_to_database(self, app):
-        """Save scraped jobs to the database"""
+        """Save scraped jobs to the database with batched upserts on (title, company)"""
         print("\n" + "="*10)
         print("SAVING TO DATABASE")
         
         with app.app_context():
-            saved_count = 0
-            duplicate_count = 0
-            error_count = 0
-            
-            for job_data in self.jobs_data:
-                try:
-                    # Check for duplicates.. means same title and company
-                    existing_job = Job.query.filter_by(
-                        title=job_data['title'],
-                        company=job_data['company']
-                    ).first()
-                    
-                    if existing_job:
-                        duplicate_count += 1
-                        continue
-                    
-                    # Create the new job entry
-                    new_job = Job(
-                        title=job_data['title'],
-                        company=job_data['company'],
-                        location=job_data['location'],
-                        posting_date=job_data['posting_date'],
-                        job_type=job_data['job_type'],
-                        tags=job_data['tags'],
-                    )
-                    
-                    db.session.add(new_job)
-                    saved_count += 1
-                    
-                    # Commit in batches of 50
-                    if saved_count % 50 == 0:
-                        db.session.commit()
-                        print(f"  Saved {saved_count} jobs...")
-                    
-                except Exception as e:
-                    error_count += 1
-                    print(f"  Error saving job: {str(e)}")
-                    db.session.rollback()
-                    continue
-            
-            # Final commit
+            started = time.perf_counter()
             try:
-                db.session.commit()
-                print(f"\n{'='*60}")
-                print(f"DATABASE SAVE COMPLETE")
-                print(f"{'='*60}")
-                print(f"Successfully saved: {saved_count} jobs")
-                print(f"Duplicates skipped: {duplicate_count} jobs")
-                if error_count > 0:
-                    print(f"Errors: {error_count} jobs")
-                print(f"{'='*60}\n")
-                
+                counts = upsert_jobs(self.jobs_data)
             except Exception as e:
-                db.session.rollback()
-                print(f"Error during final commit: {str(e)}")
+                print(f"Error saving jobs: {str(e)}")
+                return None
+            elapsed = time.perf_counter() - started
+            
+            rows_per_sec = len(self.jobs_data) / elapsed if elapsed > 0 else 0
+            print(f"\n{'='*60}")
+            print(f"DATABASE SAVE COMPLETE")
+            print(f"{'='*60}")
+            print(f"Inserted: {counts['inserted']} jobs")
+            print(f"Updated: {counts['updated']} jobs")
+            print(f"Unchanged: {counts['unchanged']} jobs")
+            print(f"Expired: {counts['expired']} jobs (posted before the archive retention window, not stored)")
+            print(f"Throughput: {rows_per_sec:.0f} rows/sec ({elapsed:.2f}s)")
+            print(f"{'='*60}\n")
+            return counts
     
-    def run(self, target_pages=10):
-        """Main execution method"""
+    def run(self, target_pages=10, workers=1, mode='browser', stream=True, checkpoint_file=None, resume=False):
+        """Main execution method
+        
+        mode='browser' drives Chrome (workers > 1 scrapes the pages in parallel),
+        mode='http' fetches the pages over plain HTTP with workers concurrent requests.
+        stream=True saves every page through a background DB writer while the next one is
+        scraped (sequential browser and http modes), checkpoint_file then records the last
+        saved page and resume=True continues after it.
+        """
+        app = create_app()
+        streaming = stream and (mode == 'http' or workers <= 1)
+        checkpoint = Checkpoint(checkpoint_file, self.url) if streaming and checkpoint_file else None
+        start_page = 1
+        
         try:
             print("\n" + "="*10)
             print("ACTUARY LIST JOB SCRAPER")
@@ -361,28 +665,67 @@ class ActuaryListScraper:
             print(f"Target: {target_pages} pages (est: 30 jobs per page)")
             print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
-            # Setup
-            self.setup_driver()
+            if resume and checkpoint is not None:
+                start_page = checkpoint.load() + 1
+                if start_page > target_pages:
+                    print("All target pages were already saved by the previous run")
+                    checkpoint.clear()
+                    return True
+                if start_page > 1:
+                    print(f"Resuming after page {start_page - 1} from {checkpoint.path}")
             
-            # Load page
-            if not self.load_page():
-                return False
+            if streaming:
+                self.pipeline = ScrapePipeline(app, checkpoint, on_saved=self.on_page_saved).start()
             
-            # Load more pages by clicking Next and then scrape each page
-            self.scroll_and_load_more(target_pages)
+            if mode == 'http':
+                # No browser, pages are fetched and parsed directly
+                self.scrape_http(target_pages, workers, start_page)
+            elif workers > 1:
+                # Each worker runs its own headless driver
+                self.scrape_parallel(target_pages, workers)
+            else:
+                # Setup
+                self.setup_driver()
+                
+                # Load page
+                if not self.load_page():
+                    return False
+                
+                # Load more pages by clicking Next and then scrape each page
+                self.scroll_and_load_more(target_pages, start_page)
             
             # Call the scrape_jobs to show final summary
             self.scrape_jobs()
             
+            if self.fingerprints is not None:
+                print(f"Skipped {self.unchanged_count} known unchanged listings")
+            
+            if self.pipeline is not None:
+                # Pages were saved while scraping, wait for the writer to finish
+                saved = self.finish_pipeline()
+                if saved and checkpoint is not None:
+                    checkpoint.clear()  # Crawl completed, the next run starts from page 1
+                if saved and self.collected_count == 0 and self.fingerprints is None:
+                    print("\nNo jobs were scraped.")
+                    return False
+                return saved
+            
+            if self.fingerprints is not None and len(self.jobs_data) == 0:
+                print("\nNo new or changed listings.")
+                return True
+            
             if len(self.jobs_data) == 0:
                 print("\nNo jobs were scraped.")
                 return False
             
             # Save to database
-            app = create_app()
-            self.save_to_database(app)
+            counts = self.save_to_database(app)
             
-            return True
+            # Only remember listings once they are safely stored
+            if counts is not None and self.fingerprints is not None:
+                self.fingerprints.update(self.jobs_data)
+            
+            return counts is not None
             
         except Exception as e:
             print(f"\nFatal error during scraping: {str(e)}")
@@ -394,20 +737,88 @@ class ActuaryListScraper:
             if self.driver:
                 self.driver.quit()
                 print("WebDriver closed")
+            # Write pages queued before a failure so a resume starts after them
+            if self.pipeline is not None:
+                self.finish_pipeline()
+            if self.fingerprints is not None:
+                self.touch_known_listings(app)
+                self.fingerprints.save()
             print(f"\nFinished at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    def finish_pipeline(self):
+        """Wait for the DB writer to drain the queue and report what the streaming run saved"""
+        pipeline, self.pipeline = self.pipeline, None
+        counts = pipeline.close()
+        
+        rows_per_sec = pipeline.rows_written / pipeline.write_time if pipeline.write_time > 0 else 0
+        print(f"\n{'='*60}")
+        print(f"DATABASE SAVE COMPLETE")
+        print(f"{'='*60}")
+        print(f"Inserted: {counts['inserted']} jobs")
+        print(f"Updated: {counts['updated']} jobs")
+        print(f"Unchanged: {counts['unchanged']} jobs")
+        print(f"Expired: {counts['expired']} jobs (posted before the archive retention window, not stored)")
+        print(f"Throughput: {rows_per_sec:.0f} rows/sec ({pipeline.write_time:.2f}s writing, overlapped with scraping)")
+        print(f"{'='*60}\n")
+        
+        if pipeline.error is not None:
+            print(f"Error saving jobs: {pipeline.error}")
+            return False
+        return True
 
-def main():
+def main(argv=None):
     """THE Entry point for the scraper
     
     Note: This scraper targets the first 10 pages (est 300 jobs) from actuarylist.com
     for demo purposes. The site contains alot of jobs but we limit
     the scope as per project requirements.....
+    
+    Use --workers N to scrape with a pool of N headless browsers, see --help for all options.
     """
+    parser = argparse.ArgumentParser(description='Scrape actuarial jobs from actuarylist.com into the database')
+    parser.add_argument('--pages', type=int, default=10, help='Number of pages to scrape (default: 10)')
+    parser.add_argument('--mode', choices=['browser', 'http'], default='browser',
+                        help='browser drives Chrome, http fetches pages without a browser (default: browser)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Scrape pages in parallel with N headless Chrome instances or N concurrent requests in http mode (default: 1)')
+    parser.add_argument('--delay', type=float, default=1.0,
+                        help='Minimum seconds between page loads across all workers (default: 1.0)')
+    parser.add_argument('--url', default=None, help='Listing URL to start from (default: actuarylist.com)')
+    parser.add_argument('--page-url', default=None,
+                        help='Page URL template containing {page}, lets workers open their pages directly (http mode defaults to <url>?page={page})')
+    parser.add_argument('--headless', action='store_true', help='Run the sequential mode without a browser window')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only save new or changed listings and stop early once pages contain only known ones')
+    parser.add_argument('--state-file', default=os.path.join(current_dir, 'seen_listings.json'),
+                        help='Fingerprint store used by --incremental (default: Scraper/seen_listings.json)')
+    parser.add_argument('--stop-after', type=int, default=2,
+                        help='Incremental mode stops after N consecutive pages without new listings (default: 2)')
+    parser.add_argument('--no-stream', action='store_true',
+                        help='Collect every page first and save at the end instead of saving page by page')
+    parser.add_argument('--checkpoint-file', default=os.path.join(current_dir, 'scrape_checkpoint.json'),
+                        help='Records the last saved page while streaming (default: Scraper/scrape_checkpoint.json)')
+    parser.add_argument('--resume', action='store_true', help='Continue after the page recorded in the checkpoint file')
+    args = parser.parse_args(argv)
+    
     # Set headless=False to see the browser and to True to run in background
-    scraper = ActuaryListScraper(headless=False)
+    scraper = ActuaryListScraper(
+        headless=args.headless,
+        url=args.url,
+        page_url_template=args.page_url,
+        delay=args.delay,
+        state_file=args.state_file if args.incremental else None,
+        stop_after_pages=args.stop_after
+    )
     
-    # Scrape 10 pages
-    success = scraper.run(target_pages=10)
+    # Scrape 10 pages by default
+    success = scraper.run(
+        target_pages=args.pages,
+        workers=args.workers,
+        mode=args.mode,
+        stream=not args.no_stream,
+        checkpoint_file=args.checkpoint_file,
+        resume=args.resume
+    )
     
     if success:
         print("\nScraping completed successfully!")
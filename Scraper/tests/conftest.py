@@ -0,0 +1,42 @@
+"""
+Shared pytest setup for the scraper, run from the Scraper directory: python -m pytest tests
+
+Scrapes go over plain HTTP to fixture_site.py on a free local port and are saved to a scratch
+SQLite database per test, no browser or real database is needed.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+scraper_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, scraper_dir)
+
+import fixture_site  # noqa: E402
+
+FIXTURE_PAGES = 5
+
+
+@pytest.fixture(scope='session')
+def site_url():
+    """Base URL of a fixture site serving FIXTURE_PAGES listing pages"""
+    server = fixture_site.serve(0, FIXTURE_PAGES)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api_app(tmp_path):
+    """Backend app on a scratch SQLite database with the current schema, the scraper writes there too"""
+    import scrape  # noqa: F401, puts the backend directory on sys.path
+    from config import Config
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'jobs.db'}"
+    Config.SQLALCHEMY_ECHO = False
+
+    from app import create_app
+    return create_app()
@@ -0,0 +1,113 @@
+"""
+ActuaryListScraper against the local fixture site: parsing, pagination and checkpoint resume
+"""
+
+import json
+
+import pytest
+
+import fixture_site
+from conftest import FIXTURE_PAGES
+from page_parser import parse_cards
+from scrape import ActuaryListScraper
+
+
+def stored_jobs(api_app):
+    from models.job import Job
+
+    with api_app.app_context():
+        return {job.title: job for job in Job.query.filter(Job.deleted_at.is_(None))}
+
+
+def fixture_titles(pages):
+    return {
+        fixture_site.fixture_job(page, position)['title']
+        for page in pages
+        for position in range(fixture_site.JOBS_PER_PAGE)
+    }
+
+
+@pytest.mark.parametrize('embed_json', [False, True], ids=['markup', 'embedded_json'])
+def test_parses_fixture_page(embed_json):
+    cards = parse_cards(fixture_site.render_page(1, FIXTURE_PAGES, embed_json))
+    jobs = [ActuaryListScraper().build_job_data(card) for card in cards]
+
+    assert len(jobs) == fixture_site.JOBS_PER_PAGE
+    first = jobs[0]
+    assert (first['title'], first['company']) == ('Pricing Actuary 0', 'Acme Re')
+    # The salary line of the card is not part of the location
+    assert first['location'] == 'London, UK'
+    assert first['posting_date'] == '1 day ago'
+    assert first['posted_at'] is not None
+    assert first['tags'] == 'Life,Pricing'
+    assert jobs[2]['job_type'] == 'Internship'
+    assert jobs[4]['job_type'] == 'Part-time'
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_http_scrape_follows_pages(site_url, api_app, workers):
+    scraper = ActuaryListScraper(url=site_url, delay=0)
+
+    # Asking for more pages than the site has stops at its last page
+    assert scraper.run(FIXTURE_PAGES + 2, workers, mode='http')
+
+    jobs = stored_jobs(api_app)
+    assert set(jobs) == fixture_titles(range(1, FIXTURE_PAGES + 1))
+    listed = fixture_site.fixture_job(2, 1)
+    assert jobs[listed['title']].location == ', '.join(listed['locations'])
+
+
+def test_resumes_after_checkpoint(site_url, api_app, tmp_path):
+    checkpoint_file = tmp_path / 'checkpoint.json'
+    fetched = []
+
+    scraper = ActuaryListScraper(url=site_url, delay=0)
+    fetch_page_jobs = scraper.fetch_page_jobs
+
+    def failing_fetch(session, page):
+        if page == 3:
+            raise ConnectionError('connection reset')
+        return fetch_page_jobs(session, page)
+
+    scraper.fetch_page_jobs = failing_fetch
+    assert not scraper.run(FIXTURE_PAGES, 1, mode='http', checkpoint_file=str(checkpoint_file))
+    assert json.loads(checkpoint_file.read_text())['last_page'] == 2
+    assert set(stored_jobs(api_app)) == fixture_titles([1, 2])
+
+    scraper = ActuaryListScraper(url=site_url, delay=0)
+    fetch_page_jobs = scraper.fetch_page_jobs
+
+    def recording_fetch(session, page):
+        fetched.append(page)
+        return fetch_page_jobs(session, page)
+
+    scraper.fetch_page_jobs = recording_fetch
+    assert scraper.run(FIXTURE_PAGES, 1, mode='http', checkpoint_file=str(checkpoint_file), resume=True)
+
+    assert sorted(fetched) == list(range(3, FIXTURE_PAGES + 1))
+    assert set(stored_jobs(api_app)) == fixture_titles(range(1, FIXTURE_PAGES + 1))
+    # A finished crawl starts from page 1 next time
+    assert not checkpoint_file.exists()
+
+
+def test_incremental_run_skips_known_listings(site_url, api_app, tmp_path):
+    from datetime import datetime, timedelta
+    from db import db
+    from models.job import Job
+
+    state_file = str(tmp_path / 'seen.json')
+    assert ActuaryListScraper(url=site_url, delay=0, state_file=state_file).run(FIXTURE_PAGES, 1, mode='http')
+
+    long_ago = datetime.utcnow() - timedelta(days=30)
+    with api_app.app_context():
+        db.session.execute(db.update(Job).values(last_seen_at=long_ago))
+        db.session.commit()
+
+    scraper = ActuaryListScraper(url=site_url, delay=0, state_file=state_file, stop_after_pages=2)
+    assert scraper.run(FIXTURE_PAGES, 1, mode='http')
+
+    # Nothing new, the crawl stops after two pages and only marks what it saw as listed
+    assert scraper.unchanged_count == 2 * fixture_site.JOBS_PER_PAGE
+    jobs = stored_jobs(api_app)
+    seen = {title for title, job in jobs.items() if job.last_seen_at > long_ago}
+    assert seen == fixture_titles([1, 2])
@@ -1,23 +1,49 @@
 from flask import Flask
 from flask_cors import CORS
-from config import Config
+from config import get_config
 from db import db, init_db
 from routes.job_routes import job_bp
+from routes.bulk_routes import bulk_bp
+from commands import register_commands
+from cache import response_cache
+from job_index import job_index
+from suggest import suggest_index
+from replica import init_replica_routing
+from metrics import init_metrics
 
-def create_app():
+def create_app(config_name=None):
     app = Flask(__name__)
     
-    # Load configuration
-    app.config.from_object(Config)
+    # Load the configuration profile, APP_ENV (development unless set) when config_name is not given
+    app.config.from_object(get_config(config_name))
     
-    # Enable CORS for frontend communication
-    CORS(app)
+    # Enable CORS for the frontend origins, credentials carry the read-your-writes cookie
+    CORS(app, origins=app.config['CORS_ORIGINS'], supports_credentials=True)
     
     # Initialize database
     init_db(app)
     
+    # Configure the response cache
+    response_cache.init_app(app)
+    
+    # Load the in-memory job index when JOB_INDEX=true
+    job_index.init_app(app)
+    
+    # Typeahead values, loaded in the background
+    suggest_index.init_app(app)
+    
+    # Send reads to the replica when one is configured
+    init_replica_routing(app)
+    
+    # Request timing and SQL counters, served at /metrics
+    init_metrics(app)
+    
     # Register blueprints
     app.register_blueprint(job_bp)
+    app.register_blueprint(bulk_bp)
+    
+    # Register maintenance CLI commands
+    register_commands(app)
     
     # Root endpoint
     @app.route('/')
@@ -25,16 +51,26 @@ def create_app():
         return {
             'message': 'Job Listing API',
             'endpoints': {
-                'GET /api/jobs': 'Get all jobs',
+                'GET /api/jobs': 'Get all jobs (optional limit/cursor pagination)',
+                'GET /api/jobs/facets': 'Job counts per job_type, location and tag (accepts the list filters)',
+                'GET /api/jobs/suggest': 'Typeahead values with job counts (field=title|company|location|tag, prefix, limit)',
+                'GET /api/jobs/changes': 'Jobs created, updated or deleted after a change sequence (since, limit)',
+                'GET /api/jobs/export': 'Stream all matching jobs as NDJSON or CSV (format, gzip)',
                 'GET /api/jobs/<id>': 'Get single job',
                 'POST /api/jobs': 'Create new job',
                 'PUT /api/jobs/<id>': 'Update job',
-                'DELETE /api/jobs/<id>': 'Delete job'
+                'DELETE /api/jobs/<id>': 'Delete job',
+                'POST /api/jobs/bulk': 'Create many jobs',
+                'PUT /api/jobs/bulk': 'Update many jobs (each item needs an id)',
+                'DELETE /api/jobs/bulk': 'Delete many jobs by ids',
+                'GET /api/jobs/cache/stats': 'Response cache hit/miss counters',
+                'GET /metrics': 'Request latency and SQL metrics in Prometheus format'
             }
         }
     
     return app
 
 if __name__ == '__main__':
+    # Development server, production runs through wsgi.py
     app = create_app()
     app.run(debug=True, port=5000)
\ No newline at end of file
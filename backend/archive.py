@@ -0,0 +1,53 @@
+"""
+Hot/archive split of the jobs table
+
+Jobs posted longer ago than a retention window, or no longer listed by the scraper for a while,
+are moved to the jobs_archive table by `flask --app app archive-jobs`, meant to run on a
+schedule. A moved job is copied to jobs_archive and deleted like DELETE /api/jobs/<id> does:
+facet counts drop, the near duplicates it heads are regrouped and the change feed reports it
+deleted, so the job index and the other mirrors let go of it. purge-tombstones later removes
+the row left behind, so jobs and its indexes only hold current listings.
+
+GET /api/jobs and GET /api/jobs/<id> also read the archive with include_archived=true, an
+archived job keeps its id there (jobs_archive.job_id) and job ids are never handed out twice. A job
+listed again before its tombstone is purged comes back under its old id and leaves the archive.
+Listings posted before the retention window are not stored again by the scraper upserts, they
+would only move back and forth between the two tables.
+"""
+
+from datetime import datetime
+from sqlalchemy import select, insert, delete, literal, or_
+from db import db
+from models.job import Job
+from models.archive import ArchivedJob
+from bulk import delete_jobs
+
+ARCHIVE_BATCH_SIZE = 500
+
+# Columns copied from jobs, the id goes to job_id and archived_at is set on the way
+ARCHIVED_COLUMNS = ('title', 'company', 'location', 'posting_date', 'posted_at', 'job_type', 'tags',
+                    'duplicate_of', 'created_at', 'updated_at', 'last_seen_at')
+
+
+def archive_candidates(posted_before, seen_before=None, limit=ARCHIVE_BATCH_SIZE):
+    """Ids of up to `limit` live jobs posted before a datetime, or last seen before another one"""
+    conditions = [Job.posted_at < posted_before]
+    if seen_before is not None:
+        conditions.append(Job.last_seen_at < seen_before)
+    return [
+        job_id for (job_id,) in db.session.execute(
+            select(Job.id).where(or_(*conditions), Job.deleted_at.is_(None)).limit(limit)
+        )
+    ]
+
+
+def archive_jobs(ids):
+    """Copy live jobs to jobs_archive and delete them from jobs, does not commit"""
+    table = ArchivedJob.__table__
+    db.session.execute(delete(table).where(table.c.job_id.in_(ids)))
+    db.session.execute(insert(table).from_select(
+        ['job_id', *ARCHIVED_COLUMNS, 'archived_at'],
+        select(Job.id, *[getattr(Job, name) for name in ARCHIVED_COLUMNS], literal(datetime.utcnow(), db.DateTime))
+        .where(Job.id.in_(ids), Job.deleted_at.is_(None))
+    ))
+    delete_jobs(ids)
@@ -0,0 +1,83 @@
+"""
+Benchmark the bulk endpoints against the single-item endpoints
+
+Creates, updates and deletes the same number of jobs both ways through the Flask test client
+on a throwaway SQLite database and prints jobs/sec for each.
+Run from the backend directory: python benchmarks/bulk_benchmark.py --jobs 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+
+def make_jobs(count, prefix):
+    return [
+        {
+            'title': f'{prefix} Actuary {i}',
+            'company': f'Company {i % 50}',
+            'location': 'London, UK',
+            'job_type': 'Full-time',
+            'tags': ['Life', 'Pricing'],
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{elapsed:>10.2f}s{count / elapsed:>12.0f} jobs/sec")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=2000)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'bulk_bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from config import Config
+    Config.SQLALCHEMY_ECHO = False
+    from app import create_app
+
+    client = create_app().test_client()
+    n = args.jobs
+    print(f"\n{'operation':<28}{'time':>11}{'throughput':>12}")
+
+    # Single item endpoints, one request and one commit per job
+    def single_create():
+        return [client.post('/api/jobs', json=job).get_json()['job']['id'] for job in make_jobs(n, 'Single')]
+    single_ids, single_create_time = timed('single POST', n, single_create)
+    _, single_update_time = timed('single PUT', n, lambda: [
+        client.put(f'/api/jobs/{job_id}', json={'job_type': 'Contract'}) for job_id in single_ids
+    ])
+    _, single_delete_time = timed('single DELETE', n, lambda: [
+        client.delete(f'/api/jobs/{job_id}') for job_id in single_ids
+    ])
+
+    # Bulk endpoints, one request and one transaction for the whole batch
+    def bulk_create():
+        results = client.post('/api/jobs/bulk', json=make_jobs(n, 'Bulk')).get_json()['results']
+        return [result['id'] for result in results]
+    bulk_ids, bulk_create_time = timed('bulk POST', n, bulk_create)
+    _, bulk_update_time = timed('bulk PUT', n, lambda: client.put(
+        '/api/jobs/bulk', json=[{'id': job_id, 'job_type': 'Contract'} for job_id in bulk_ids]
+    ))
+    _, bulk_delete_time = timed('bulk DELETE', n, lambda: client.delete('/api/jobs/bulk', json={'ids': bulk_ids}))
+
+    print(f"\nSpeedup create: {single_create_time / bulk_create_time:.1f}x, "
+          f"update: {single_update_time / bulk_update_time:.1f}x, "
+          f"delete: {single_delete_time / bulk_delete_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
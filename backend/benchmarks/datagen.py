@@ -0,0 +1,85 @@
+"""
+Synthetic job data for benchmarks
+
+Generates realistic looking actuarial job listings (titles, companies, locations, tags, job
+types and relative posting dates with a skewed distribution) and bulk loads them into the jobs,
+tags and job_tags tables with multi-row INSERTs. Ids are assigned up front so the tag links are
+written without reading anything back, which keeps seeding 1M rows practical.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+SENIORITY = ['', '', 'Senior ', 'Junior ', 'Lead ', 'Principal ', 'Graduate ', 'Assistant ']
+ROLES = ['Pricing Actuary', 'Reserving Actuary', 'Actuarial Analyst', 'Capital Modelling Actuary',
+         'Pension Consultant', 'Life Actuary', 'Health Actuary', 'Actuarial Intern', 'Risk Analyst',
+         'Data Scientist', 'Valuation Actuary', 'Actuarial Manager', 'Chief Actuary', 'Catastrophe Modeller']
+COMPANY_WORDS = ['Acme', 'Northwind', 'Contoso', 'Fabrikam', 'Globex', 'Initech', 'Umbrella', 'Stark',
+                 'Wayne', 'Tyrell', 'Cyberdyne', 'Hooli', 'Vandelay', 'Wonka', 'Oscorp', 'Soylent']
+COMPANY_SUFFIXES = ['Re', 'Life', 'Insurance', 'Mutual', 'Partners', 'Consulting', 'Group', 'Assurance']
+LOCATIONS = ['London, UK', 'New York, USA', 'Remote', 'Toronto, Canada', 'Chicago, USA', 'Zurich, Switzerland',
+             'Dublin, Ireland', 'Hartford, USA', 'Sydney, Australia', 'Edinburgh, UK', 'Bermuda', 'Singapore']
+TAGS = ['Life', 'Health', 'Pricing', 'Reserving', 'Pension', 'P&C', 'IFRS 17', 'Solvency II', 'Python', 'R',
+        'SQL', 'Excel', 'Prophet', 'Reinsurance', 'Capital', 'Catastrophe', 'GI', 'Annuities', 'ERM', 'VBA']
+JOB_TYPES = ['Full-time'] * 7 + ['Part-time', 'Contract', 'Internship']
+
+
+def generate_jobs(start, stop, seed=7):
+    """Job dicts number start..stop-1, deterministic for a given seed and numbering"""
+    rng = random.Random(seed * 1000003 + start)
+    now = datetime.utcnow()
+    for n in range(start, stop):
+        # Popular companies, locations and tags dominate like on the real site
+        company = f'{COMPANY_WORDS[(int(rng.paretovariate(1.2)) - 1) % len(COMPANY_WORDS)]} {rng.choice(COMPANY_SUFFIXES)}'
+        days_ago = min(int(rng.expovariate(1 / 10)), 90)
+        yield {
+            'title': f'{rng.choice(SENIORITY)}{rng.choice(ROLES)} {n}',
+            'company': company,
+            'location': LOCATIONS[min(int(rng.expovariate(0.4)), len(LOCATIONS) - 1)],
+            'posting_date': f'{days_ago} days ago' if days_ago else 'Recently posted',
+            'posted_at': now - timedelta(days=days_ago, seconds=rng.randint(0, 86399)),
+            'job_type': rng.choice(JOB_TYPES),
+            'tags': ','.join(rng.sample(TAGS[:8], 1) + rng.sample(TAGS[8:], rng.randint(0, 3))),
+        }
+
+
+def seed_database(target_rows, batch_size=5000, progress=True):
+    """Add generated jobs until the jobs table holds target_rows, returns the number added"""
+    from sqlalchemy import func, insert
+    from db import db
+    from models.job import Job
+    from models.tag import Tag, job_tags
+    from facets import rebuild_facet_counts
+    from changes import next_change_seqs
+
+    existing = db.session.query(func.count(Job.id)).scalar()
+    if existing >= target_rows:
+        return 0
+
+    tags = Tag.get_or_create_many(TAGS)
+    db.session.commit()
+    tag_ids = {tag.name: tag.id for tag in tags}
+    next_id = (db.session.query(func.max(Job.id)).scalar() or 0) + 1
+
+    now = datetime.utcnow()
+    added = 0
+    for batch_start in range(existing, target_rows, batch_size):
+        batch_stop = min(batch_start + batch_size, target_rows)
+        rows, links = [], []
+        seqs = iter(next_change_seqs(batch_stop - batch_start))
+        for job in generate_jobs(batch_start, batch_stop):
+            job_id = next_id + len(rows)
+            rows.append(dict(job, id=job_id, created_at=now, updated_at=now, change_seq=next(seqs)))
+            links.extend({'job_id': job_id, 'tag_id': tag_ids[name]} for name in job['tags'].split(','))
+        db.session.execute(insert(Job.__table__), rows)
+        db.session.execute(insert(job_tags), links)
+        db.session.commit()
+
+        next_id += len(rows)
+        added += len(rows)
+        if progress and (batch_stop % 100000 == 0 or batch_stop == target_rows):
+            print(f"  Seeded {batch_stop} jobs")
+
+    rebuild_facet_counts()
+    db.session.commit()
+    return added
@@ -0,0 +1,98 @@
+"""
+Benchmark GET /api/jobs answered by the in-memory job index against SQL
+
+Seeds a throwaway SQLite database with synthetic jobs up to each row count, loads the index and
+times filtered pages, searches and date windows through the Flask test client with the response
+cache disabled, once from the index and once from SQL. At the smallest row count it also runs
+the check-job-index command, which compares both answers for filter/sort/paging combinations
+(some of them are slow in SQL on big tables), and exits 1 if any differ.
+Run from the backend directory: python benchmarks/job_index_benchmark.py --rows 10000,100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ('first page', '/api/jobs?limit=50'),
+    ('job_type page', '/api/jobs?job_type=Contract&limit=50'),
+    ('location page', '/api/jobs?location=london&limit=50'),
+    ('tag page + count', '/api/jobs?tag=Life&limit=50&include_count=true'),
+    ('two tags (all)', '/api/jobs?tag=Life,SQL&limit=50'),
+    ('job_type + tag + location', '/api/jobs?job_type=Contract&tag=Pricing&location=remote&limit=50'),
+    ('search relevance', '/api/jobs?search=pricing%20actuary&limit=50'),
+    ('search by date', '/api/jobs?search=senior&sort=posting_date_asc&limit=50'),
+    ('last 7 days', '/api/jobs?posted_after=7%20days%20ago&limit=50&include_count=true'),
+    ('tag full list', '/api/jobs?tag=Catastrophe'),
+]
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', default='10000,100000', help='Comma separated row counts')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--memory', action='store_true', help='Also report the memory used while loading')
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'job_index_bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from config import Config
+    Config.SQLALCHEMY_ECHO = False
+    Config.CACHE_ENABLED = False
+    from app import create_app
+    from datagen import seed_database
+    from job_index import job_index
+
+    app = create_app()
+    client = app.test_client()
+    failed = None
+
+    with app.app_context():
+        for rows in sorted(int(value) for value in args.rows.split(',')):
+            print(f"\nSeeding up to {rows} jobs...")
+            seed_database(rows, progress=False)
+
+            started = time.perf_counter()
+            job_index.load()
+            print(f"Index load {time.perf_counter() - started:.2f}s")
+            if args.memory:
+                # Tracing slows loading down several times, so memory is measured on a second load
+                tracemalloc.start()
+                job_index.load()
+                print(f"Index peak memory {tracemalloc.get_traced_memory()[1] / 2 ** 20:.0f} MiB")
+                tracemalloc.stop()
+
+            print(f"{'request':<28}{'sql (ms)':>12}{'index (ms)':>12}{'speedup':>10}")
+            for label, url in CASES:
+                indexed = best_of(args.repeat, lambda: client.get(url).get_data())
+                with job_index.bypassed():
+                    sql = best_of(args.repeat, lambda: client.get(url).get_data())
+                print(f"{label:<28}{sql * 1000:>12.1f}{indexed * 1000:>12.1f}{sql / indexed:>9.1f}x")
+
+            if failed is None:
+                result = app.test_cli_runner().invoke(args=['check-job-index'])
+                print(result.output.strip())
+                failed = result.exit_code != 0
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark GET /api/jobs serialization against the old ORM + to_dict + jsonify path
+
+Seeds a throwaway SQLite database up to each row count and times the full list, a 100 row
+page and a sparse fieldset through the Flask test client with the response cache disabled.
+Run from the backend directory: python benchmarks/list_benchmark.py --rows 10000,100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+TITLES = ['Pricing Actuary', 'Reserving Analyst', 'Actuarial Intern', 'Capital Modelling Lead']
+TAGS = ['Life', 'Health', 'Pricing', 'Reserving', 'Pension', 'P&C', 'IFRS 17', 'Solvency II']
+
+
+def seed(start, stop):
+    from db import db
+    from models.job import Job
+
+    rng = random.Random(start)
+    now = datetime.utcnow()
+    for batch_start in range(start, stop, 5000):
+        db.session.execute(Job.__table__.insert(), [
+            {
+                'title': f'{rng.choice(TITLES)} {i}',
+                'company': f'Company {i % 500}',
+                'location': 'London, UK',
+                'posting_date': f'{i % 30} days ago',
+                'posted_at': now - timedelta(days=i % 30, seconds=i),
+                'job_type': 'Full-time',
+                'tags': ','.join(rng.sample(TAGS, 2)),
+                'created_at': now,
+                'updated_at': now,
+            }
+            for i in range(batch_start, min(batch_start + 5000, stop))
+        ])
+        db.session.commit()
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', default='10000,100000', help='Comma separated row counts')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'list_bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from config import Config
+    Config.SQLALCHEMY_ECHO = False
+    Config.CACHE_ENABLED = False
+    from app import create_app
+    from flask import jsonify
+    from models.job import Job
+    from serializers import orjson
+
+    app = create_app()
+    client = app.test_client()
+    print(f"JSON encoder: {'orjson' if orjson is not None else 'json'}")
+
+    def legacy(limit=None):
+        # What get_jobs did before: hydrate Job objects, to_dict() each one and jsonify
+        with app.test_request_context():
+            query = Job.query.order_by(Job.posted_at.desc(), Job.id.desc())
+            jobs = query.limit(limit).all() if limit else query.all()
+            jsonify({'count': len(jobs), 'jobs': [job.to_dict() for job in jobs]}).get_data()
+
+    cases = [
+        ('full list', lambda: legacy(), '/api/jobs'),
+        ('limit=100', lambda: legacy(100), '/api/jobs?limit=100'),
+        ('full list fields=id,title', None, '/api/jobs?fields=id,title'),
+    ]
+
+    seeded = 0
+    with app.app_context():
+        for rows in [int(value) for value in args.rows.split(',')]:
+            print(f"\nSeeding up to {rows} jobs...")
+            seed(seeded, rows)
+            seeded = rows
+
+            print(f"{'request':<28}{'old (ms)':>12}{'new (ms)':>12}{'speedup':>10}")
+            for label, old, url in cases:
+                new_time = best_of(args.repeat, lambda: client.get(url).get_data())
+                if old is None:
+                    print(f"{label:<28}{'':>12}{new_time * 1000:>12.1f}")
+                    continue
+                old_time = best_of(args.repeat, old)
+                print(f"{label:<28}{old_time * 1000:>12.1f}{new_time * 1000:>12.1f}{old_time / new_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Simple HTTP load test for a running API server
+
+Keeps --concurrency clients sending requests to the given paths for --duration seconds and
+prints throughput and latency percentiles. Start the server first, e.g. python app.py or
+python wsgi.py --workers 4 --threads 8, then run from the backend directory:
+
+    python benchmarks/load_test.py --base-url http://127.0.0.1:5000 --concurrency 32 --duration 20
+"""
+
+import argparse
+import threading
+import time
+
+import requests
+
+DEFAULT_PATHS = ['/api/jobs?limit=50', '/api/jobs?job_type=Contract&limit=50', '/api/jobs/facets', '/api/jobs/1']
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def run_client(base_url, paths, deadline, latencies, errors, lock):
+    session = requests.Session()
+    position = 0
+    while time.perf_counter() < deadline:
+        path = paths[position % len(paths)]
+        position += 1
+        started = time.perf_counter()
+        try:
+            ok = session.get(base_url + path, timeout=30).status_code < 500
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            if ok:
+                latencies.append(elapsed)
+            else:
+                errors.append(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--path', action='append', dest='paths', help='Path to request, repeatable')
+    args = parser.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    latencies, errors, lock = [], [], threading.Lock()
+    deadline = time.perf_counter() + args.duration
+    clients = [
+        threading.Thread(target=run_client, args=(args.base_url, paths, deadline, latencies, errors, lock))
+        for _ in range(args.concurrency)
+    ]
+    started = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"{len(latencies)} requests in {elapsed:.1f}s with {args.concurrency} clients, {len(errors)} errors")
+    print(f"throughput  {len(latencies) / elapsed:.1f} req/s")
+    for label, fraction in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+        print(f"{label:<12}{percentile(latencies, fraction) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,305 @@
+"""
+Performance suite for the job API and the scraper's database writes
+
+Seeds a database with synthetic jobs (benchmarks/datagen.py) up to each requested size, then
+drives every job endpoint in-process from concurrent Flask test clients: list filters, sorts,
+keyset pages, search, facets, typeahead suggestions, the change feed, export, single gets, single and bulk writes, plus the upsert_jobs
+batches the scraper's save_to_database uses. Reports p50/p95/p99 latency and throughput per
+scenario and the process's peak resident memory per table size as JSON, so runs on two commits
+can be compared. Peak RSS never goes down, so it says nothing about a single scenario, with
+--trace-memory each scenario also reports how far Python allocations grew while it ran.
+
+Run from the backend directory:
+
+    python benchmarks/perf_suite.py --rows 10000,100000,1000000 --output perf.json
+    python benchmarks/perf_suite.py --rows 10000 --compare perf.json
+
+The default database is a throwaway SQLite file. --database-url points it at MySQL instead,
+use an empty scratch database since the suite inserts, updates and deletes jobs.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SEARCH_QUERIES = ['pricing actuary', 'reserving', 'senior analyst', 'pension consultant', 'python', 'acme re']
+SUGGEST_INPUTS = ['title&prefix=pri', 'title&prefix=senior%20a', 'company&prefix=ac', 'location&prefix=lon',
+                  'location&prefix=r', 'tag&prefix=p', 'tag&prefix=sol']
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, None where the platform does not report it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def summarize(latencies, errors, elapsed):
+    latencies.sort()
+    return {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'throughput_per_sec': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+    }
+
+
+def run_concurrently(app, call, requests, concurrency):
+    """Run call(client, worker, number) requests times spread over concurrency threads"""
+    latencies, lock = [], threading.Lock()
+    errors = [0]
+
+    def worker(index):
+        client = app.test_client()
+        for number in range(index, requests, concurrency):
+            started = time.perf_counter()
+            try:
+                ok = call(client, index, number)
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    # Peak of traced allocations above what was allocated before the scenario
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+        allocated_before = tracemalloc.get_traced_memory()[0]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    result = summarize(latencies, errors[0], time.perf_counter() - started)
+
+    if tracemalloc.is_tracing():
+        result['alloc_growth_mb'] = round((tracemalloc.get_traced_memory()[1] - allocated_before) / (1024 * 1024), 1)
+    return result
+
+
+def get(path):
+    """Scenario call sending GET path (a string or a function of the request number)"""
+    def call(client, worker, number):
+        url = path(number) if callable(path) else path
+        response = client.get(url)
+        response.get_data()
+        response.close()
+        return response.status_code == 200
+    return call
+
+
+def read_scenarios(app, max_id):
+    """(name, call) for every read endpoint and filter shape"""
+    client = app.test_client()
+    first_page = client.get('/api/jobs?limit=50').get_json()
+    cursor = first_page.get('next_cursor') or ''
+    recent = max(first_page.get('change_seq', 0) - 500, 0)
+    rng = random.Random(1)
+    ids = [rng.randint(1, max_id) for _ in range(1000)]
+    return [
+        ('list_first_page', get('/api/jobs?limit=50')),
+        ('list_page_500', get('/api/jobs?limit=500')),
+        ('list_next_page', get(f'/api/jobs?limit=50&cursor={cursor}')),
+        ('list_sort_asc', get('/api/jobs?limit=50&sort=posting_date_asc')),
+        ('list_include_count', get('/api/jobs?limit=50&include_count=true')),
+        ('list_fields', get('/api/jobs?limit=500&fields=id,title,company')),
+        ('filter_job_type', get('/api/jobs?job_type=Contract&limit=50')),
+        ('filter_location', get('/api/jobs?location=london&limit=50')),
+        ('filter_tag_all', get('/api/jobs?tag=Life,Python&limit=50')),
+        ('filter_tag_any', get('/api/jobs?tag=Pension,Health&tag_mode=any&limit=50')),
+        ('filter_posted_window', get('/api/jobs?posted_after=7 days ago&limit=50')),
+        ('filter_combined', get('/api/jobs?job_type=Full-time&tag=Pricing&posted_after=30 days ago&limit=50')),
+        ('search', get(lambda n: f'/api/jobs?search={SEARCH_QUERIES[n % len(SEARCH_QUERIES)]}&limit=50')),
+        ('search_filtered', get(lambda n: f'/api/jobs?search={SEARCH_QUERIES[n % len(SEARCH_QUERIES)]}&job_type=Full-time&limit=50')),
+        ('facets', get('/api/jobs/facets')),
+        ('facets_filtered', get('/api/jobs/facets?job_type=Contract')),
+        ('changes_recent', get(f'/api/jobs/changes?since={recent}')),
+        ('suggest', get(lambda n: f'/api/jobs/suggest?field={SUGGEST_INPUTS[n % len(SUGGEST_INPUTS)]}')),
+        ('export_filtered', get('/api/jobs/export?job_type=Internship&posted_after=2 days ago')),
+        ('get_job', get(lambda n: f'/api/jobs/{ids[n % len(ids)]}')),
+    ]
+
+
+def write_scenarios(run_id):
+    """(name, call) for the write endpoints, every call works on jobs of its own"""
+    def new_job(worker, number, prefix):
+        return {'title': f'{prefix} {run_id} {worker} {number}', 'company': 'Perf Suite Ltd',
+                'location': 'Remote', 'tags': ['Pricing', 'Python']}
+
+    created = {}
+
+    def create(client, worker, number):
+        response = client.post('/api/jobs', json=new_job(worker, number, 'Created'))
+        created[(worker, number)] = response.get_json().get('job', {}).get('id')
+        return response.status_code == 201
+
+    def update(client, worker, number):
+        job_id = created.get((worker, number))
+        return client.put(f'/api/jobs/{job_id}', json={'location': 'London, UK', 'tags': 'Life'}).status_code == 200
+
+    def delete(client, worker, number):
+        job_id = created.pop((worker, number), None)
+        return client.delete(f'/api/jobs/{job_id}').status_code == 200
+
+    def bulk_create(client, worker, number):
+        jobs = [new_job(worker, number * 100 + item, 'Bulk') for item in range(100)]
+        return client.post('/api/jobs/bulk', json={'jobs': jobs}).status_code == 200
+
+    return [('create_job', create), ('update_job', update), ('delete_job', delete), ('bulk_create_100', bulk_create)]
+
+
+def scraper_scenario(app, run_id, max_id):
+    """Pages of 30 jobs, half already stored, written with upsert_jobs like save_to_database"""
+    from datagen import generate_jobs
+    from bulk import upsert_jobs
+
+    def call(client, worker, number):
+        known = list(generate_jobs(number * 15 % max(max_id - 15, 1), number * 15 % max(max_id - 15, 1) + 15))
+        fresh = [dict(job, title=f'Scraped {run_id} {worker} {number} {job["title"]}') for job in known]
+        with app.app_context():
+            upsert_jobs(known + fresh)
+        return True
+    return ('scraper_upsert_page', call)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=backend_dir,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path):
+    """Print p50/p95 changes against a previous run's JSON"""
+    with open(baseline_path, encoding='utf-8') as baseline_file:
+        baseline = {entry['rows']: entry['scenarios'] for entry in json.load(baseline_file)['results']}
+
+    for entry in results:
+        before = baseline.get(entry['rows'])
+        if before is None:
+            continue
+        print(f"\n{entry['rows']} rows{'':<18}{'p50 before':>12}{'p50 after':>12}{'p95 before':>12}{'p95 after':>12}")
+        for name, after in entry['scenarios'].items():
+            old = before.get(name)
+            if old is None or old['p50_ms'] is None or after['p50_ms'] is None:
+                continue
+            change = (after['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100 if old['p50_ms'] else 0.0
+            flag = '  <-- slower' if change > 20 else ''
+            print(f"{name:<28}{old['p50_ms']:>12}{after['p50_ms']:>12}{old['p95_ms']:>12}{after['p95_ms']:>12}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default='10000,100000,1000000', help='Comma separated table sizes')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--database-url', default=None, help='Scratch database to use instead of a temp SQLite file')
+    parser.add_argument('--cache', action='store_true', help='Keep the response cache on (off by default)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Report per scenario allocation growth with tracemalloc, slows every request')
+    parser.add_argument('--output', default=None, help='Write the JSON report to this file')
+    parser.add_argument('--compare', default=None, help='Previous JSON report to compare against')
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'perf.db')}"
+    os.environ['DATABASE_URL'] = database_url
+
+    from config import Config
+    Config.SQLALCHEMY_DATABASE_URI = database_url
+    Config.SQLALCHEMY_ECHO = False
+    Config.CACHE_ENABLED = args.cache
+    from app import create_app
+    from db import db
+    from datagen import seed_database
+    from sqlalchemy import func
+    from models.job import Job
+
+    # Startup and seeding messages go to stderr so stdout carries only the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        app = create_app()
+    run_id = int(time.time())
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': None,
+            'concurrency': args.concurrency,
+            'requests_per_scenario': args.requests,
+            'response_cache': args.cache,
+            'trace_memory': args.trace_memory,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': [],
+    }
+
+    for rows in [int(value) for value in args.rows.split(',')]:
+        with app.app_context():
+            report['meta']['database'] = db.engine.dialect.name
+            print(f"Seeding up to {rows} jobs...", file=sys.stderr)
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(sys.stderr):
+                seed_database(rows)
+            seed_seconds = round(time.perf_counter() - started, 1)
+            max_id = db.session.query(func.max(Job.id)).scalar() or 1
+
+        # Traced after seeding, which would take much longer with it
+        if args.trace_memory:
+            tracemalloc.start()
+        scenarios = read_scenarios(app, max_id) + write_scenarios(run_id) + [scraper_scenario(app, run_id, rows)]
+        entry = {'rows': rows, 'seed_seconds': seed_seconds, 'scenarios': {}}
+        for name, call in scenarios:
+            print(f"  {rows} rows: {name}", file=sys.stderr)
+            requests = args.requests if name not in ('bulk_create_100',) else max(1, args.requests // 10)
+            entry['scenarios'][name] = run_concurrently(app, call, requests, args.concurrency)
+        tracemalloc.stop()
+        # Process wide and cumulative, so one value per table size after seeding and every scenario
+        entry['peak_rss_mb'] = peak_rss_mb()
+        report['results'].append(entry)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as report_file:
+            report_file.write(output)
+        print(f"Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.compare:
+        compare(report['results'], args.compare)
+
+
+if __name__ == '__main__':
+    main()
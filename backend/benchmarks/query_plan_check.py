@@ -0,0 +1,200 @@
+"""
+Query plan regression check for the job list and the scraper's upsert lookup
+
+Seeds a throwaway SQLite database, sends GET /api/jobs for every filter/sort/paging combination,
+a first and an incremental GET /api/jobs/changes plus one upsert_jobs batch, captures the SELECT statements they run and checks each one with
+EXPLAIN QUERY PLAN. A statement fails when it reads jobs, tags or job_tags with a full table
+scan, or walks all of jobs and then sorts it in a temp b-tree. Exits with status 1 on failure.
+Run from the backend directory: python benchmarks/query_plan_check.py, tests/test_query_plans.py
+runs the same checks under pytest.
+"""
+
+import argparse
+import itertools
+import os
+import re
+import sys
+import tempfile
+from urllib.parse import urlencode
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+CHECKED_TABLES = ('jobs', 'tags', 'job_tags')
+
+FILTERS = [
+    {},
+    {'job_type': 'Contract'},
+    {'location': 'london'},
+    {'tag': 'Life'},
+    {'tag': 'Life,SQL'},
+    {'tag': 'Life,SQL', 'tag_mode': 'any'},
+    {'search': 'pricing actuary'},
+    {'posted_after': '2024-01-01'},
+    {'posted_after': '30 days ago', 'posted_before': '1 day ago'},
+    {'job_type': 'Contract', 'posted_after': '2024-01-01'},
+    {'job_type': 'Contract', 'tag': 'Life'},
+    {'job_type': 'Contract', 'search': 'actuary'},
+    {'collapse_duplicates': 'true'},
+    {'tag': 'Life', 'collapse_duplicates': 'true'},
+]
+SORTS = [None, 'posting_date_desc', 'posting_date_asc', 'relevance']
+PAGING = ['all', 'first_page', 'next_page', 'count']
+
+# A location substring cannot use an index, so counting its matches has to read every row
+KNOWN_SCANS = [{'location', 'include_count'}]
+
+
+def seed_jobs(count):
+    titles = ['Pricing Actuary', 'Reserving Analyst', 'Actuarial Intern', 'Capital Modelling Lead']
+    tags = [['Life', 'SQL'], ['Life', 'Pricing'], ['P&C'], ['Health', 'SQL']]
+    return [
+        {
+            'title': f'{titles[i % len(titles)]} {i}',
+            'company': f'Company {i % 7}',
+            'location': ['London, UK', 'Remote', 'New York, USA'][i % 3],
+            'posting_date': f'{i % 60} days ago',
+            'job_type': ['Full-time', 'Contract', 'Internship'][i % 3],
+            'tags': ','.join(tags[i % len(tags)]),
+        }
+        for i in range(count)
+    ]
+
+
+def plan_problems(plan):
+    """Reasons a plan counts as a full scan, plan is the list of EXPLAIN QUERY PLAN detail lines"""
+    problems = []
+    scans_jobs = False
+    for detail in plan:
+        match = re.match(r'SCAN (?:TABLE )?(\w+)(.*)', detail)
+        if not match or match.group(1) not in CHECKED_TABLES:
+            continue
+        if 'INDEX' not in match.group(2):
+            problems.append(f'full table scan of {match.group(1)}')
+        if match.group(1) == 'jobs':
+            scans_jobs = True
+    if scans_jobs and any('TEMP B-TREE FOR ORDER BY' in detail for detail in plan):
+        problems.append('sorts all of jobs instead of reading an index in order')
+    return problems
+
+
+def capture_selects(engine):
+    """Start recording the SELECT statements run on the engine, returns the list they go to"""
+    from sqlalchemy import event
+
+    statements = []
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    return statements
+
+
+def explain(statement, parameters):
+    from db import db
+
+    rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)
+    return [row[-1] for row in rows]
+
+
+def list_request(client, filters, sort, paging):
+    """
+    (label, url, scan_expected) of GET /api/jobs for one filter/sort/paging combination
+
+    next_page follows the cursor of the first page, None when there is no second page.
+    """
+    args = dict(filters)
+    if sort:
+        args['sort'] = sort
+    if paging != 'all':
+        args['limit'] = 20
+    if paging == 'count':
+        args['include_count'] = 'true'
+    if paging == 'next_page':
+        cursor = client.get(f'/api/jobs?{urlencode(args)}').get_json().get('next_cursor')
+        if not cursor:
+            return None
+        args['cursor'] = cursor
+    scan_expected = any(names <= set(args) for names in KNOWN_SCANS)
+    return f'GET /api/jobs {paging} {urlencode(args)}', f'/api/jobs?{urlencode(args)}', scan_expected
+
+
+def list_requests(client):
+    """Every filter/sort/paging combination of GET /api/jobs as (label, url, scan_expected)"""
+    for filters, sort, paging in itertools.product(FILTERS, SORTS, PAGING):
+        request = list_request(client, filters, sort, paging)
+        if request is not None:
+            yield request
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--verbose', action='store_true', help='Print every plan, not only failures')
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'plans.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from config import Config
+    Config.SQLALCHEMY_DATABASE_URI = os.environ['DATABASE_URL']
+    Config.SQLALCHEMY_ECHO = False
+    Config.CACHE_ENABLED = False
+
+    from app import create_app
+    from db import db
+    from bulk import upsert_jobs
+
+    app = create_app()
+    client = app.test_client()
+    failures = checked = known = 0
+
+    with app.app_context():
+        upsert_jobs(seed_jobs(args.rows))
+        statements = capture_selects(db.engine)
+
+        def rescrape():
+            # Known jobs with a new posting date go through the scraper's (title, company) lookups
+            jobs = [dict(job, posting_date='Recently posted') for job in seed_jobs(args.rows)[:500]]
+            upsert_jobs(jobs)
+
+        cases = [('upsert_jobs lookup', rescrape, False)]
+        cases += [
+            (f'GET /api/jobs/changes since={since}', lambda since=since: client.get(f'/api/jobs/changes?since={since}'), False)
+            for since in (0, args.rows // 2)
+        ]
+        cases += [
+            (label, lambda url=url: client.get(url), scan_expected)
+            for label, url, scan_expected in list_requests(client)
+        ]
+
+        for label, run, scan_expected in cases:
+            statements.clear()
+            response = run()
+            if response is not None and response.status_code != 200:
+                print(f'FAIL {label}: status {response.status_code} {response.get_json()}')
+                failures += 1
+                continue
+
+            for statement, parameters in list(statements):
+                plan = explain(statement, parameters)
+                problems = plan_problems(plan)
+                checked += 1
+                if scan_expected and problems:
+                    known += 1
+                    problems = []
+                    if args.verbose:
+                        print(f'known {label}')
+                elif problems or args.verbose:
+                    print(f"FAIL {label}: {'; '.join(problems)}" if problems else f'ok   {label}')
+                    print('\n'.join(f'       {detail}' for detail in plan))
+                failures += bool(problems)
+
+    print(f'{checked} statements checked, {failures} failed, {known} known scans')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Benchmark full-text search against the old ilike search path
+
+Seeds a throwaway SQLite database with synthetic jobs and times both search paths.
+Run from the backend directory: python benchmarks/search_benchmark.py --rows 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+
+WORDS = ['Actuary', 'Actuarial', 'Pricing', 'Reserving', 'Analyst', 'Senior', 'Junior', 'Life',
+         'Health', 'Pension', 'Capital', 'Modelling', 'Consultant', 'Manager', 'Director', 'Risk']
+COMPANIES = ['Acme Re', 'Northwind Life', 'Contoso Insurance', 'Fabrikam Mutual', 'Globex Partners']
+TAGS = ['Life', 'Health', 'Pricing', 'Reserving', 'Pension', 'P&C', 'IFRS 17', 'Solvency II']
+QUERIES = ['actuary', 'pricing analyst', 'pens', 'senior reserving manager', 'northwind']
+
+
+def seed(rows):
+    from db import db
+    from models.job import Job
+
+    rng = random.Random(42)
+    batch = []
+    for i in range(rows):
+        batch.append({
+            'title': ' '.join(rng.sample(WORDS, 3)),
+            'company': rng.choice(COMPANIES),
+            'location': 'London, UK',
+            'posting_date': '2 days ago',
+            'job_type': 'Full-time',
+            'tags': ','.join(rng.sample(TAGS, 2)),
+        })
+        if len(batch) == 5000 or i == rows - 1:
+            db.session.execute(Job.__table__.insert(), batch)
+            db.session.commit()
+            batch = []
+
+
+def time_query(build, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(build().limit(50).all())
+        timings.append(time.perf_counter() - start)
+    return min(timings), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'search_bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from config import Config
+    Config.SQLALCHEMY_ECHO = False
+    from app import create_app
+    from models.job import Job
+    from search import apply_search, rank_ascending, like_search
+
+    app = create_app()
+    with app.app_context():
+        print(f"Seeding {args.rows} jobs into {db_path}...")
+        seed(args.rows)
+
+        print(f"\n{'query':<28}{'ilike (ms)':>12}{'fts (ms)':>12}{'speedup':>10}")
+        for q in QUERIES:
+            def fts():
+                query, rank = apply_search(Job.query, q)
+                return query.order_by(rank.asc() if rank_ascending() else rank.desc())
+
+            like_time, _ = time_query(lambda: like_search(Job.query, q).order_by(Job.created_at.desc()), args.repeat)
+            fts_time, _ = time_query(fts, args.repeat)
+            print(f"{q:<28}{like_time * 1000:>12.2f}{fts_time * 1000:>12.2f}{like_time / fts_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
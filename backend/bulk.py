@@ -0,0 +1,363 @@
+"""
+Set-based bulk writes for jobs
+
+Jobs are deduplicated on (title, company) which is backed by the uq_jobs_title_company unique
+index. Each batch costs one SELECT to classify rows, one multi-row upsert and a couple of
+statements to sync the job_tags table, instead of one round-trip per job. Every write also
+applies its deltas to the facet summary table and stamps the rows with change feed sequences
+in the same transaction. Deletes leave tombstones, a deleted job that is written again comes
+back under its old id. New and revived jobs are checked for near duplicates, and so are jobs
+whose title, company, location or tags change, see duplicates.py.
+The scraper upserts leave out listings posted before the archive retention window, unless they
+are still live, see archive.py.
+"""
+
+from datetime import datetime
+from sqlalchemy import select, tuple_, and_, insert, update, delete
+from db import db
+from models.job import Job, parse_posting_date
+from models.tag import Tag, job_tags, parse_tags
+from models.archive import ArchivedJob, retention_cutoff
+from facets import facet_keys, job_facet_keys, facet_deltas
+from changes import claim_job_write
+from duplicates import register_jobs, reregister_jobs, release_duplicates, SIGNATURE_FIELDS
+
+UPSERT_BATCH_SIZE = 500
+
+# Columns compared to tell whether an already stored job changed when scraped again
+REFRESH_COLUMNS = ('posting_date', 'tags')
+
+# Columns written when it did, posted_at follows posting_date
+WRITE_COLUMNS = REFRESH_COLUMNS + ('posted_at', 'change_seq')
+
+
+def normalize_job_row(job_data):
+    """Build a jobs table row from a job dict, tags become a clean comma separated string"""
+    posted_at = job_data.get('posted_at') or parse_posting_date(job_data.get('posting_date'))
+    return {
+        'title': job_data['title'],
+        'company': job_data['company'],
+        'location': job_data['location'],
+        'posting_date': job_data.get('posting_date'),
+        'posted_at': posted_at or datetime.utcnow(),
+        'job_type': job_data.get('job_type') or 'Full-time',
+        'tags': ','.join(parse_tags(job_data.get('tags'))),
+    }
+
+
+def key_filter(keys):
+    """
+    WHERE clause matching (title, company) keys through the uq_jobs_title_company index
+
+    SQLite never uses an index for a row value IN list, the title IN list in front of it lets
+    it seek the index on its title prefix.
+    """
+    return and_(Job.title.in_({title for title, _ in keys}), tuple_(Job.title, Job.company).in_(keys))
+
+
+def upsert_statement(rows):
+    """Multi-row INSERT that refreshes WRITE_COLUMNS on a (title, company) conflict"""
+    dialect = db.engine.dialect.name
+    now = datetime.utcnow()
+
+    if dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        statement = mysql_insert(Job.__table__).values(rows)
+        refresh = {name: statement.inserted[name] for name in WRITE_COLUMNS}
+        return statement.on_duplicate_key_update(updated_at=now, **refresh)
+
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        statement = sqlite_insert(Job.__table__).values(rows)
+        refresh = {name: statement.excluded[name] for name in WRITE_COLUMNS}
+        return statement.on_conflict_do_update(
+            index_elements=['title', 'company'],
+            set_=dict(updated_at=now, **refresh)
+        )
+
+    return None
+
+
+def sync_job_tags(tag_names_by_job):
+    """Replace the job_tags rows of the given jobs, tag_names_by_job maps job id -> tag names"""
+    if not tag_names_by_job:
+        return
+
+    all_names = parse_tags([name for names in tag_names_by_job.values() for name in names])
+    tags_by_slug = {tag.slug: tag for tag in Tag.get_or_create_many(all_names)}
+    db.session.flush()
+
+    db.session.execute(delete(job_tags).where(job_tags.c.job_id.in_(list(tag_names_by_job))))
+    pairs = [
+        {'job_id': job_id, 'tag_id': tags_by_slug[Tag.slugify(name)].id}
+        for job_id, names in tag_names_by_job.items()
+        for name in names
+    ]
+    if pairs:
+        db.session.execute(insert(job_tags), pairs)
+
+
+def revive_jobs(rows_by_id, seqs):
+    """Turn tombstones back into live jobs holding the values of normalized rows, keyed by job id, archived copies are dropped"""
+    now = datetime.utcnow()
+    db.session.execute(update(Job), [
+        dict(row, id=job_id, change_seq=seq, deleted_at=None, created_at=now, updated_at=now, last_seen_at=now)
+        for (job_id, row), seq in zip(rows_by_id.items(), seqs)
+    ])
+    ArchivedJob.discard(list(rows_by_id))
+
+
+def touch_jobs(keys, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Mark the live jobs with the given (title, company) keys as listed now, without committing
+
+    updated_at and the change feed are left alone. Used for listings the scraper skipped as
+    known and unchanged, so archive-jobs --unseen-days does not take them for gone.
+    """
+    now = datetime.utcnow()
+    for start in range(0, len(keys), batch_size):
+        db.session.execute(
+            update(Job.__table__)
+            .where(key_filter(keys[start:start + batch_size]), Job.deleted_at.is_(None))
+            .values(last_seen_at=now, updated_at=Job.updated_at)
+        )
+
+
+def upsert_jobs_batch(rows):
+    """Upsert one batch of normalized rows, returns (inserted, updated, unchanged, expired) counts"""
+    # Last occurrence wins when the batch itself contains the same key twice
+    rows = list({(row['title'], row['company']): row for row in rows}.values())
+    keys = [(row['title'], row['company']) for row in rows]
+
+    # One SELECT to find which keys already exist and whether they changed
+    existing = {
+        (found.title, found.company): found
+        for found in db.session.execute(
+            select(Job.id, Job.title, Job.company, Job.deleted_at, *[getattr(Job, name) for name in REFRESH_COLUMNS])
+            .where(key_filter(keys))
+        )
+    }
+
+    new_rows, changed_rows, revived = [], [], {}
+    old_keys, new_keys = [], []
+    expired = 0
+    cutoff = retention_cutoff()
+    for row in rows:
+        found = existing.get((row['title'], row['company']))
+        if (found is None or found.deleted_at is not None) and row['posted_at'] < cutoff:
+            # archive-jobs would only move it out again
+            expired += 1
+        elif found is None:
+            new_rows.append(row)
+            new_keys.extend(job_facet_keys(row))
+        elif found.deleted_at is not None:
+            # Listed again after being deleted, counts as new
+            revived[found.id] = row
+            new_keys.extend(job_facet_keys(row))
+        elif any(getattr(found, name) != row[name] for name in REFRESH_COLUMNS):
+            changed_rows.append(row)
+            # Only tags can move between facet values, job_type and location are not refreshed
+            old_keys.extend(facet_keys(None, None, found.tags)[1:])
+            new_keys.extend(facet_keys(None, None, row['tags'])[1:])
+
+    write_rows = new_rows + changed_rows
+    unchanged = len(rows) - len(write_rows) - len(revived) - expired
+    if write_rows or revived:
+        # One change sequence per written job, claimed before the seen rows below are locked
+        seqs = iter(claim_job_write(len(write_rows) + len(revived), facet_deltas(old_keys, new_keys)))
+
+    # Every live job listed again counts as seen, updated_at and the change feed are left alone
+    seen_ids = [found.id for found in existing.values() if found.deleted_at is None]
+    if seen_ids:
+        db.session.execute(
+            update(Job.__table__)
+            .where(Job.id.in_(seen_ids))
+            .values(last_seen_at=datetime.utcnow(), updated_at=Job.updated_at)
+        )
+    if not write_rows and not revived:
+        return 0, 0, unchanged, expired
+
+    write_rows = [dict(row, change_seq=next(seqs)) for row in write_rows]
+    tag_names_by_job = {}
+    if write_rows:
+        statement = upsert_statement(write_rows)
+        if statement is not None:
+            db.session.execute(statement)
+        else:
+            # Generic fallback for databases without an upsert dialect
+            if new_rows:
+                db.session.execute(insert(Job.__table__), write_rows[:len(new_rows)])
+            for row in write_rows[len(new_rows):]:
+                db.session.execute(
+                    update(Job.__table__)
+                    .where(Job.title == row['title'], Job.company == row['company'])
+                    .values(updated_at=datetime.utcnow(), **{name: row[name] for name in WRITE_COLUMNS})
+                )
+
+        # Resolve ids of the written rows to keep their tags table in sync
+        written_keys = [(row['title'], row['company']) for row in write_rows]
+        ids = {
+            (found.title, found.company): found.id
+            for found in db.session.execute(
+                select(Job.id, Job.title, Job.company).where(key_filter(written_keys))
+            )
+        }
+        tag_names_by_job.update(
+            (ids[(row['title'], row['company'])], parse_tags(row['tags']))
+            for row in write_rows
+        )
+
+    if revived:
+        revive_jobs(revived, seqs)
+        tag_names_by_job.update((job_id, parse_tags(row['tags'])) for job_id, row in revived.items())
+
+    sync_job_tags(tag_names_by_job)
+    register_jobs(
+        [dict(row, id=ids[(row['title'], row['company'])]) for row in new_rows]
+        + [dict(row, id=job_id) for job_id, row in revived.items()]
+    )
+    reregister_jobs([
+        dict(row, id=ids[(row['title'], row['company'])])
+        for row in changed_rows if existing[(row['title'], row['company'])].tags != row['tags']
+    ])
+    return len(new_rows) + len(revived), len(changed_rows), unchanged, expired
+
+
+def upsert_jobs(jobs_data, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Insert new jobs and refresh posting_date/tags of existing ones in batched upserts
+
+    Commits after every batch and returns a dict of inserted/updated/unchanged counts, expired
+    counts the listings left out for being posted before the retention window.
+    """
+    counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'expired': 0}
+    rows = [normalize_job_row(job_data) for job_data in jobs_data]
+
+    for start in range(0, len(rows), batch_size):
+        try:
+            inserted, updated, unchanged, expired = upsert_jobs_batch(rows[start:start + batch_size])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        counts['inserted'] += inserted
+        counts['updated'] += updated
+        counts['unchanged'] += unchanged
+        counts['expired'] += expired
+
+    return counts
+
+
+def insert_jobs(rows, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Insert normalized rows with multi-row INSERTs without committing
+
+    Rows must not conflict on (title, company) with a live job, the tombstone of a deleted one
+    is revived instead. Returns the ids in the order of rows.
+    """
+    ids = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        keys = [(row['title'], row['company']) for row in batch]
+        tombstones = {
+            (found.title, found.company): found.id
+            for found in db.session.execute(
+                select(Job.id, Job.title, Job.company).where(key_filter(keys), Job.deleted_at.isnot(None))
+            )
+        }
+
+        seqs = iter(claim_job_write(
+            len(batch), facet_deltas(new_keys=[key for row in batch for key in job_facet_keys(row)])
+        ))
+        new_rows = [
+            dict(row, change_seq=next(seqs))
+            for row in batch if (row['title'], row['company']) not in tombstones
+        ]
+        if new_rows:
+            db.session.execute(insert(Job.__table__).values(new_rows))
+        if tombstones:
+            revive_jobs({tombstones[key]: row for key, row in zip(keys, batch) if key in tombstones}, seqs)
+
+        ids_by_key = {
+            (found.title, found.company): found.id
+            for found in db.session.execute(
+                select(Job.id, Job.title, Job.company).where(key_filter(keys))
+            )
+        }
+        batch_ids = [ids_by_key[key] for key in keys]
+        sync_job_tags({job_id: parse_tags(row['tags']) for job_id, row in zip(batch_ids, batch)})
+        register_jobs([dict(row, id=job_id) for job_id, row in zip(batch_ids, batch)])
+        ids.extend(batch_ids)
+    return ids
+
+
+def facet_rows(ids):
+    """Current job_type/location/tags of jobs by id, the 'before' side of facet deltas"""
+    return {
+        found.id: {'job_type': found.job_type, 'location': found.location, 'tags': found.tags}
+        for found in db.session.execute(
+            select(Job.id, Job.job_type, Job.location, Job.tags).where(Job.id.in_(ids))
+        )
+    }
+
+
+def update_jobs(changes, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Apply partial updates by primary key without committing
+
+    changes is a list of dicts holding an id plus the columns to set, a tags value replaces the
+    job's tags. Rows setting the same columns are sent together as one executemany UPDATE. Jobs
+    whose title, company, location or tags change are checked for near duplicates again.
+    """
+    now = datetime.utcnow()
+    for start in range(0, len(changes), batch_size):
+        batch = changes[start:start + batch_size]
+        before = facet_rows([change['id'] for change in batch])
+        old_keys, new_keys = [], []
+        for change in batch:
+            old = before.get(change['id'])
+            if old is not None:
+                old_keys.extend(job_facet_keys(old))
+                new_keys.extend(job_facet_keys(dict(old, **change)))
+
+        rows = []
+        tag_names_by_job = {}
+        for change, seq in zip(batch, claim_job_write(len(batch), facet_deltas(old_keys, new_keys))):
+            row = dict(change, updated_at=now, change_seq=seq)
+            if 'posting_date' in row:
+                row['posted_at'] = parse_posting_date(row['posting_date']) or now
+            if 'tags' in row:
+                names = parse_tags(row['tags'])
+                row['tags'] = ','.join(names)
+                tag_names_by_job[row['id']] = names
+            rows.append(row)
+
+        db.session.execute(update(Job), rows)
+        sync_job_tags(tag_names_by_job)
+
+        # Only some of the signature fields may be in a change, the stored values are read back
+        reworded = [row['id'] for row in rows if any(name in row for name in SIGNATURE_FIELDS[1:])]
+        if reworded:
+            reregister_jobs([
+                found._asdict() for found in db.session.execute(
+                    select(*[getattr(Job, name) for name in SIGNATURE_FIELDS]).where(Job.id.in_(reworded))
+                )
+            ])
+
+
+def delete_jobs(ids, batch_size=UPSERT_BATCH_SIZE):
+    """Delete jobs and their tag links by id without committing, the rows stay as tombstones"""
+    now = datetime.utcnow()
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        seqs = claim_job_write(
+            len(batch), facet_deltas(old_keys=[key for old in facet_rows(batch).values() for key in job_facet_keys(old)])
+        )
+        db.session.execute(delete(job_tags).where(job_tags.c.job_id.in_(batch)))
+        db.session.execute(update(Job), [
+            {'id': job_id, 'deleted_at': now, 'updated_at': now, 'change_seq': seq}
+            for job_id, seq in zip(batch, seqs)
+        ])
+        release_duplicates(batch)
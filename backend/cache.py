@@ -0,0 +1,136 @@
+"""
+In-process response cache for the read endpoints
+
+Entries are bounded by an LRU size limit and a TTL, and are tagged with the write generation
+they were built at. Every API write bumps the generation so older entries are treated as misses.
+The cache is per process, writes made by other processes (the scraper, other workers) become
+visible once the TTL expires. A client inside its read-your-writes window (see replica.py) is
+never answered from the cache, an entry may predate its write in another worker.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, make_response
+from replica import READ_METHODS, wrote_recently
+
+
+class ResponseCache:
+    def __init__(self, max_entries=512, ttl=30, enabled=True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Read cache settings from the app config"""
+        self.max_entries = app.config.get('CACHE_MAX_ENTRIES', self.max_entries)
+        self.ttl = app.config.get('CACHE_TTL', self.ttl)
+        self.enabled = app.config.get('CACHE_ENABLED', self.enabled)
+        self.clear()
+
+        @app.after_request
+        def bump_after_write(response):
+            if request.method not in READ_METHODS and response.status_code < 400:
+                self.bump()
+            return response
+
+    def get(self, key):
+        """Return the cached (body, etag) for key or None, counting the hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                generation, expires_at, body, etag = entry
+                if generation == self.generation and expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return body, etag
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, body, etag, generation):
+        """Store a response body built at the given generation"""
+        with self._lock:
+            # Skip results computed before a write that happened while they were being built
+            if generation != self.generation:
+                return
+            self._entries[key] = (generation, time.monotonic() + self.ttl, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump(self):
+        """Invalidate every cached response, called after each successful API write request"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'generation': self.generation,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+response_cache = ResponseCache()
+
+
+def normalized_args():
+    """Query args as a hashable key independent of parameter order, empty values are dropped"""
+    return tuple(sorted(
+        (name, tuple(sorted(value for value in request.args.getlist(name) if value)))
+        for name in request.args
+        if any(request.args.getlist(name))
+    ))
+
+
+def cached_response(view):
+    """Cache successful JSON responses of a GET view and answer conditional requests with 304"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not response_cache.enabled or wrote_recently():
+            return view(*args, **kwargs)
+
+        key = (request.endpoint, tuple(sorted(kwargs.items())), normalized_args())
+        cached = response_cache.get(key)
+
+        if cached is None:
+            generation = response_cache.generation
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data()
+            etag = hashlib.md5(body).hexdigest()
+            response_cache.set(key, body, etag, generation)
+            response.headers['X-Cache'] = 'MISS'
+        else:
+            body, etag = cached
+            response = make_response(body, 200, {'Content-Type': 'application/json', 'X-Cache': 'HIT'})
+
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+    return wrapper
@@ -0,0 +1,228 @@
+"""
+Change feed for syncing the jobs table incrementally
+
+Every write stamps the jobs it touches with the next value of one global change sequence, and
+deleting a job only sets deleted_at so the row stays behind as a tombstone. A client remembers
+the highest sequence it has seen and asks for the rows above it, which are the jobs created,
+updated or deleted since. The sequence is a counter row updated inside the writing transaction,
+its row lock holds concurrent writers back until commit so sequences become visible in order.
+Write paths take it with claim_job_write() before any other row, which keeps one lock order.
+
+Tombstones are purged after a while (flask --app app purge-tombstones), the highest purged
+sequence is kept so clients further behind than that are told to refetch instead.
+
+ChangeFeedMirror is the same protocol for in-process copies of the jobs table (job_index.py,
+suggest.py): they pick up writes of other processes, like the scraper, from the feed.
+"""
+
+import threading
+import time
+from sqlalchemy import select, update, insert, delete, func
+from db import db
+from models.job import Job
+from models.change import ChangeCounter
+from models.duplicate import job_signatures, job_lsh_buckets
+from facets import adjust_facet_counts
+
+JOBS_COUNTER = 'jobs'
+PURGED_COUNTER = 'jobs_purged'
+
+# Rows per feed page when a mirror loads or syncs
+MIRROR_BATCH_SIZE = 5000
+
+# Mirrors updated by the API after its own writes
+mirrors = []
+
+
+def counter_value(name):
+    return db.session.execute(select(ChangeCounter.value).where(ChangeCounter.name == name)).scalar() or 0
+
+
+def current_change_seq():
+    """Last change sequence handed out"""
+    return counter_value(JOBS_COUNTER)
+
+
+def purged_change_seq():
+    """Highest sequence of a purged tombstone, feed positions below it cannot be caught up"""
+    return counter_value(PURGED_COUNTER)
+
+
+def init_change_counters():
+    """Create missing counter rows, the sequence continues after the highest stored change_seq (does not commit)"""
+    if db.session.get(ChangeCounter, JOBS_COUNTER) is None:
+        last = db.session.query(func.max(Job.change_seq)).scalar() or 0
+        db.session.add(ChangeCounter(name=JOBS_COUNTER, value=last))
+    if db.session.get(ChangeCounter, PURGED_COUNTER) is None:
+        db.session.add(ChangeCounter(name=PURGED_COUNTER, value=0))
+    db.session.flush()
+
+
+def next_change_seqs(count=1):
+    """Reserve `count` consecutive change sequences in the current transaction, returns them as a range"""
+    table = ChangeCounter.__table__
+    result = db.session.execute(
+        update(table).where(table.c.name == JOBS_COUNTER).values(value=table.c.value + count)
+    )
+    if result.rowcount == 0:
+        init_change_counters()
+        return next_change_seqs(count)
+    last = counter_value(JOBS_COUNTER)
+    return range(last - count + 1, last + 1)
+
+
+def next_change_seq():
+    return next_change_seqs(1)[0]
+
+
+def claim_job_write(count, deltas=None):
+    """
+    Reserve the change sequences of a write of `count` jobs and apply its facet count deltas
+
+    The first step of every job write, before any jobs row is touched. Writers lock the counter
+    row, then facet rows, then jobs rows, so two transactions never wait on each other's locks
+    (InnoDB would abort one as a deadlock). Pending ORM changes are flushed after, not before.
+    Returns the sequences as a range, does not commit.
+    """
+    with db.session.no_autoflush:
+        seqs = next_change_seqs(count)
+        adjust_facet_counts(deltas or {})
+    return seqs
+
+
+def job_changes(columns, since, limit):
+    """
+    Rows changed after the `since` sequence, oldest change first, returns (rows, has_more)
+
+    Rows hold the given columns followed by change_seq and deleted_at. since=0 is a first sync,
+    the client has nothing to delete yet so tombstones are left out.
+    """
+    query = (
+        select(*columns, Job.change_seq, Job.deleted_at)
+        .where(Job.change_seq > since)
+        .order_by(Job.change_seq)
+        .limit(limit + 1)
+    )
+    if not since:
+        query = query.where(Job.deleted_at.is_(None))
+    rows = db.session.execute(query).all()
+    return rows[:limit], len(rows) > limit
+
+
+def purge_tombstones(deleted_before, limit=500):
+    """Remove up to `limit` tombstones deleted before a datetime and move the purge horizon, does not commit"""
+    rows = db.session.execute(
+        select(Job.id, Job.change_seq)
+        .where(Job.deleted_at < deleted_before)
+        .order_by(Job.change_seq)
+        .limit(limit)
+    ).all()
+    if not rows:
+        return 0
+
+    ids = [row.id for row in rows]
+    # Near duplicate signatures go first, SQLite does not enforce their ON DELETE CASCADE
+    db.session.execute(delete(job_lsh_buckets).where(job_lsh_buckets.c.job_id.in_(ids)))
+    db.session.execute(delete(job_signatures).where(job_signatures.c.job_id.in_(ids)))
+    db.session.execute(delete(Job.__table__).where(Job.id.in_(ids)))
+    horizon = max(row.change_seq or 0 for row in rows)
+    table = ChangeCounter.__table__
+    result = db.session.execute(
+        update(table)
+        .where(table.c.name == PURGED_COUNTER, table.c.value < horizon)
+        .values(value=horizon)
+    )
+    if result.rowcount == 0 and db.session.get(ChangeCounter, PURGED_COUNTER) is None:
+        db.session.execute(insert(table).values(name=PURGED_COUNTER, value=horizon))
+    return len(rows)
+
+
+def register_mirror(mirror):
+    mirrors.append(mirror)
+    return mirror
+
+
+def apply_to_mirrors(job):
+    """Pass a committed write of one job to every mirror, those not loaded ignore it"""
+    for mirror in mirrors:
+        mirror.apply(job)
+
+
+def sync_mirrors():
+    """Have every loaded mirror read the feed, after writes of many jobs (call inside app context)"""
+    for mirror in mirrors:
+        mirror.sync()
+
+
+class ChangeFeedMirror:
+    """
+    Base for in-memory structures built from the live jobs and kept current through the feed
+
+    Subclasses list the Job attributes they need in `fields` and implement _rebuild(rows) to
+    replace their contents with the live jobs and apply(job) to take in one Job or feed row,
+    ignoring a version older than the one they hold (its change_seq is lower).
+    """
+    name = 'Mirror'
+    fields = ('id',)
+
+    def __init__(self, sync_seconds=2.0):
+        self.sync_seconds = sync_seconds
+        self._lock = threading.RLock()
+        self.ready = False
+        self.seq = 0  # Highest change_seq read from the feed
+        self.synced_at = 0.0
+
+    def _rebuild(self, rows):
+        raise NotImplementedError
+
+    def apply(self, job):
+        raise NotImplementedError
+
+    def _columns(self):
+        return [getattr(Job, name) for name in self.fields]
+
+    def load(self):
+        """Read every live job through the feed and replace the contents (call inside app context)"""
+        started = time.perf_counter()
+        latest, seq = {}, 0
+        while True:
+            rows, has_more = job_changes(self._columns(), seq, MIRROR_BATCH_SIZE)
+            for row in rows:
+                if row.deleted_at is None:
+                    latest[row.id] = row
+                else:
+                    latest.pop(row.id, None)
+            if rows:
+                seq = rows[-1].change_seq
+            if not has_more:
+                break
+
+        with self._lock:
+            self._rebuild(sorted(latest.values(), key=lambda row: row.id))
+            self.seq = seq
+            self.synced_at = time.monotonic()
+            self.ready = True
+        print(f"{self.name} loaded: {len(latest)} jobs in {time.perf_counter() - started:.2f}s")
+
+    def sync(self):
+        """Apply the changes made since the last sync by any process (call inside app context)"""
+        if not self.ready:
+            return
+        with self._lock:
+            # Deletes this copy never saw were purged from the feed, only a reload catches up
+            if self.seq < purged_change_seq():
+                self.load()
+                return
+            while True:
+                rows, has_more = job_changes(self._columns(), self.seq, MIRROR_BATCH_SIZE)
+                for row in rows:
+                    self.apply(row)
+                if rows:
+                    self.seq = max(self.seq, rows[-1].change_seq)
+                if not has_more:
+                    break
+            self.synced_at = time.monotonic()
+
+    def sync_if_stale(self):
+        if time.monotonic() - self.synced_at >= self.sync_seconds:
+            self.sync()
@@ -0,0 +1,280 @@
+import click
+from db import db
+
+
+def register_commands(app):
+    """Register maintenance commands on the Flask CLI (run with: flask --app app <command>)"""
+    
+    @app.cli.command('backfill-tags')
+    @click.option('--batch-size', default=500, help='Number of jobs processed per commit')
+    def backfill_tags(batch_size):
+        """Populate the tags/job_tags tables from the comma-separated jobs.tags column"""
+        from models.job import Job
+        
+        processed = 0
+        last_id = 0
+        while True:
+            jobs = (
+                Job.query.filter(Job.id > last_id)
+                .order_by(Job.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not jobs:
+                break
+            
+            for job in jobs:
+                job.set_tags(job.tags)
+            db.session.commit()
+            
+            processed += len(jobs)
+            last_id = jobs[-1].id
+            print(f"  Backfilled tags for {processed} jobs...")
+        
+        print(f"Tag backfill complete: {processed} jobs processed")
+        refresh_facets()
+    
+    @app.cli.command('backfill-posted-at')
+    @click.option('--batch-size', default=1000, help='Number of jobs processed per commit')
+    @click.option('--all', 'reparse_all', is_flag=True, help='Reparse every job, not only those without posted_at')
+    def backfill_posted_at(batch_size, reparse_all):
+        """Fill jobs.posted_at from posting_date, relative dates count back from created_at"""
+        from models.job import Job, parse_posting_date
+        from changes import next_change_seqs
+        from sqlalchemy import update, bindparam
+        from datetime import datetime
+        
+        # Plain executemany UPDATE by id that leaves updated_at untouched, the change feed
+        # still carries the rows since their posted_at is new to clients
+        statement = (
+            update(Job.__table__)
+            .where(Job.id == bindparam('job_id'))
+            .values(posted_at=bindparam('parsed'), change_seq=bindparam('seq'), updated_at=Job.updated_at)
+        )
+        
+        processed = 0
+        last_id = 0
+        while True:
+            query = db.session.query(Job.id, Job.posting_date, Job.created_at).filter(Job.id > last_id)
+            if not reparse_all:
+                query = query.filter(Job.posted_at.is_(None))
+            rows = query.order_by(Job.id).limit(batch_size).all()
+            if not rows:
+                break
+            
+            # "2 days ago" meant two days before the row was stored, not before today
+            db.session.execute(statement, [
+                {
+                    'job_id': row.id,
+                    'parsed': parse_posting_date(row.posting_date, now=row.created_at) or row.created_at or datetime.utcnow(),
+                    'seq': seq
+                }
+                for row, seq in zip(rows, next_change_seqs(len(rows)))
+            ])
+            db.session.commit()
+            
+            processed += len(rows)
+            last_id = rows[-1].id
+            print(f"  Backfilled posted_at for {processed} jobs...")
+        
+        print(f"posted_at backfill complete: {processed} jobs processed")
+    
+    @app.cli.command('dedupe-jobs')
+    def dedupe_jobs():
+        """Delete duplicate (title, company) jobs keeping the oldest row, then apply pending migrations"""
+        from models.job import Job
+        from models.tag import job_tags
+        from sqlalchemy import func, delete
+        from migrations import run_migrations
+        from changes import init_change_counters
+        
+        keep_ids = (
+            db.session.query(func.min(Job.id))
+            .group_by(Job.title, Job.company)
+            .scalar_subquery()
+        )
+        duplicates = [job_id for (job_id,) in db.session.query(Job.id).filter(Job.id.notin_(keep_ids))]
+        
+        # Core deletes, loading Job objects needs columns that later migrations add. These run
+        # before the unique index exists so they are removed outright, not left as tombstones
+        for start in range(0, len(duplicates), 500):
+            batch = duplicates[start:start + 500]
+            db.session.execute(delete(job_tags).where(job_tags.c.job_id.in_(batch)))
+            db.session.execute(delete(Job.__table__).where(Job.id.in_(batch)))
+            db.session.commit()
+        
+        print(f"Removed {len(duplicates)} duplicate jobs")
+        if not run_migrations():
+            return
+        init_change_counters()
+        refresh_facets()
+    
+    @app.cli.command('sync-replica')
+    def sync_replica():
+        """Copy a SQLite primary into the SQLite replica file, stands in for replication locally"""
+        from db import REPLICA_BIND
+        
+        replica = db.engines.get(REPLICA_BIND)
+        if replica is None or db.engine.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+            print("sync-replica needs SQLite files in DATABASE_URL and REPLICA_DATABASE_URL")
+            return
+        
+        source = db.engine.raw_connection()
+        target = replica.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+        finally:
+            source.close()
+            target.close()
+        print(f"Copied {db.engine.url.database} to {replica.url.database}")
+    
+    @app.cli.command('purge-tombstones')
+    @click.option('--days', default=30, help='Keep tombstones of jobs deleted in the last DAYS days')
+    @click.option('--batch-size', default=500, help='Number of tombstones removed per commit')
+    def purge_tombstones(days, batch_size):
+        """Remove deleted jobs from the change feed, clients that last synced before them must refetch"""
+        from changes import purge_tombstones as purge_batch
+        from datetime import datetime, timedelta
+        
+        deleted_before = datetime.utcnow() - timedelta(days=days)
+        purged = 0
+        while True:
+            removed = purge_batch(deleted_before, batch_size)
+            db.session.commit()
+            if not removed:
+                break
+            purged += removed
+            print(f"  Purged {purged} tombstones...")
+        
+        print(f"Tombstone purge complete: {purged} jobs deleted before {deleted_before:%Y-%m-%d} removed")
+    
+    @app.cli.command('detect-duplicates')
+    @click.option('--batch-size', default=500, help='Number of jobs processed per commit')
+    @click.option('--reset', is_flag=True, help='Recompute every job, needed after changing DUPLICATE_THRESHOLD')
+    def detect_duplicates(batch_size, reset):
+        """Compute near duplicate signatures of live jobs stored without one and mark the duplicates"""
+        from models.job import Job
+        from models.duplicate import job_signatures, job_lsh_buckets
+        from duplicates import register_jobs, SIGNATURE_FIELDS
+        from sqlalchemy import select, delete
+        
+        if reset:
+            db.session.execute(delete(job_lsh_buckets))
+            db.session.execute(delete(job_signatures))
+            db.session.commit()
+        
+        # Id order, so the oldest listing of each group is the one left unmarked
+        processed = marked = 0
+        last_id = 0
+        while True:
+            rows = db.session.execute(
+                select(*[getattr(Job, name) for name in SIGNATURE_FIELDS])
+                .outerjoin(job_signatures, job_signatures.c.job_id == Job.id)
+                .where(Job.id > last_id, Job.deleted_at.is_(None), job_signatures.c.job_id.is_(None))
+                .order_by(Job.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            
+            marked += register_jobs([row._asdict() for row in rows])
+            db.session.commit()
+            
+            processed += len(rows)
+            last_id = rows[-1].id
+            print(f"  Checked {processed} jobs, {marked} near duplicates...")
+        
+        print(f"Duplicate detection complete: {processed} jobs checked, {marked} marked as near duplicates")
+
+    @app.cli.command('archive-jobs')
+    @click.option('--days', type=int, default=None, help='Archive jobs posted more than DAYS days ago (default: ARCHIVE_RETENTION_DAYS)')
+    @click.option('--unseen-days', type=int, default=None, help='Also archive jobs the scraper has not listed for UNSEEN_DAYS days')
+    @click.option('--batch-size', default=500, help='Number of jobs moved per commit')
+    def archive_jobs(days, unseen_days, batch_size):
+        """Move old or no longer listed jobs to jobs_archive, meant to run on a schedule"""
+        from archive import archive_candidates, archive_jobs as archive_batch
+        from datetime import datetime, timedelta
+
+        now = datetime.utcnow()
+        posted_before = now - timedelta(days=days or app.config['ARCHIVE_RETENTION_DAYS'])
+        seen_before = now - timedelta(days=unseen_days) if unseen_days else None
+        archived = 0
+        while True:
+            ids = archive_candidates(posted_before, seen_before, batch_size)
+            if not ids:
+                break
+            archive_batch(ids)
+            db.session.commit()
+            archived += len(ids)
+            print(f"  Archived {archived} jobs...")
+
+        print(f"Archive complete: {archived} jobs moved to jobs_archive, remove their tombstones with purge-tombstones")
+
+    @app.cli.command('check-job-index')
+    @click.option('--pages', default=3, help='Pages followed per paginated request')
+    def check_job_index(pages):
+        """Compare GET /api/jobs answered by the in-memory index with the SQL answers, exits 1 on a difference"""
+        from urllib.parse import urlencode
+        from cache import response_cache
+        from job_index import job_index, relevance_sort
+        
+        if not job_index.ready:
+            job_index.load()
+        response_cache.enabled = False
+        client = app.test_client()
+        
+        def fetch(args, paging):
+            """Status, total and job ids of up to `pages` pages (one without paging)"""
+            query = dict(args, **paging)
+            status, total, ids = None, None, []
+            for _ in range(pages if paging else 1):
+                response = client.get(f'/api/jobs?{urlencode(query)}')
+                status, body = response.status_code, response.get_json()
+                if status != 200:
+                    break
+                total = body.get('total', total)
+                ids += [job['id'] for job in body['jobs']]
+                if not body.get('next_cursor'):
+                    break
+                query['cursor'] = body['next_cursor']
+            return status, total, ids
+        
+        checked, failed = 0, 0
+        for filters in job_index.sample_filters():
+            for sort in (None, 'posting_date_asc', 'relevance'):
+                args = dict(filters, sort=sort) if sort else filters
+                for paging in ({}, {'limit': 20, 'include_count': 'true'}):
+                    indexed = fetch(args, paging)
+                    with job_index.bypassed():
+                        expected = fetch(args, paging)
+                    
+                    # bm25 statistics include tombstones in SQLite, so ranked pages may differ
+                    # in order, only the full result set is compared
+                    if relevance_sort(args):
+                        if paging:
+                            continue
+                        indexed = (indexed[0], indexed[1], sorted(indexed[2]))
+                        expected = (expected[0], expected[1], sorted(expected[2]))
+                    
+                    checked += 1
+                    if indexed != expected:
+                        failed += 1
+                        print(f"MISMATCH {urlencode(dict(args, **paging))}: index {indexed[:2]} {len(indexed[2])} jobs, "
+                              f"sql {expected[:2]} {len(expected[2])} jobs")
+        
+        print(f"Job index check: {checked} requests compared, {failed} differ")
+        if failed:
+            raise SystemExit(1)
+    
+    @app.cli.command('rebuild-facets')
+    def rebuild_facets():
+        """Recompute the job_facet_counts summary table from the jobs table"""
+        refresh_facets()
+
+
+def refresh_facets():
+    from facets import rebuild_facet_counts
+    
+    rows = rebuild_facet_counts()
+    db.session.commit()
+    print(f"Facet counts rebuilt: {rows} values")
@@ -4,6 +4,20 @@ from urllib.parse import quote_plus
 
 load_dotenv()
 
+
+def engine_options(database_uri, pool_size, max_overflow, pool_recycle, pool_timeout=30):
+    """SQLALCHEMY_ENGINE_OPTIONS for a connection pool, SQLite only gets the pre-ping"""
+    if database_uri.startswith('sqlite'):
+        return {'pool_pre_ping': True}
+    return {
+        'pool_size': pool_size,  # Connections kept open per process
+        'max_overflow': max_overflow,  # Extra connections allowed under bursts
+        'pool_recycle': pool_recycle,  # Seconds, below MySQL's wait_timeout so idle connections are not cut
+        'pool_timeout': pool_timeout,  # Seconds to wait for a free connection
+        'pool_pre_ping': True,  # Test a connection before use, replaces ones dropped by the server
+    }
+
+
 class Config:
     # Get credentials
     db_user = os.getenv('DB_USER', 'root')
@@ -15,10 +29,70 @@ class Config:
     # URL-encode the password to handle special characters (since my password has special symbols)
     encoded_password = quote_plus(db_password)
     
-    # MySQL Database URI
-    SQLALCHEMY_DATABASE_URI = (
+    # MySQL Database URI, DATABASE_URL overrides it (e.g. sqlite:///jobs.db for local runs)
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL') or (
         f"mysql+pymysql://{db_user}:{encoded_password}"
         f"@{db_host}:{db_port}/{db_name}"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SQLALCHEMY_ECHO = True  # We set to False in production
\ No newline at end of file
+    
+    # Optional read replica used by GET requests, see replica.py
+    SQLALCHEMY_BINDS = {'replica': os.getenv('REPLICA_DATABASE_URL')} if os.getenv('REPLICA_DATABASE_URL') else {}
+    READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', '5'))
+    
+    # Frontend origins allowed to call the API with cookies, comma separated
+    CORS_ORIGINS = [origin.strip() for origin in os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',') if origin.strip()]
+    SQLALCHEMY_ECHO = os.getenv('SQLALCHEMY_ECHO', 'true').lower() == 'true'  # Always off in production
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, pool_size=5, max_overflow=5, pool_recycle=280)
+    
+    # Log requests slower than this many milliseconds with their SQL, off when unset
+    SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS')) if os.getenv('SLOW_REQUEST_MS') else None
+    
+    # Response cache for GET /api/jobs and GET /api/jobs/<id>
+    CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'true').lower() == 'true'
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '512'))
+    CACHE_TTL = int(os.getenv('CACHE_TTL', '30'))  # Seconds, bounds staleness of writes from other processes
+    
+    # In-memory index answering GET /api/jobs, see job_index.py
+    JOB_INDEX_ENABLED = os.getenv('JOB_INDEX', 'false').lower() == 'true'
+    JOB_INDEX_SYNC_SECONDS = float(os.getenv('JOB_INDEX_SYNC_SECONDS', '2'))  # Pull writes of other processes this often
+    
+    # Typeahead values served by GET /api/jobs/suggest, see suggest.py
+    SUGGEST_SYNC_SECONDS = float(os.getenv('SUGGEST_SYNC_SECONDS', '2'))
+    
+    # Near duplicate detection at ingest, see duplicates.py
+    DUPLICATE_DETECTION = os.getenv('DUPLICATE_DETECTION', 'true').lower() == 'true'
+    DUPLICATE_THRESHOLD = float(os.getenv('DUPLICATE_THRESHOLD', '0.7'))  # Estimated Jaccard similarity of the shingles
+    
+    # Jobs posted longer ago than this many days are moved to jobs_archive, see archive.py
+    ARCHIVE_RETENTION_DAYS = int(os.getenv('ARCHIVE_RETENTION_DAYS', '90'))
+    
+    # Request threads per worker process wsgi.py serves with, sizes the production pool
+    WEB_THREADS = int(os.getenv('WEB_THREADS', '8'))
+
+
+class ProductionConfig(Config):
+    """Selected with APP_ENV=production, pool sizes are per worker process"""
+    SQLALCHEMY_ECHO = False
+    # A request thread holds at most one connection, so the pool matches the thread count
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        Config.SQLALCHEMY_DATABASE_URI,
+        pool_size=int(os.getenv('DB_POOL_SIZE', str(Config.WEB_THREADS))),
+        max_overflow=int(os.getenv('DB_MAX_OVERFLOW', '2')),  # Headroom beyond one connection per request thread
+        pool_recycle=int(os.getenv('DB_POOL_RECYCLE', '280')),
+        pool_timeout=int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    )
+
+
+CONFIGS = {
+    'development': Config,
+    'production': ProductionConfig,
+}
+
+
+def get_config(name=None):
+    """Config class for a profile name, defaults to the APP_ENV environment variable"""
+    name = name or os.getenv('APP_ENV', 'development')
+    if name not in CONFIGS:
+        raise ValueError(f"Unknown APP_ENV '{name}', expected one of: {', '.join(CONFIGS)}")
+    return CONFIGS[name]
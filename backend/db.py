@@ -1,6 +1,22 @@
+import click
+from flask import g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 
-db = SQLAlchemy()
+# Bind key of the optional read replica, see replica.py
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """Session sending the statements of requests marked read-only to the replica engine"""
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context() and g.get('use_replica'):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 def init_db(app):
     """Initialize the database with the Flask app"""
@@ -9,7 +25,37 @@ def init_db(app):
     with app.app_context():
         
         from models.job import Job
+        from models.tag import Tag
+        from models.facet import FacetCount
+        from models.change import ChangeCounter
+        from models.duplicate import job_signatures, job_lsh_buckets
+        from models.archive import ArchivedJob
+        from migrations import run_migrations
         
         # Create all tables
         db.create_all()
-        print("Database tables created successfully!")
\ No newline at end of file
+        
+        # Columns and indexes added to tables that already exist, the rest needs them applied.
+        # CLI commands still get the app so that dedupe-jobs can repair what a migration needs
+        if not run_migrations():
+            if click.get_current_context(silent=True) is None:
+                raise RuntimeError("Database schema is not up to date, see the migration error above")
+            print("Database schema is not up to date, see the migration error above")
+            return
+        
+        # Full-text index used by the search filter
+        from search import init_search
+        init_search()
+        
+        # Seed the facet summary table once, writes keep it current from then on
+        if db.session.get(FacetCount, ('total', '')) is None:
+            from facets import rebuild_facet_counts
+            rebuild_facet_counts()
+            db.session.commit()
+        
+        # Change feed sequence, continues after the highest change_seq already stored
+        from changes import init_change_counters
+        init_change_counters()
+        db.session.commit()
+        print("Database tables created successfully!")
+
@@ -0,0 +1,254 @@
+"""
+Near-duplicate detection of job listings with MinHash and LSH
+
+The (title, company) unique index catches exact repeats. This catches the same posting with a
+reworded title, or reposted under another location. Each stored job is reduced to the
+character shingles of its title, company, location and tags, and to a MinHash signature of
+that set. The fraction of equal signature positions of two jobs estimates their Jaccard
+similarity. Signatures are cut into LSH bands whose hashes are stored as buckets, so a new job
+is only compared with the jobs sharing one of its buckets. That is one indexed lookup however
+big the table gets.
+
+A new job whose similarity with a live job reaches DUPLICATE_THRESHOLD is still stored, with
+duplicate_of set to the first listing of its group, and collapse_duplicates=true leaves it out
+of the lists. An edit to one of those fields compares the job again. The minimum of each hash
+over a job's shingles is taken with NumPy when it is installed, otherwise in plain Python with
+identical results.
+
+The band layout depends on the threshold. After changing it, recompute everything with
+flask --app app detect-duplicates --reset
+"""
+
+import hashlib
+import re
+import struct
+from functools import lru_cache
+from flask import current_app
+from sqlalchemy import select, insert, update, delete, tuple_
+from db import db
+from models.job import Job
+from models.duplicate import job_signatures, job_lsh_buckets
+from changes import next_change_seqs
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUM_HASHES = 64
+SHINGLE_SIZE = 4
+DEFAULT_THRESHOLD = 0.7
+
+# Times each field's shingles count towards the similarity
+SHINGLE_WEIGHTS = {'title': 2, 'company': 2, 'location': 1, 'tags': 1}
+
+# Job values a signature is computed from, register_jobs() takes dicts of them
+SIGNATURE_FIELDS = ('id', 'title', 'company', 'location', 'tags')
+
+# Bucket keys per lookup query and candidate rows read per query
+LOOKUP_BATCH_SIZE = 500
+MAX_CANDIDATES = 5000
+
+NON_WORD_RE = re.compile(r'[\W_]+')
+SIGNATURE = struct.Struct(f'<{NUM_HASHES}I')
+
+
+def shingles(job):
+    """
+    Character shingles of a job's normalized title, company, location and tags
+
+    Each field is shingled on its own and its shingles tagged with the field name. Title and
+    company ones count twice, so another location weighs less than another title or company.
+    """
+    values = set()
+    for name, copies in SHINGLE_WEIGHTS.items():
+        text = NON_WORD_RE.sub(' ', (job[name] or '').lower()).strip()
+        for copy in range(copies):
+            prefix = f'{name}{copy}:'
+            if len(text) <= SHINGLE_SIZE:
+                values.add(prefix + text)
+            else:
+                values.update(prefix + text[start:start + SHINGLE_SIZE] for start in range(len(text) - SHINGLE_SIZE + 1))
+    return values
+
+
+def minhash(values):
+    """MinHash signature of a set of strings, a tuple of NUM_HASHES 32 bit ints"""
+    # One SHAKE-128 output per value holds its NUM_HASHES independent 32 bit hashes
+    digests = [hashlib.shake_128(value.encode('utf-8')).digest(SIGNATURE.size) for value in values]
+    if np is not None:
+        return tuple(np.frombuffer(b''.join(digests), dtype='<u4').reshape(-1, NUM_HASHES).min(axis=0).tolist())
+    return tuple(map(min, zip(*map(SIGNATURE.unpack, digests))))
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of the sets behind two signatures"""
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_HASHES
+
+
+@lru_cache(maxsize=None)
+def lsh_params(threshold, num_hashes=NUM_HASHES):
+    """
+    (bands, rows per band) for a similarity threshold
+
+    Picks the layout whose chance of making two jobs candidates best approximates a step at the
+    threshold, weighing missed duplicates and needless comparisons equally.
+    """
+    def integral(function, start, stop, steps=100):
+        width = (stop - start) / steps
+        return sum(function(start + (step + 0.5) * width) for step in range(steps)) * width
+
+    best, best_error = (1, num_hashes), None
+    for bands in range(1, num_hashes + 1):
+        for rows in range(1, num_hashes // bands + 1):
+            false_positives = integral(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+            false_negatives = integral(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+            if best_error is None or false_positives + false_negatives < best_error:
+                best, best_error = (bands, rows), false_positives + false_negatives
+    return best
+
+
+def band_buckets(signature, bands, rows):
+    """(bucket, band) keys of a signature, the bucket is a 63 bit hash of the band's values"""
+    keys = []
+    for band in range(bands):
+        values = struct.pack(f'<{rows}I', *signature[band * rows:(band + 1) * rows])
+        digest = hashlib.blake2b(values, digest_size=8).digest()
+        keys.append((int.from_bytes(digest, 'little') >> 1, band))
+    return keys
+
+
+def duplicate_threshold():
+    return current_app.config.get('DUPLICATE_THRESHOLD', DEFAULT_THRESHOLD)
+
+
+def candidate_jobs(keys):
+    """Jobs stored under any of the (bucket, band) keys, returns (ids per key, (signature, group) per live id)"""
+    ids_by_key = {}
+    for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        chunk = keys[start:start + LOOKUP_BATCH_SIZE]
+        found = db.session.execute(
+            select(job_lsh_buckets.c.bucket, job_lsh_buckets.c.band, job_lsh_buckets.c.job_id)
+            .where(
+                # Same index trick as bulk.key_filter, the plain IN list lets SQLite seek the bucket
+                job_lsh_buckets.c.bucket.in_({bucket for bucket, _ in chunk}),
+                tuple_(job_lsh_buckets.c.bucket, job_lsh_buckets.c.band).in_(chunk)
+            )
+            .limit(MAX_CANDIDATES)
+        )
+        for row in found:
+            ids_by_key.setdefault((row.bucket, row.band), []).append(row.job_id)
+
+    # Read once per job, a similar job usually shares several buckets. Tombstones keep their
+    # buckets until they are purged and are left out here
+    ids = list({job_id for job_ids in ids_by_key.values() for job_id in job_ids})
+    known = {}
+    for start in range(0, len(ids), LOOKUP_BATCH_SIZE):
+        found = db.session.execute(
+            select(Job.id, Job.duplicate_of, job_signatures.c.signature)
+            .join(job_signatures, job_signatures.c.job_id == Job.id)
+            .where(Job.id.in_(ids[start:start + LOOKUP_BATCH_SIZE]), Job.deleted_at.is_(None))
+        )
+        for row in found:
+            known[row.id] = (SIGNATURE.unpack(row.signature), row.duplicate_of or row.id)
+    return ids_by_key, known
+
+
+def register_jobs(jobs):
+    """
+    Store the signatures and LSH buckets of newly stored jobs and mark their near duplicates
+
+    jobs are dicts holding SIGNATURE_FIELDS. Each job is compared with the live jobs sharing one
+    of its buckets, and with the jobs before it in id order, so the oldest listing of a group
+    stays unmarked. Registering a job again replaces its signature, as when a tombstone is
+    revived. Returns the number of jobs marked as duplicates, does not commit.
+    """
+    if not jobs or not current_app.config.get('DUPLICATE_DETECTION', True):
+        return 0
+    threshold = duplicate_threshold()
+    bands, rows = lsh_params(threshold)
+
+    jobs = sorted(jobs, key=lambda job: job['id'])
+    ids = [job['id'] for job in jobs]
+    signatures = {job['id']: minhash(shingles(job)) for job in jobs}
+    buckets = {job_id: band_buckets(signature, bands, rows) for job_id, signature in signatures.items()}
+    forget_jobs(ids)
+
+    ids_by_key, known = candidate_jobs(list({key for keys in buckets.values() for key in keys}))
+    groups = {}
+    for job_id in ids:
+        others = {other for key in buckets[job_id] for other in ids_by_key.get(key, ())}
+        # Most similar job first, the older group on a tie
+        best = max(
+            ((similarity(signatures[job_id], known[other][0]), -known[other][1]) for other in others if other in known),
+            default=None
+        )
+        groups[job_id] = -best[1] if best is not None and best[0] >= threshold else None
+
+        # Later jobs of the same batch are compared with this one too
+        known[job_id] = (signatures[job_id], groups[job_id] or job_id)
+        for key in buckets[job_id]:
+            ids_by_key.setdefault(key, []).append(job_id)
+
+    db.session.execute(insert(job_signatures), [
+        {'job_id': job_id, 'signature': SIGNATURE.pack(*signatures[job_id])} for job_id in ids
+    ])
+    db.session.execute(insert(job_lsh_buckets), [
+        {'bucket': bucket, 'band': band, 'job_id': job_id} for job_id in ids for bucket, band in buckets[job_id]
+    ])
+
+    current = dict(db.session.execute(select(Job.id, Job.duplicate_of).where(Job.id.in_(ids))).all())
+    changed = [job_id for job_id in ids if current.get(job_id) != groups[job_id]]
+    if changed:
+        db.session.execute(update(Job), [
+            {'id': job_id, 'duplicate_of': groups[job_id], 'change_seq': seq}
+            for job_id, seq in zip(changed, next_change_seqs(len(changed)))
+        ])
+    return sum(1 for group in groups.values() if group is not None)
+
+
+def reregister_jobs(jobs):
+    """
+    Compare stored jobs again after their title, company, location or tags changed
+
+    The near duplicates they head are regrouped first, as if they were deleted, since they may
+    not resemble them anymore. Then each job is registered again like a new one. jobs are dicts
+    holding SIGNATURE_FIELDS. Returns the number of jobs changed by the regrouping, does not commit.
+    """
+    if not jobs or not current_app.config.get('DUPLICATE_DETECTION', True):
+        return 0
+    released = release_duplicates([job['id'] for job in jobs])
+    register_jobs(jobs)
+    return released
+
+
+def forget_jobs(ids):
+    """Remove the stored signatures and buckets of jobs, does not commit"""
+    db.session.execute(delete(job_lsh_buckets).where(job_lsh_buckets.c.job_id.in_(ids)))
+    db.session.execute(delete(job_signatures).where(job_signatures.c.job_id.in_(ids)))
+
+
+def release_duplicates(ids):
+    """
+    Regroup the live duplicates of jobs that were just deleted, does not commit
+
+    The oldest duplicate of each deleted job becomes the first listing of the group and the
+    others point at it. Returns the number of jobs changed.
+    """
+    found = db.session.execute(
+        select(Job.id, Job.duplicate_of)
+        .where(Job.duplicate_of.in_(ids), Job.deleted_at.is_(None))
+        .order_by(Job.id)
+    ).all()
+    if not found:
+        return 0
+
+    leaders = {}
+    changes = []
+    for row in found:
+        leader = leaders.setdefault(row.duplicate_of, row.id)
+        changes.append({'id': row.id, 'duplicate_of': None if leader == row.id else leader})
+    db.session.execute(update(Job), [
+        dict(change, change_seq=seq) for change, seq in zip(changes, next_change_seqs(len(changes)))
+    ])
+    return len(changes)
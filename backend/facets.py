@@ -0,0 +1,165 @@
+"""
+Facet counts (jobs per job_type, location and tag) for the filter UI
+
+Unfiltered counts are read from the job_facet_counts summary table, which every write path
+updates with +1/-1 deltas in the same transaction as the write. Filtered counts are computed
+with GROUP BY over the matching jobs.
+"""
+
+from collections import Counter
+from sqlalchemy import select, func, update, insert, delete
+from db import db
+from models.job import Job
+from models.tag import Tag, job_tags, parse_tags
+from models.facet import FacetCount
+
+FACETS = ('job_type', 'location', 'tag')
+TOTAL_KEY = ('total', '')
+
+
+def facet_keys(job_type, location, tags):
+    """(facet, value) keys a job counts towards, tags are keyed by slug"""
+    keys = [TOTAL_KEY]
+    if job_type:
+        keys.append(('job_type', job_type))
+    if location:
+        keys.append(('location', location))
+    keys.extend(('tag', Tag.slugify(name)) for name in parse_tags(tags))
+    return keys
+
+
+def job_facet_keys(job):
+    """facet_keys of a Job object or a dict/row with job_type, location and tags"""
+    if isinstance(job, dict):
+        return facet_keys(job.get('job_type'), job.get('location'), job.get('tags'))
+    return facet_keys(job.job_type, job.location, job.tags)
+
+
+def facet_deltas(old_keys=(), new_keys=()):
+    deltas = Counter(new_keys)
+    deltas.subtract(Counter(old_keys))
+    return deltas
+
+
+def adjust_facet_counts(deltas):
+    """Apply count deltas to the summary table inside the current transaction"""
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    table = FacetCount.__table__
+    rows = [{'facet': facet, 'value': value[:255], 'count': delta} for (facet, value), delta in deltas.items()]
+    dialect = db.engine.dialect.name
+
+    if dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+        statement = mysql_insert(table).values(rows)
+        db.session.execute(statement.on_duplicate_key_update(count=table.c.count + statement.inserted['count']))
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        statement = sqlite_insert(table).values(rows)
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=['facet', 'value'],
+            set_={'count': table.c.count + statement.excluded['count']}
+        ))
+    else:
+        for row in rows:
+            result = db.session.execute(
+                update(table)
+                .where(table.c.facet == row['facet'], table.c.value == row['value'])
+                .values(count=table.c.count + row['count'])
+            )
+            if result.rowcount == 0:
+                db.session.execute(insert(table).values(row))
+
+    # Values nobody uses anymore drop out of the facet lists
+    db.session.execute(delete(table).where(table.c.count <= 0, table.c.facet != TOTAL_KEY[0]))
+
+
+def rebuild_facet_counts():
+    """Recompute the summary table from the live rows of the jobs table (one full scan), does not commit"""
+    table = FacetCount.__table__
+    db.session.execute(delete(table))
+
+    # Deleted jobs keep no job_tags rows, only the jobs columns need the tombstones filtered out
+    live = Job.deleted_at.is_(None)
+    rows = [{'facet': TOTAL_KEY[0], 'value': TOTAL_KEY[1], 'count': db.session.query(func.count(Job.id)).filter(live).scalar()}]
+    for facet, column in (('job_type', Job.job_type), ('location', Job.location)):
+        rows.extend(
+            {'facet': facet, 'value': value[:255], 'count': count}
+            for value, count in db.session.query(column, func.count(Job.id)).filter(live, column.isnot(None), column != '').group_by(column)
+        )
+    rows.extend(
+        {'facet': 'tag', 'value': slug, 'count': count}
+        for slug, count in db.session.execute(
+            select(Tag.slug, func.count(job_tags.c.job_id))
+            .join(job_tags, job_tags.c.tag_id == Tag.id)
+            .group_by(Tag.slug)
+        )
+    )
+
+    # Collapse values that only differ past the 255 character cut
+    merged = Counter()
+    for row in rows:
+        merged[(row['facet'], row['value'])] += row['count']
+    rows = [{'facet': facet, 'value': value, 'count': count} for (facet, value), count in merged.items()]
+
+    for start in range(0, len(rows), 500):
+        db.session.execute(insert(table), rows[start:start + 500])
+    return len(rows)
+
+
+def tag_names(slugs):
+    """Display names for tag slugs"""
+    if not slugs:
+        return {}
+    return dict(db.session.execute(select(Tag.slug, Tag.name).where(Tag.slug.in_(list(slugs)))).all())
+
+
+def format_facets(counts_by_facet, limit):
+    """Sort each facet by count (then value) and keep the top `limit` values"""
+    return {
+        facet: [
+            {'value': value, 'count': count}
+            for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        ]
+        for facet, counts in counts_by_facet.items()
+    }
+
+
+def unfiltered_facets(limit):
+    """Facets for the whole table straight from the summary table, never touches jobs"""
+    counts_by_facet = {facet: {} for facet in FACETS}
+    total = 0
+    for row in db.session.query(FacetCount.facet, FacetCount.value, FacetCount.count):
+        if (row.facet, row.value) == TOTAL_KEY:
+            total = row.count
+        elif row.facet in counts_by_facet:
+            counts_by_facet[row.facet][row.value] = row.count
+
+    names = tag_names(counts_by_facet['tag'])
+    counts_by_facet['tag'] = {names.get(slug, slug): count for slug, count in counts_by_facet['tag'].items()}
+    return total, format_facets(counts_by_facet, limit)
+
+
+def filtered_facets(query, limit):
+    """Facets over the jobs matched by a filtered Job query, one GROUP BY per facet"""
+    ids = query.with_entities(Job.id).order_by(None)
+    total = ids.count()
+
+    counts_by_facet = {}
+    for facet, column in (('job_type', Job.job_type), ('location', Job.location)):
+        counts_by_facet[facet] = {
+            value: count
+            for value, count in query.with_entities(column, func.count(Job.id)).order_by(None).group_by(column)
+            if value
+        }
+    counts_by_facet['tag'] = dict(db.session.execute(
+        select(Tag.name, func.count(job_tags.c.job_id))
+        .join(job_tags, job_tags.c.tag_id == Tag.id)
+        .where(job_tags.c.job_id.in_(ids.subquery().select()))
+        .group_by(Tag.id, Tag.name)
+    ).all())
+    return total, format_facets(counts_by_facet, limit)
@@ -0,0 +1,667 @@
+"""
+In-memory index engine for the job list
+
+Holds every live job in compact columnar lists, one slot per job, and answers GET /api/jobs
+without a database round-trip. Filters are evaluated on bitmaps (Python ints, one bit per slot).
+Each job_type, tag and distinct location value holds its slots, as a bitmap when at least one
+job in DENSE_RATIO has it and as a sorted array of slots otherwise, so rare values cost four
+bytes per job rather than a bit per slot. The near duplicates have one bitmap, and token posting
+lists over title, company and tags serve the search filter. Date sorts walk a sorted array of
+(posted_at, id) keys and relevance uses the bm25 formula of SQLite FTS5. Deleted jobs leave
+their slot behind until they make up COMPACT_RATIO of the slots, then the index is rebuilt from
+the live ones.
+
+Enabled with JOB_INDEX=true and loaded in create_app. Writes made by this process are applied
+as they happen, writes by other processes (the scraper, other workers) are pulled from the
+change feed (changes.py) at most every JOB_INDEX_SYNC_SECONDS.
+
+Search tokenizes like the FTS5 unicode61 tokenizer. On MySQL, FULLTEXT stopwords and terms
+shorter than innodb_ft_min_token_size match here but not in SQL. Ranks equal FTS5's as long as
+there are no tombstones, which FTS5 still counts. benchmarks/job_index_benchmark.py times both
+paths and `flask --app app check-job-index` compares their results.
+"""
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from array import array
+from contextlib import contextmanager
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+from models.tag import Tag, parse_tags
+from models.job import parse_posting_date
+from serializers import JOB_FIELDS
+from changes import ChangeFeedMirror, register_mirror
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+SEARCH_COLUMNS = ('title', 'company', 'tags')
+
+# Columns whose values repeat across jobs, each distinct value is stored once
+SHARED_COLUMNS = ('company', 'location', 'posting_date', 'job_type')
+
+# Sort keys pack (posted_at, id) into one int ordered like ORDER BY posted_at, id
+ID_BITS = 40
+ID_MASK = (1 << ID_BITS) - 1
+NO_DATE_LIMIT = 1 << ID_BITS
+MICROSECOND = timedelta(microseconds=1)
+
+# bm25 parameters used by FTS5
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Prefix and location pattern bitmaps kept between queries
+MAX_CACHED_MATCHES = 256
+
+# A value is stored as a bitmap once more than one slot in DENSE_RATIO has it, the size of a
+# sorted array of its slots. It goes back to an array below half that
+DENSE_RATIO = 32
+
+# Share of slots left by deleted jobs that triggers a rebuild from the live ones, and the
+# least number of such slots worth it
+COMPACT_RATIO = 0.25
+COMPACT_MIN_SLOTS = 1024
+
+NONZERO_BYTE = re.compile(b'[^\x00]')
+BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+
+
+def tokenize(text):
+    """Lowercase letter/digit runs with diacritics removed, like the FTS5 unicode61 tokenizer"""
+    if not text:
+        return []
+    text = text.lower()
+    if not text.isascii():
+        text = ''.join(char for char in unicodedata.normalize('NFD', text) if not unicodedata.combining(char))
+    return TOKEN_RE.findall(text)
+
+
+def sort_key(posted_at, job_id):
+    """posted_at and id packed into one int, NULL dates sort first like in SQL"""
+    if posted_at is None:
+        return job_id
+    return ((posted_at - datetime.min) // MICROSECOND + 1) << ID_BITS | job_id
+
+
+def like_regex(pattern):
+    """Regex matching the values ILIKE '%pattern%' matches, % and _ are SQL wildcards"""
+    parts = ['.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in pattern]
+    return re.compile(''.join(parts), re.IGNORECASE | re.DOTALL)
+
+
+def bitmap(slots, size):
+    """Bitmap with the bits of the given slots set"""
+    data = bytearray((size >> 3) + 1)
+    for slot in slots:
+        data[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(data, 'little')
+
+
+def bitmap_slots(bits):
+    """Slots set in a bitmap, ascending, zero bytes are skipped by the regex engine"""
+    data = bits.to_bytes((bits.bit_length() + 7) >> 3, 'little')
+    return [
+        (match.start() << 3) + bit
+        for match in NONZERO_BYTE.finditer(data)
+        for bit in BYTE_BITS[data[match.start()]]
+    ]
+
+
+def value_slots(slots, size):
+    """Stored form of the ascending slots of one value, a bitmap or a sorted array"""
+    if len(slots) * DENSE_RATIO > size:
+        return bitmap(slots, size)
+    return array('I', slots)
+
+
+def value_count(slots):
+    """Jobs having a value, from its stored form"""
+    return slots.bit_count() if isinstance(slots, int) else len(slots)
+
+
+def date_arg(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    posted_at = parse_posting_date(value)
+    if posted_at is None:
+        raise ValueError(f'{name} must be a date')
+    return posted_at
+
+
+def relevance_sort(args):
+    """Whether a list request is sorted by search relevance, the default when searching"""
+    return bool(args.get('search')) and args.get('sort') in (None, '', 'relevance')
+
+
+# A slot's stored columns, what a compaction rebuilds the index from
+SlotJob = namedtuple('SlotJob', JOB_FIELDS + ['duplicate_of', 'change_seq'])
+
+
+class JobIndex(ChangeFeedMirror):
+    name = 'Job index'
+    fields = SlotJob._fields[:-1]
+
+    def __init__(self, enabled=False, sync_seconds=2.0):
+        super().__init__(sync_seconds)
+        self.enabled = enabled
+        self._local = threading.local()
+        self._reset()
+
+    def init_app(self, app):
+        """Read the index settings and load it when enabled"""
+        self.enabled = app.config.get('JOB_INDEX_ENABLED', self.enabled)
+        self.sync_seconds = app.config.get('JOB_INDEX_SYNC_SECONDS', self.sync_seconds)
+        self._reset()
+        if not self.enabled:
+            return
+        with app.app_context():
+            try:
+                self.load()
+            except Exception as e:
+                # Requests keep being answered from SQL
+                print(f"Job index not loaded: {str(e)}")
+
+    def _reset(self):
+        self.ready = False
+        self.slots = {}  # Job id -> slot
+        self.columns = {name: [] for name in self.fields}
+        self.change_seqs = array('q')
+        self.sort_keys = []
+        self.lengths = array('I')  # Search tokens per slot, the bm25 document length
+        self.live = 0
+        self.live_count = 0
+        self.total_tokens = 0
+        self.job_types = {}  # Value -> slots, see value_slots()
+        self.locations = {}
+        self.tags = {}  # Tag slug -> slots
+        self.duplicates = 0  # Jobs with duplicate_of set, left out by collapse_duplicates
+        self.postings = {}  # Token -> array of slots, a slot repeats once per occurrence
+        self.vocabulary = []  # Sorted tokens, prefix terms bisect into it
+        self.order = []  # Sort keys of the live jobs, ascending
+        self.deleted_seqs = {}  # Job id -> change_seq of deleted jobs whose slot was compacted away
+        self._shared = {}
+        self._matches = {}  # Cached prefix/location bitmaps and search rankings
+
+    # Loading and updates
+
+    def apply(self, job):
+        """
+        Bring one job up to date from a Job object or a change feed row
+
+        A version older than the indexed one is ignored, so a lagging replica read by sync()
+        cannot undo a write this process already applied.
+        """
+        if not self.ready:
+            return
+        with self._lock:
+            slot = self.slots.get(job.id)
+            seq = job.change_seq or 0
+            if slot is not None:
+                if self.change_seqs[slot] > seq:
+                    return
+                self.change_seqs[slot] = seq
+                if self.live >> slot & 1:
+                    self._unindex(slot)
+            elif self.deleted_seqs.get(job.id, -1) > seq:
+                return
+            if job.deleted_at is not None:
+                self._compact_if_sparse()
+                return
+
+            if slot is None:
+                self.deleted_seqs.pop(job.id, None)
+                slot = len(self.change_seqs)
+                self.slots[job.id] = slot
+                self.change_seqs.append(seq)
+                self.sort_keys.append(0)
+                self.lengths.append(0)
+                for values in self.columns.values():
+                    values.append(None)
+            self._store(slot, job)
+            self._index(slot)
+
+    def _store(self, slot, job):
+        for name, values in self.columns.items():
+            value = getattr(job, name)
+            if name in SHARED_COLUMNS and value is not None:
+                value = self._shared.setdefault(value, value)
+            values[slot] = value
+        self.sort_keys[slot] = sort_key(job.posted_at, job.id)
+
+    def _tokens(self, slot):
+        return [token for name in SEARCH_COLUMNS for token in tokenize(self.columns[name][slot])]
+
+    def _tag_slugs(self, slot):
+        return {Tag.slugify(name) for name in parse_tags(self.columns['tags'][slot])}
+
+    def _rebuild(self, jobs):
+        """Replace the index with the given job rows in one pass, bitmaps are built once at the end"""
+        self._reset()
+        size = len(jobs)
+        self.columns = {name: [None] * size for name in self.fields}
+        self.sort_keys = [0] * size
+        self.change_seqs = array('q', [0]) * size
+        self.lengths = array('I', [0]) * size
+
+        job_type_slots, location_slots, tag_slots, duplicate_slots = {}, {}, {}, []
+        for slot, job in enumerate(jobs):
+            self.slots[job.id] = slot
+            self.change_seqs[slot] = job.change_seq or 0
+            self._store(slot, job)
+            job_type_slots.setdefault(self.columns['job_type'][slot], []).append(slot)
+            location_slots.setdefault(self.columns['location'][slot], []).append(slot)
+            for slug in self._tag_slugs(slot):
+                tag_slots.setdefault(slug, []).append(slot)
+            if job.duplicate_of is not None:
+                duplicate_slots.append(slot)
+
+            tokens = self._tokens(slot)
+            self.lengths[slot] = len(tokens)
+            self.total_tokens += len(tokens)
+            for token in tokens:
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = array('I')
+                posting.append(slot)
+
+        self.live = (1 << size) - 1
+        self.live_count = size
+        self.job_types = {value: value_slots(slots, size) for value, slots in job_type_slots.items()}
+        self.locations = {value: value_slots(slots, size) for value, slots in location_slots.items()}
+        self.tags = {slug: value_slots(slots, size) for slug, slots in tag_slots.items()}
+        self.duplicates = bitmap(duplicate_slots, size)
+        self.vocabulary = sorted(self.postings)
+        self.order = sorted(self.sort_keys)
+
+    def _compact_if_sparse(self):
+        """Rebuild from the live slots once deleted jobs hold COMPACT_RATIO of them"""
+        size = len(self.change_seqs)
+        dead = size - self.live_count
+        if dead < COMPACT_MIN_SLOTS or dead < size * COMPACT_RATIO:
+            return
+
+        live_slots = bitmap_slots(self.live)
+        live_ids = {self.columns['id'][slot] for slot in live_slots}
+        # The feed only sends changes after self.seq, versions up to it cannot come back
+        deleted = {job_id: seq for job_id, seq in self.deleted_seqs.items() if seq > self.seq}
+        deleted.update(
+            (job_id, self.change_seqs[slot]) for job_id, slot in self.slots.items()
+            if job_id not in live_ids and self.change_seqs[slot] > self.seq
+        )
+
+        jobs = [
+            SlotJob(*[self.columns[name][slot] for name in self.fields], self.change_seqs[slot])
+            for slot in sorted(live_slots, key=self.columns['id'].__getitem__)
+        ]
+        self._rebuild(jobs)
+        self.deleted_seqs = deleted
+        self.ready = True
+
+    def _add_slot(self, values, value, slot):
+        slots = values.get(value)
+        if isinstance(slots, int):
+            values[value] = slots | 1 << slot
+            return
+        if slots is None:
+            slots = values[value] = array('I')
+        insort(slots, slot)
+        if len(slots) * DENSE_RATIO > len(self.change_seqs):
+            values[value] = bitmap(slots, len(self.change_seqs))
+
+    def _remove_slot(self, values, value, slot):
+        slots = values[value]
+        if isinstance(slots, int):
+            slots &= ~(1 << slot)
+            if slots.bit_count() * DENSE_RATIO * 2 < len(self.change_seqs):
+                slots = array('I', bitmap_slots(slots))
+        else:
+            del slots[bisect_left(slots, slot)]
+        if slots:
+            values[value] = slots
+        else:
+            del values[value]
+
+    def _bits(self, slots):
+        """Bitmap of a value's stored slots"""
+        return slots if isinstance(slots, int) else bitmap(slots, len(self.change_seqs))
+
+    def _index(self, slot):
+        bit = 1 << slot
+        self.live |= bit
+        self.live_count += 1
+        self._add_slot(self.job_types, self.columns['job_type'][slot], slot)
+        self._add_slot(self.locations, self.columns['location'][slot], slot)
+        for slug in self._tag_slugs(slot):
+            self._add_slot(self.tags, slug, slot)
+        if self.columns['duplicate_of'][slot] is not None:
+            self.duplicates |= bit
+
+        tokens = self._tokens(slot)
+        self.lengths[slot] = len(tokens)
+        self.total_tokens += len(tokens)
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = array('I')
+                insort(self.vocabulary, token)
+            posting.append(slot)
+
+        insort(self.order, self.sort_keys[slot])
+        self._forget_matches(slot, tokens)
+
+    def _unindex(self, slot):
+        bit = 1 << slot
+        self.live &= ~bit
+        self.live_count -= 1
+        self._remove_slot(self.job_types, self.columns['job_type'][slot], slot)
+        self._remove_slot(self.locations, self.columns['location'][slot], slot)
+        for slug in self._tag_slugs(slot):
+            self._remove_slot(self.tags, slug, slot)
+        self.duplicates &= ~bit
+
+        tokens = self._tokens(slot)
+        self.total_tokens -= len(tokens)
+        for token in tokens:
+            posting = self.postings[token]
+            posting.remove(slot)
+            if not posting:
+                del self.postings[token]
+                del self.vocabulary[bisect_left(self.vocabulary, token)]
+
+        del self.order[bisect_left(self.order, self.sort_keys[slot])]
+        self._forget_matches(slot, tokens)
+
+    def _forget_matches(self, slot, tokens):
+        """Drop the cached matches a changed job falls under, rankings change with every write"""
+        location = self.columns['location'][slot] or ''
+        stale = [
+            key for key in self._matches
+            if key[0] == 'ranked'
+            or (key[0] == 'prefix' and any(token.startswith(key[1]) for token in tokens))
+            or (key[0] == 'location' and like_regex(key[1]).search(location))
+        ]
+        for key in stale:
+            del self._matches[key]
+
+    # Queries
+
+    def can_answer(self, args):
+        """Whether list_jobs handles the request, syncs first when the last sync is too old"""
+        if not self.ready or getattr(self._local, 'bypassed', False):
+            return False
+        if args.get('include_archived', '').lower() in ('1', 'true', 'yes'):
+            # The archive is only in SQL
+            return False
+        search = args.get('search')
+        if search:
+            from search import search_backend, search_terms
+
+            # Searches SQL answers with the ilike fallback stay in SQL, as do terms like a_b that
+            # FTS5 matches as a phrase of several tokens
+            terms = search_terms(search)
+            if search_backend() == 'like' or not terms or any(len(tokenize(term)) != 1 for term in terms):
+                return False
+        self.sync_if_stale()
+        return True
+
+    @contextmanager
+    def bypassed(self):
+        """Answer from SQL inside the block (this thread only), used to compare both paths"""
+        self._local.bypassed = True
+        try:
+            yield
+        finally:
+            self._local.bypassed = False
+
+    def list_jobs(self, args, names, limit=None, cursor=None, include_count=False):
+        """
+        Evaluate a GET /api/jobs request, returns (rows, has_more, total)
+
+        Rows are tuples of the `names` columns followed by the sort value, posted_at or the
+        search rank. limit None returns every match, cursor is a decoded (sort value, id) keyset
+        position and total is only counted with include_count. Raises ValueError for bad dates.
+        """
+        with self._lock:
+            bits, terms = self._match(args)
+
+            # Date window as a sort key range, a NULL posted_at never matches a date filter
+            low, high = 0, math.inf
+            posted_after, posted_before = date_arg(args, 'posted_after'), date_arg(args, 'posted_before')
+            if posted_after or posted_before:
+                low = NO_DATE_LIMIT
+            if posted_after:
+                low = sort_key(posted_after, 0)
+            if posted_before:
+                high = sort_key(posted_before, 0)
+
+            if terms and relevance_sort(args):
+                slots, ranks, total = self._ranked(bits, terms, low, high, limit, cursor)
+                sort_values = ranks
+            else:
+                slots, total = self._sorted(bits, low, high, limit, cursor, args.get('sort') == 'posting_date_asc')
+                sort_values = self.columns['posted_at']
+                if include_count and total is None:
+                    total = self._count(bits, low, high)
+
+            has_more = limit is not None and len(slots) > limit
+            if has_more:
+                slots = slots[:limit]
+            columns = [self.columns[name] for name in names]
+            rows = [tuple(values[slot] for values in columns) + (sort_values[slot],) for slot in slots]
+            return rows, has_more, total if include_count else None
+
+    def _match(self, args):
+        """Bitmap of the jobs passing the job_type/location/tag/collapse/search filters and the search terms"""
+        bits = self.live
+
+        job_type = args.get('job_type')
+        if job_type:
+            bits &= self._bits(self.job_types.get(job_type, 0))
+
+        location = args.get('location')
+        if location:
+            bits &= self._location_bits(location)
+
+        tags = parse_tags([name for value in args.getlist('tag') for name in value.split(',')])
+        if tags:
+            tag_bits = [self._bits(self.tags.get(Tag.slugify(tag), 0)) for tag in tags]
+            if args.get('tag_mode', 'all') == 'any':
+                matched = 0
+                for value in tag_bits:
+                    matched |= value
+                bits &= matched
+            else:
+                for value in tag_bits:
+                    bits &= value
+
+        if args.get('collapse_duplicates', '').lower() in ('1', 'true', 'yes'):
+            bits &= ~self.duplicates
+
+        terms = tokenize(args.get('search'))
+        for term in terms:
+            bits &= self._prefix(term)[0]
+        return bits, terms
+
+    def _location_bits(self, location):
+        key = ('location', location)
+        if key not in self._matches:
+            pattern = like_regex(location)
+            matched, sparse = 0, []
+            for value, slots in self.locations.items():
+                if value and pattern.search(value):
+                    if isinstance(slots, int):
+                        matched |= slots
+                    else:
+                        sparse.extend(slots)
+            self._cache(key, (matched | bitmap(sparse, len(self.change_seqs)), None))
+        return self._matches[key][0]
+
+    def _prefix(self, prefix):
+        """(bitmap, frequency per slot) of the jobs with a token starting with prefix, like "term"* in FTS5"""
+        key = ('prefix', prefix)
+        if key not in self._matches:
+            frequencies = Counter()
+            position = bisect_left(self.vocabulary, prefix)
+            while position < len(self.vocabulary) and self.vocabulary[position].startswith(prefix):
+                frequencies.update(self.postings[self.vocabulary[position]])
+                position += 1
+            self._cache(key, (bitmap(frequencies, len(self.change_seqs)), frequencies))
+        return self._matches[key]
+
+    def _cache(self, key, value):
+        if len(self._matches) >= MAX_CACHED_MATCHES:
+            self._matches.clear()
+        self._matches[key] = value
+
+    def _sorted(self, bits, low, high, limit, cursor, ascending):
+        """Matching slots in posted_at, id order within [low, high) and past the cursor"""
+        if cursor is not None:
+            cursor_key = sort_key(*cursor)
+            if ascending:
+                low = max(low, cursor_key + 1)
+            else:
+                high = min(high, cursor_key)
+
+        start = bisect_left(self.order, low)
+        stop = bisect_left(self.order, high) if high != math.inf else len(self.order)
+        matches = bits.bit_count()
+        if not matches or start >= stop:
+            return [], 0
+
+        # Walking the sorted keys costs about limit / selectivity steps, sorting the matches
+        # costs one step per match, pick the cheaper one
+        wanted = stop - start if limit is None else limit + 1
+        walk_steps = min(stop - start, wanted * self.live_count // matches)
+        if walk_steps <= matches * 2:
+            data = bits.to_bytes((len(self.change_seqs) >> 3) + 1, 'little')
+            positions = range(start, stop) if ascending else range(stop - 1, start - 1, -1)
+            slots, order, slot_of = [], self.order, self.slots
+            for position in positions:
+                slot = slot_of[order[position] & ID_MASK]
+                if data[slot >> 3] >> (slot & 7) & 1:
+                    slots.append(slot)
+                    if len(slots) == wanted:
+                        break
+            return slots, None
+
+        keys = self.sort_keys
+        candidates = [slot for slot in bitmap_slots(bits) if low <= keys[slot] < high]
+        if limit is None:
+            return sorted(candidates, key=keys.__getitem__, reverse=not ascending), None
+        pick = heapq.nsmallest if ascending else heapq.nlargest
+        return pick(wanted, candidates, key=keys.__getitem__), None
+
+    def _count(self, bits, low, high):
+        if low == 0 and high == math.inf:
+            return bits.bit_count()
+        if bits == self.live:
+            return bisect_left(self.order, high) - bisect_left(self.order, low)
+        keys = self.sort_keys
+        return sum(1 for slot in bitmap_slots(bits) if low <= keys[slot] < high)
+
+    def _ranked(self, bits, terms, low, high, limit, cursor):
+        """
+        Matching slots by bm25 rank then id (best first) with their ranks and the match count
+
+        The ranked list is cached per search until the next write, so following the cursor
+        through the results ranks them once.
+        """
+        key = ('ranked', tuple(terms), bits)
+        if key not in self._matches:
+            slots = bitmap_slots(bits)
+            ranks = self._ranks(slots, terms)
+            ids = self.columns['id']
+            self._cache(key, (sorted((ranks[slot], ids[slot], slot) for slot in slots), ranks))
+        positions, ranks = self._matches[key]
+
+        keys = self.sort_keys
+        windowed = low != 0 or high != math.inf
+        total = sum(1 for *_, slot in positions if low <= keys[slot] < high) if windowed else len(positions)
+
+        start = bisect_right(positions, (*cursor, math.inf)) if cursor is not None else 0
+        wanted = len(positions) if limit is None else limit + 1
+        slots = []
+        for position in range(start, len(positions)):
+            slot = positions[position][2]
+            if low <= keys[slot] < high:
+                slots.append(slot)
+                if len(slots) == wanted:
+                    break
+        return slots, ranks, total
+
+    def _ranks(self, slots, terms):
+        """FTS5 bm25() of the slots for the prefix terms, negative so that lower is better"""
+        rows = self.live_count
+        average_length = self.total_tokens / rows if rows else 1.0
+        weights = []
+        for term in terms:
+            term_bits, frequencies = self._prefix(term)
+            hits = (term_bits & self.live).bit_count()
+            idf = math.log((rows - hits + 0.5) / (hits + 0.5))
+            weights.append((idf if idf > 0.0 else 1e-6, frequencies))
+
+        ranks = {}
+        for slot in slots:
+            length = self.lengths[slot]
+            score = 0.0
+            for idf, frequencies in weights:
+                frequency = float(frequencies[slot])
+                score += idf * (
+                    (frequency * (BM25_K1 + 1.0)) /
+                    (frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length))
+                )
+            ranks[slot] = -1.0 * score
+        return ranks
+
+    def sample_filters(self, count=5):
+        """Filter args built from the most common indexed values, for comparing with SQL"""
+        with self._lock:
+            def most_common(bitmaps):
+                ranked = sorted(bitmaps.items(), key=lambda item: (-value_count(item[1]), str(item[0])))
+                return [value for value, _ in ranked[:count] if value]
+
+            job_types = most_common(self.job_types)
+            tags = most_common(self.tags)
+            locations = [value.split(',')[0].lower() for value in most_common(self.locations)]
+            words = sorted(
+                (token for token in self.postings if len(token) > 3),
+                key=lambda token: (-len(self.postings[token]), token)
+            )[:count]
+
+        filters = [{}]
+        filters += [{'job_type': value} for value in job_types]
+        filters += [{'location': value} for value in locations]
+        filters += [{'tag': value} for value in tags]
+        filters += [{'search': word} for word in words]
+        filters += [{'search': word[:3]} for word in words[:2]]
+        if len(tags) > 1:
+            filters += [{'tag': ','.join(tags[:2])}, {'tag': ','.join(tags[:2]), 'tag_mode': 'any'}]
+        if words and job_types:
+            filters.append({'search': f'{words[0]} {words[-1]}', 'job_type': job_types[0]})
+        if locations and tags:
+            filters.append({'location': f'%{locations[0][1:]}', 'tag': tags[0]})
+        filters += [{'posted_after': '30 days ago'}, {'posted_after': '60 days ago', 'posted_before': '7 days ago'}]
+        filters.append({'collapse_duplicates': 'true'})
+        if tags:
+            filters.append({'tag': tags[0], 'collapse_duplicates': 'true'})
+        return filters
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'ready': self.ready,
+                'jobs': self.live_count,
+                'slots': len(self.change_seqs),
+                'dense_values': sum(
+                    isinstance(slots, int) for values in (self.job_types, self.locations, self.tags) for slots in values.values()
+                ),
+                'tokens': len(self.postings),
+                'change_seq': self.seq,
+            }
+
+
+job_index = register_mirror(JobIndex())
@@ -0,0 +1,198 @@
+"""
+Per-request timing and SQL instrumentation exposed in Prometheus text format at /metrics
+
+Flask request hooks time every request and SQLAlchemy engine events count the SQL statements
+it runs and the time spent in them. Samples are labelled by endpoint and by parameter shape,
+the sorted names of the query parameters used (e.g. "job_type,limit,sort"), never their values.
+Metrics are kept per process, with several workers each one reports its own.
+
+SLOW_REQUEST_MS turns on a log of requests slower than that, with the SQL they ran.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from flask import g, request, has_request_context, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from cache import response_cache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Parameter names reported in the shape label, anything else counts as "other" so clients
+# cannot create unbounded label values
+KNOWN_PARAMS = {
+    'job_type', 'location', 'tag', 'tag_mode', 'search', 'sort', 'limit', 'cursor', 'include_count',
+    'fields', 'posted_after', 'posted_before', 'format', 'gzip', 'since', 'field', 'prefix',
+    'collapse_duplicates', 'include_archived',
+}
+
+# Longest statement text kept in the slow request log
+MAX_LOGGED_STATEMENT = 500
+
+slow_log = logging.getLogger('slow_requests')
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.values = {}
+
+    def observe(self, labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self.values.items()):
+            lines.append(f'{self.name}{format_labels(self.label_names, labels)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.values = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels, value):
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for labels, series in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                le = bound if bound == '+Inf' else repr(float(bound))
+                lines.append(f'{self.name}_bucket{format_labels(self.label_names + ("le",), labels + (le,))} {cumulative}')
+            lines.append(f'{self.name}_sum{format_labels(self.label_names, labels)} {series[-1]}')
+            lines.append(f'{self.name}_count{format_labels(self.label_names, labels)} {cumulative}')
+        return lines
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names, values):
+    pairs = ','.join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class RequestMetrics:
+    """Registry of the request metrics, updated under one lock"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        labels = ('endpoint', 'method', 'params')
+        self.requests = Counter('http_requests_total', 'Requests handled', labels + ('status',))
+        self.latency = Histogram('http_request_duration_seconds', 'Request latency', labels, LATENCY_BUCKETS)
+        self.sql_queries = Histogram('http_request_sql_queries', 'SQL statements per request', labels, QUERY_COUNT_BUCKETS)
+        self.sql_time = Histogram('http_request_sql_duration_seconds', 'Time spent in SQL per request', labels, LATENCY_BUCKETS)
+
+    def record(self, labels, status, duration, sql_count, sql_time):
+        with self._lock:
+            self.requests.observe(labels + (str(status),))
+            self.latency.observe(labels, duration)
+            self.sql_queries.observe(labels, sql_count)
+            self.sql_time.observe(labels, sql_time)
+
+    def reset(self):
+        with self._lock:
+            for metric in (self.requests, self.latency, self.sql_queries, self.sql_time):
+                metric.values.clear()
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.latency, self.sql_queries, self.sql_time):
+                lines.extend(metric.render())
+
+        stats = response_cache.stats()
+        for name in ('hits', 'misses', 'evictions'):
+            lines.append(f'# TYPE response_cache_{name}_total counter')
+            lines.append(f'response_cache_{name}_total {stats[name]}')
+        lines.append('# TYPE response_cache_entries gauge')
+        lines.append(f"response_cache_entries {stats['entries']}")
+        return '\n'.join(lines) + '\n'
+
+
+request_metrics = RequestMetrics()
+
+
+def param_shape():
+    """Sorted names of the non-empty query parameters of the current request"""
+    names = {
+        name if name in KNOWN_PARAMS else 'other'
+        for name in request.args
+        if any(request.args.getlist(name))
+    }
+    return ','.join(sorted(names)) or 'none'
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'request_started' in g:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if not (has_request_context() and 'request_started' in g) or not conn.info.get('query_started'):
+        return
+    elapsed = time.perf_counter() - conn.info['query_started'].pop()
+    g.sql_count += 1
+    g.sql_time += elapsed
+    if g.sql_statements is not None:
+        g.sql_statements.append((elapsed, statement[:MAX_LOGGED_STATEMENT]))
+
+
+def init_metrics(app):
+    """Install the request hooks and the /metrics endpoint"""
+    slow_ms = app.config.get('SLOW_REQUEST_MS')
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        g.sql_count = 0
+        g.sql_time = 0.0
+        g.sql_statements = [] if slow_ms else None
+
+    @app.after_request
+    def record_request(response):
+        if 'request_started' not in g:
+            return response
+        state = g._get_current_object()
+        labels = (request.endpoint or 'unmatched', request.method, param_shape())
+        path = request.full_path.rstrip('?')
+
+        def finish():
+            duration = time.perf_counter() - state.request_started
+            request_metrics.record(labels, response.status_code, duration, state.sql_count, state.sql_time)
+            if slow_ms and duration * 1000 >= slow_ms:
+                slow_log.warning(
+                    'Slow request %s %s %d in %.1f ms, %d SQL statements in %.1f ms\n%s',
+                    labels[1], path, response.status_code, duration * 1000, state.sql_count, state.sql_time * 1000,
+                    '\n'.join(f'  {elapsed * 1000:8.2f} ms  {statement}' for elapsed, statement in state.sql_statements)
+                )
+
+        # Streamed bodies (exports) run their queries while being sent, finish once they are closed
+        if response.is_streamed:
+            response.call_on_close(finish)
+        else:
+            finish()
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,282 @@
+"""
+Versioned schema migrations
+
+db.create_all() only creates missing tables, so columns and indexes added to tables that
+already exist are applied here. Each migration runs once, in version order, and is recorded in
+the schema_migrations table. A migration must also be a no-op on a database where create_all()
+already built the current schema, which is what a fresh database looks like.
+"""
+
+from datetime import datetime
+from sqlalchemy import inspect, text, select, insert, update, func, bindparam
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.exc import IntegrityError
+from db import db
+
+schema_migrations = db.Table(
+    'schema_migrations',
+    db.Column('version', db.Integer, primary_key=True),
+    db.Column('name', db.String(100), nullable=False),
+    db.Column('applied_at', db.DateTime, nullable=False),
+)
+
+MIGRATIONS = []
+
+
+def migration(version, name):
+    """Register a function as schema migration `version`"""
+    def register(function):
+        MIGRATIONS.append((version, name, function))
+        MIGRATIONS.sort(key=lambda item: item[0])
+        return function
+    return register
+
+
+def add_column(table, name):
+    """Add a model column missing from an existing table, returns True when it was added"""
+    existing = {column['name'] for column in inspect(db.engine).get_columns(table.name)}
+    if name in existing:
+        return False
+    column = table.columns[name]
+    column_type = column.type.compile(dialect=db.engine.dialect)
+    with db.engine.begin() as connection:
+        connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+    return True
+
+
+def create_index(table, name):
+    """Create a model index if it does not exist yet"""
+    index = next(index for index in table.indexes if index.name == name)
+    index.create(db.engine, checkfirst=True)
+
+
+def rebuild_table(table, copied):
+    """
+    Recreate an existing table from its model definition, keeping its rows
+
+    For changes ALTER TABLE cannot make (SQLite). copied maps the new table's columns to SQL
+    expressions over the old one. Indexes are created again once the new table took its name.
+    """
+    temporary = f'{table.name}_rebuild'
+    create = str(CreateTable(table).compile(dialect=db.engine.dialect))
+    with db.engine.begin() as connection:
+        connection.execute(text(create.replace(f'CREATE TABLE {table.name} (', f'CREATE TABLE {temporary} (', 1)))
+        connection.execute(text(
+            f'INSERT INTO {temporary} ({", ".join(copied)}) SELECT {", ".join(copied.values())} FROM {table.name}'
+        ))
+        connection.execute(text(f'DROP TABLE {table.name}'))
+        connection.execute(text(f'ALTER TABLE {temporary} RENAME TO {table.name}'))
+    for index in table.indexes:
+        index.create(db.engine, checkfirst=True)
+
+
+def backfill_posted_at(batch_size=1000):
+    """Parse posted_at of the jobs stored without one, relative dates count back from created_at"""
+    from models.job import Job, parse_posting_date
+    jobs = Job.__table__
+    statement = (
+        update(jobs)
+        .where(jobs.c.id == bindparam('job_id'))
+        .values(posted_at=bindparam('parsed'), updated_at=jobs.c.updated_at)
+    )
+    filled, last_id = 0, 0
+    while True:
+        with db.engine.begin() as connection:
+            rows = connection.execute(
+                select(jobs.c.id, jobs.c.posting_date, jobs.c.created_at)
+                .where(jobs.c.id > last_id, jobs.c.posted_at.is_(None))
+                .order_by(jobs.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return filled
+            connection.execute(statement, [
+                {
+                    'job_id': row.id,
+                    'parsed': parse_posting_date(row.posting_date, now=row.created_at) or row.created_at or datetime.utcnow()
+                }
+                for row in rows
+            ])
+        filled += len(rows)
+        last_id = rows[-1].id
+
+
+def backfill_job_tags(batch_size=500):
+    """Link the live jobs with tags in jobs.tags but no job_tags rows to their tags, commits per batch"""
+    from models.job import Job
+    from models.tag import job_tags, parse_tags
+    from bulk import sync_job_tags
+    jobs = Job.__table__
+    unlinked = ~select(job_tags.c.job_id).where(job_tags.c.job_id == jobs.c.id).exists()
+    filled, last_id = 0, 0
+    while True:
+        rows = db.session.execute(
+            select(jobs.c.id, jobs.c.tags)
+            .where(jobs.c.id > last_id, jobs.c.deleted_at.is_(None), jobs.c.tags.isnot(None), jobs.c.tags != '', unlinked)
+            .order_by(jobs.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return filled
+        sync_job_tags({row.id: parse_tags(row.tags) for row in rows})
+        db.session.commit()
+        filled += len(rows)
+        last_id = rows[-1].id
+
+
+@migration(1, 'jobs_unique_title_company')
+def jobs_unique_title_company():
+    from models.job import Job
+    try:
+        create_index(Job.__table__, 'uq_jobs_title_company')
+    except Exception:
+        db.session.rollback()
+        duplicates = db.session.execute(
+            select(Job.title, Job.company, func.count().label('count'))
+            .group_by(Job.title, Job.company)
+            .having(func.count() > 1)
+            .order_by(func.count().desc())
+        ).all()
+        print(f"{len(duplicates)} (title, company) pairs violate uq_jobs_title_company, run: flask --app app dedupe-jobs")
+        for row in duplicates[:10]:
+            print(f"  {row.count} jobs titled '{row.title}' at '{row.company}'")
+        raise
+
+
+@migration(2, 'jobs_posted_at')
+def jobs_posted_at():
+    from models.job import Job
+    add_column(Job.__table__, 'posted_at')
+    # Lists sort and seek on posted_at, rows left without one would sort apart from the rest
+    backfill_posted_at()
+    create_index(Job.__table__, 'ix_jobs_posted_at')
+
+
+@migration(3, 'jobs_query_indexes')
+def jobs_query_indexes():
+    # job_type equality with the date sort/window of get_jobs
+    from models.job import Job
+    create_index(Job.__table__, 'ix_jobs_job_type_posted_at')
+
+
+@migration(4, 'jobs_change_feed')
+def jobs_change_feed():
+    # Soft delete tombstones and the change sequence, existing rows enter the feed in id order
+    from models.job import Job
+    add_column(Job.__table__, 'deleted_at')
+    add_column(Job.__table__, 'change_seq')
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(Job.__table__)
+            .where(Job.change_seq.is_(None))
+            .values(change_seq=Job.id, updated_at=Job.updated_at)
+        )
+    create_index(Job.__table__, 'ix_jobs_change_seq')
+    create_index(Job.__table__, 'ix_jobs_deleted_at')
+
+
+@migration(5, 'jobs_duplicate_of')
+def jobs_duplicate_of():
+    # Near duplicate marks, the signature tables themselves are new and come from create_all
+    from models.job import Job
+    if add_column(Job.__table__, 'duplicate_of'):
+        print("Added jobs.duplicate_of, detect duplicates among existing rows with: flask --app app detect-duplicates")
+    create_index(Job.__table__, 'ix_jobs_duplicate_of')
+
+
+@migration(6, 'jobs_last_seen_at')
+def jobs_last_seen_at():
+    # Existing rows count as seen when they were last written, jobs_archive comes from create_all
+    from models.job import Job
+    add_column(Job.__table__, 'last_seen_at')
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(Job.__table__)
+            .where(Job.last_seen_at.is_(None))
+            .values(last_seen_at=func.coalesce(Job.updated_at, Job.created_at), updated_at=Job.updated_at)
+        )
+    create_index(Job.__table__, 'ix_jobs_last_seen_at')
+
+
+@migration(7, 'jobs_archive_job_id')
+def jobs_archive_job_id():
+    # Archived rows get their own id, the job id moves to job_id so it can never collide
+    from models.archive import ArchivedJob
+    table = ArchivedJob.__table__
+    if 'job_id' in {column['name'] for column in inspect(db.engine).get_columns(table.name)}:
+        return
+    copied = {column.name: column.name for column in table.columns if column.name != 'id'}
+    rebuild_table(table, dict(copied, job_id='id'))
+
+
+@migration(8, 'jobs_autoincrement')
+def jobs_autoincrement():
+    # SQLite reuses the highest rowid once its row is gone, AUTOINCREMENT never does. MySQL
+    # AUTO_INCREMENT counters already only move forward
+    from models.job import Job
+    from models.archive import ArchivedJob
+    if db.engine.dialect.name != 'sqlite':
+        return
+    with db.engine.connect() as connection:
+        create = connection.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'jobs'")).scalar()
+    if 'AUTOINCREMENT' in create.upper():
+        return
+    rebuild_table(Job.__table__, {column.name: column.name for column in Job.__table__.columns})
+    
+    # Ids of purged tombstones may still be in the archive, new jobs start above them too
+    with db.engine.begin() as connection:
+        highest = max(
+            connection.execute(select(func.max(Job.id))).scalar() or 0,
+            connection.execute(select(func.max(ArchivedJob.job_id))).scalar() or 0
+        )
+        connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'jobs'"))
+        connection.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('jobs', :highest)"), {'highest': highest})
+
+
+@migration(9, 'jobs_posted_at_backfill')
+def jobs_posted_at_backfill():
+    # Databases that took migration 2 before it filled posted_at itself
+    filled = backfill_posted_at()
+    if filled:
+        print(f"Filled jobs.posted_at of {filled} jobs")
+
+
+@migration(10, 'job_tags_backfill')
+def job_tags_backfill():
+    # Databases from before the tags tables hold tags only in jobs.tags, tag filters and facet
+    # counts read job_tags
+    from facets import rebuild_facet_counts
+    filled = backfill_job_tags()
+    if filled:
+        rebuild_facet_counts()
+        db.session.commit()
+        print(f"Linked the tags of {filled} jobs")
+
+
+def applied_versions():
+    return set(db.session.execute(select(schema_migrations.c.version)).scalars())
+
+
+def run_migrations():
+    """Apply pending migrations in order, stops at the first one that fails (call inside app context)"""
+    applied = applied_versions()
+    db.session.commit()
+    
+    for version, name, function in MIGRATIONS:
+        if version in applied:
+            continue
+        try:
+            function()
+        except Exception as e:
+            print(f"Migration {version} ({name}) failed: {str(e)}")
+            return False
+        
+        try:
+            db.session.execute(insert(schema_migrations).values(version=version, name=name, applied_at=datetime.utcnow()))
+            db.session.commit()
+        except IntegrityError:
+            # Another worker process starting at the same time recorded it first
+            db.session.rollback()
+            continue
+        print(f"Applied migration {version}: {name}")
+    return True
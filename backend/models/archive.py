@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete
+from db import db
+from models.job import job_row_to_dict
+
+DEFAULT_RETENTION_DAYS = 90
+
+
+def retention_cutoff():
+    """Jobs posted before this datetime belong in the archive, see ARCHIVE_RETENTION_DAYS"""
+    return datetime.utcnow() - timedelta(days=current_app.config.get('ARCHIVE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS))
+
+
+class ArchivedJob(db.Model):
+    """A job moved out of the jobs table by archive-jobs, keeps its job id and values, see archive.py"""
+    __tablename__ = 'jobs_archive'
+    __table_args__ = (
+        # Not unique, a job can be listed, archived and purged, then come back and be archived again
+        db.Index('ix_jobs_archive_title_company', 'title', 'company'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, nullable=False, index=True)  # id the job had in the jobs table
+    title = db.Column(db.String(255), nullable=False)
+    company = db.Column(db.String(255), nullable=False)
+    location = db.Column(db.String(255), nullable=False)
+    posting_date = db.Column(db.String(100), nullable=True)
+    posted_at = db.Column(db.DateTime, nullable=True, index=True)
+    job_type = db.Column(db.String(50), nullable=True)
+    tags = db.Column(db.Text, nullable=True)
+    duplicate_of = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=True)
+    last_seen_at = db.Column(db.DateTime, nullable=True)
+    archived_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    @classmethod
+    def discard(cls, ids):
+        """Drop the archived copies of jobs that are live again, does not commit"""
+        db.session.execute(delete(cls.__table__).where(cls.job_id.in_(ids)))
+
+    def to_dict(self):
+        """Same dictionary as a live job plus when it was archived"""
+        job = dict(job_row_to_dict(self), id=self.job_id)
+        job['archived_at'] = self.archived_at.isoformat()
+        return job
+
+    def __repr__(self):
+        return f'<ArchivedJob {self.title} at {self.company}>'
@@ -0,0 +1,11 @@
+from db import db
+
+class ChangeCounter(db.Model):
+    """Named counters of the change feed, the last change sequence handed out and the purge horizon"""
+    __tablename__ = 'change_counters'
+
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<ChangeCounter {self.name}: {self.value}>'
@@ -0,0 +1,18 @@
+from db import db
+
+# MinHash signature of each job's title, company, location and tags, see duplicates.py
+job_signatures = db.Table(
+    'job_signatures',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('signature', db.LargeBinary, nullable=False)
+)
+
+# One row per LSH band of a signature, jobs sharing a (bucket, band) are near duplicate candidates.
+# bucket leads the primary key so a lookup seeks it, the job_id index serves removals
+job_lsh_buckets = db.Table(
+    'job_lsh_buckets',
+    db.Column('bucket', db.BigInteger, primary_key=True, autoincrement=False),
+    db.Column('band', db.SmallInteger, primary_key=True, autoincrement=False),
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_job_lsh_buckets_job_id', 'job_id')
+)
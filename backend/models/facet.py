@@ -0,0 +1,12 @@
+from db import db
+
+class FacetCount(db.Model):
+    """Precomputed number of jobs per job_type, location and tag, kept current on every write"""
+    __tablename__ = 'job_facet_counts'
+    
+    facet = db.Column(db.String(20), primary_key=True)  # job_type, location, tag or total
+    value = db.Column(db.String(255), primary_key=True)  # Tags are stored by slug
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<FacetCount {self.facet}={self.value}: {self.count}>'
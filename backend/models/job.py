@@ -1,32 +1,131 @@
 from db import db
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from models.tag import Tag, job_tags, parse_tags
+import re
+
+# Relative posting dates like "2 days ago", "3h ago" or "30+ days ago"
+RELATIVE_DATE_RE = re.compile(
+    r'(\d+)\+?\s*(minute|min|m|hour|hr|h|day|d|week|wk|w|month|mo|year|yr|y)s?\b(?:\s+ago)?',
+    re.IGNORECASE
+)
+RELATIVE_UNITS = {
+    'minute': timedelta(minutes=1), 'min': timedelta(minutes=1), 'm': timedelta(minutes=1),
+    'hour': timedelta(hours=1), 'hr': timedelta(hours=1), 'h': timedelta(hours=1),
+    'day': timedelta(days=1), 'd': timedelta(days=1),
+    'week': timedelta(weeks=1), 'wk': timedelta(weeks=1), 'w': timedelta(weeks=1),
+    'month': timedelta(days=30), 'mo': timedelta(days=30),
+    'year': timedelta(days=365), 'yr': timedelta(days=365), 'y': timedelta(days=365),
+}
+RECENT_WORDS = ('just posted', 'just now', 'recently posted', 'today', 'new')
+ABSOLUTE_DATE_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d',
+    '%B %d, %Y', '%b %d, %Y', '%d %B %Y', '%d %b %Y', '%m/%d/%Y',
+)
+
+
+def parse_posting_date(posting_date, now=None):
+    """
+    Turn a posting date string into a UTC datetime, None when it cannot be understood
+
+    Handles relative strings ("2 days ago", "yesterday", "Recently posted") counted back from
+    now and absolute dates (2024-05-01, May 1, 2024, 05/01/2024).
+    """
+    if isinstance(posting_date, datetime):
+        return posting_date
+    if not isinstance(posting_date, str):
+        return None
+    text = posting_date.strip()
+    if not text:
+        return None
+    now = now or datetime.utcnow()
+    lowered = text.lower().removeprefix('posted').strip(' :')
+    
+    if lowered.startswith(RECENT_WORDS):
+        return now
+    if lowered == 'yesterday':
+        return now - timedelta(days=1)
+    
+    match = RELATIVE_DATE_RE.fullmatch(lowered)
+    if match:
+        return now - int(match.group(1)) * RELATIVE_UNITS[match.group(2).lower()]
+    
+    absolute = text.removesuffix('Z')
+    try:
+        parsed = datetime.fromisoformat(absolute)
+    except ValueError:
+        pass
+    else:
+        # Stored naive in UTC, an explicit offset is converted first
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+    for date_format in ABSOLUTE_DATE_FORMATS:
+        try:
+            return datetime.strptime(absolute, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def job_row_to_dict(row):
+    """Convert a Job object or a row selected from the jobs columns to the API dictionary"""
+    return {
+        'id': row.id,
+        'title': row.title,
+        'company': row.company,
+        'location': row.location,
+        'posting_date': row.posting_date,
+        'posted_at': row.posted_at.isoformat() if row.posted_at else None,
+        'job_type': row.job_type,
+        'tags': row.tags.split(',') if row.tags else [],  # Convert to list
+        'created_at': row.created_at.isoformat() if row.created_at else None,
+        'updated_at': row.updated_at.isoformat() if row.updated_at else None
+    }
+
 
 class Job(db.Model):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        # Dedupe key used by the scraper upserts
+        db.Index('uq_jobs_title_company', 'title', 'company', unique=True),
+        # job_type filter combined with the posted_at sort/window, see migrations.py
+        db.Index('ix_jobs_job_type_posted_at', 'job_type', 'posted_at'),
+        # SQLite would hand the id of a purged tombstone out again, it may still name an archived job
+        {'sqlite_autoincrement': True},
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     title = db.Column(db.String(255), nullable=False)
     company = db.Column(db.String(255), nullable=False)
     location = db.Column(db.String(255), nullable=False)
     posting_date = db.Column(db.String(100), nullable=True)  # Can store "2 days ago" or actual date
+    posted_at = db.Column(db.DateTime, nullable=True, index=True)  # posting_date parsed at ingest, used to sort and filter
     job_type = db.Column(db.String(50), default='Full-time')  # Full-time, Part-time, Contract, Internship
     tags = db.Column(db.Text, nullable=True)  # Comma-separated tags
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = db.Column(db.DateTime, nullable=True, index=True)  # Set instead of deleting the row, a tombstone for the change feed
+    change_seq = db.Column(db.BigInteger, nullable=True, index=True)  # Change feed position of the last write, see changes.py
+    duplicate_of = db.Column(db.Integer, nullable=True, index=True)  # First listing of a near duplicate group, see duplicates.py
+    last_seen_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # Stored or listed by the scraper, see archive.py
+    
+    # Normalized tags used for indexed filtering, the tags column above is kept for output
+    tag_objects = db.relationship('Tag', secondary=job_tags, lazy='select', backref=db.backref('jobs', lazy='dynamic'))
+    
+    def set_tags(self, tags):
+        """Set tags from a list or comma-separated string keeping both representations in sync"""
+        names = parse_tags(tags)
+        self.tags = ','.join(names)
+        self.tag_objects = Tag.get_or_create_many(names)
+    
+    def set_posting_date(self, posting_date):
+        """Set posting_date and the posted_at timestamp parsed from it, unparseable dates count as now"""
+        self.posting_date = posting_date
+        self.posted_at = parse_posting_date(posting_date) or datetime.utcnow()
     
     def to_dict(self):
         """Convert job object to dictionary"""
-        return {
-            'id': self.id,
-            'title': self.title,
-            'company': self.company,
-            'location': self.location,
-            'posting_date': self.posting_date,
-            'job_type': self.job_type,
-            'tags': self.tags.split(',') if self.tags else [],  # Convert to list
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return job_row_to_dict(self)
     
     def __repr__(self):
         return f'<Job {self.title} at {self.company}>'
\ No newline at end of file
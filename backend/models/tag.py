@@ -0,0 +1,60 @@
+from db import db
+
+# Association table between jobs and tags, the tag_id index serves tag -> jobs lookups
+job_tags = db.Table(
+    'job_tags',
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_job_tags_tag_id_job_id', 'tag_id', 'job_id')
+)
+
+
+def parse_tags(tags):
+    """Normalize a list or comma-separated string of tags into a clean list"""
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = tags.split(',')
+    
+    names = []
+    seen = set()
+    for tag in tags:
+        name = str(tag).strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+class Tag(db.Model):
+    __tablename__ = 'tags'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    name = db.Column(db.String(100), nullable=False)
+    slug = db.Column(db.String(100), nullable=False, unique=True, index=True)  # Lowercased name used for lookups
+    
+    @staticmethod
+    def slugify(name):
+        return name.strip().lower()
+    
+    @classmethod
+    def get_or_create_many(cls, names):
+        """Return Tag rows for the given names creating any missing ones with a single lookup"""
+        slugs = [cls.slugify(name) for name in names]
+        if not slugs:
+            return []
+        
+        existing = {tag.slug: tag for tag in cls.query.filter(cls.slug.in_(slugs)).all()}
+        
+        tags = []
+        for name, slug in zip(names, slugs):
+            tag = existing.get(slug)
+            if tag is None:
+                tag = cls(name=name, slug=slug)
+                db.session.add(tag)
+                existing[slug] = tag
+            tags.append(tag)
+        return tags
+    
+    def __repr__(self):
+        return f'<Tag {self.name}>'
@@ -0,0 +1,45 @@
+"""
+Read replica routing for the API
+
+When REPLICA_DATABASE_URL is set, GET and HEAD requests read from the replica bind and every
+other request (create/update/delete, bulk writes) uses the primary, as do the scraper and the
+CLI commands which run outside requests. A successful write sets a short-lived cookie so the
+same client keeps reading from the primary for READ_YOUR_WRITES_SECONDS, long enough for the
+replica to catch up, and sees its own change right away.
+"""
+
+import time
+from flask import g, request
+from db import REPLICA_BIND
+
+READ_METHODS = ('GET', 'HEAD')
+READ_PRIMARY_COOKIE = 'read_primary_until'
+
+
+def wrote_recently():
+    """True while the read-your-writes cookie of a recent write is still valid"""
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def init_replica_routing(app):
+    """Install the request hooks when a replica bind is configured"""
+    if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+    window = app.config.get('READ_YOUR_WRITES_SECONDS', 5)
+    
+    @app.before_request
+    def choose_bind():
+        g.use_replica = request.method in READ_METHODS and not wrote_recently()
+    
+    @app.after_request
+    def remember_write(response):
+        if request.method not in READ_METHODS and response.status_code < 400:
+            response.set_cookie(
+                READ_PRIMARY_COOKIE, f'{time.time() + window:.3f}',
+                max_age=max(1, int(window)), httponly=True, samesite='Lax'
+            )
+        response.headers['X-DB-Bind'] = 'replica' if g.get('use_replica') else 'primary'
+        return response
@@ -0,0 +1,218 @@
+from flask import Blueprint, request, jsonify
+from db import db
+from models.job import Job
+from bulk import normalize_job_row, insert_jobs, update_jobs, delete_jobs, key_filter
+from changes import sync_mirrors
+from routes.job_routes import validate_job_data, UPDATABLE_COLUMNS
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+bulk_bp = Blueprint('jobs_bulk', __name__, url_prefix='/api/jobs/bulk')
+
+# Upper bound for the number of items in one bulk request
+MAX_BULK_ITEMS = 5000
+
+
+def read_items(key):
+    """Return the list of items from the request body, a bare JSON array or {key: [...]}"""
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list):
+        return None, f'Request body must be a JSON array or an object with a {key} array'
+    if len(data) > MAX_BULK_ITEMS:
+        return None, f'At most {MAX_BULK_ITEMS} items can be sent in one request'
+    return data, None
+
+
+def bulk_response(message, results):
+    failed = sum(1 for result in results if 'error' in result)
+    return jsonify({
+        'message': message,
+        'succeeded': len(results) - failed,
+        'failed': failed,
+        'results': results
+    }), 200
+
+
+def existing_ids(ids):
+    """Return the subset of ids of live (not deleted) jobs"""
+    found = set()
+    for start in range(0, len(ids), 500):
+        found.update(db.session.execute(
+            select(Job.id).where(Job.id.in_(ids[start:start + 500]), Job.deleted_at.is_(None))
+        ).scalars())
+    return found
+
+
+def existing_keys(keys, include_deleted=False):
+    """Return the subset of (title, company) keys of live jobs, tombstones can be taken over by a create"""
+    found = set()
+    for start in range(0, len(keys), 500):
+        query = select(Job.title, Job.company).where(key_filter(keys[start:start + 500]))
+        if not include_deleted:
+            query = query.where(Job.deleted_at.is_(None))
+        found.update((row.title, row.company) for row in db.session.execute(query))
+    return found
+
+
+def job_keys(ids):
+    """Return the (title, company) key of each job id"""
+    found = {}
+    for start in range(0, len(ids), 500):
+        found.update(
+            (row.id, (row.title, row.company))
+            for row in db.session.execute(select(Job.id, Job.title, Job.company).where(Job.id.in_(ids[start:start + 500])))
+        )
+    return found
+
+
+# CREATE Add many jobs in one transaction
+@bulk_bp.route('', methods=['POST'])
+def bulk_create_jobs():
+    try:
+        items, error = read_items('jobs')
+        if error:
+            return jsonify({'error': error}), 400
+        
+        results = [{'index': index} for index in range(len(items))]
+        rows, row_indexes = [], []
+        for index, data in enumerate(items):
+            error = validate_job_data(data)
+            if error:
+                results[index]['error'] = error
+                continue
+            rows.append(normalize_job_row(dict(
+                data,
+                posting_date=data.get('posting_date', 'Just posted'),
+                job_type=data.get('job_type', 'Full-time')
+            )))
+            row_indexes.append(index)
+        
+        # Reject items colliding with stored jobs or with an earlier item of the batch
+        taken = existing_keys([(row['title'], row['company']) for row in rows])
+        accepted, accepted_indexes = [], []
+        for row, index in zip(rows, row_indexes):
+            key = (row['title'], row['company'])
+            if key in taken:
+                results[index]['error'] = 'A job with this title and company already exists'
+                continue
+            taken.add(key)
+            accepted.append(row)
+            accepted_indexes.append(index)
+        
+        for index, job_id in zip(accepted_indexes, insert_jobs(accepted)):
+            results[index]['id'] = job_id
+        
+        db.session.commit()
+        if accepted:
+            sync_mirrors()
+        
+        return bulk_response('Bulk create completed', results)
+        
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'A job in the batch conflicts with a concurrently created job'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# UPDATE Update many jobs in one transaction, each item needs an id
+@bulk_bp.route('', methods=['PUT', 'PATCH'])
+def bulk_update_jobs():
+    try:
+        items, error = read_items('jobs')
+        if error:
+            return jsonify({'error': error}), 400
+        
+        ids = [data.get('id') for data in items if isinstance(data, dict) and isinstance(data.get('id'), int)]
+        found = existing_ids(ids)
+        
+        results = [{'index': index} for index in range(len(items))]
+        changes, seen = [], set()
+        for index, data in enumerate(items):
+            job_id = data.get('id') if isinstance(data, dict) else None
+            error = validate_job_data(data, partial=True)
+            if not error and not isinstance(job_id, int):
+                error = 'id is required'
+            elif not error and job_id not in found:
+                error = 'Job not found'
+            elif not error and job_id in seen:
+                error = 'Job is updated more than once in this batch'
+            if error:
+                results[index]['error'] = error
+                continue
+            
+            seen.add(job_id)
+            change = {field: data[field] for field in UPDATABLE_COLUMNS + ['tags'] if field in data}
+            changes.append((index, dict(change, id=job_id)))
+        
+        # Reject renames onto a stored job, the tombstone of a deleted one included since it keeps
+        # its key, or onto the new key of an earlier item of the batch
+        current = job_keys([change['id'] for _, change in changes if 'title' in change or 'company' in change])
+        renames = {}
+        for index, change in changes:
+            if change['id'] in current:
+                title, company = current[change['id']]
+                key = (change.get('title', title), change.get('company', company))
+                if key != (title, company):
+                    renames[index] = key
+        taken = existing_keys(list(set(renames.values())), include_deleted=True)
+        accepted = []
+        for index, change in changes:
+            key = renames.get(index)
+            if key in taken:
+                results[index]['error'] = 'A job with this title and company already exists'
+                continue
+            if key is not None:
+                taken.add(key)
+            accepted.append(change)
+            results[index]['id'] = change['id']
+        changes = accepted
+        
+        update_jobs(changes)
+        db.session.commit()
+        if changes:
+            sync_mirrors()
+        
+        return bulk_response('Bulk update completed', results)
+        
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'An update in the batch would duplicate a title and company'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# DELETE Delete many jobs in one transaction
+@bulk_bp.route('', methods=['DELETE'])
+def bulk_delete_jobs():
+    try:
+        ids, error = read_items('ids')
+        if error:
+            return jsonify({'error': error}), 400
+        
+        found = existing_ids([job_id for job_id in ids if isinstance(job_id, int)])
+        
+        results, to_delete, seen = [], [], set()
+        for index, job_id in enumerate(ids):
+            result = {'index': index, 'id': job_id}
+            if not isinstance(job_id, int) or job_id not in found:
+                result['error'] = 'Job not found'
+            elif job_id in seen:
+                result['error'] = 'Job is deleted more than once in this batch'
+            else:
+                to_delete.append(job_id)
+                seen.add(job_id)
+            results.append(result)
+        
+        delete_jobs(to_delete)
+        db.session.commit()
+        if to_delete:
+            sync_mirrors()
+        
+        return bulk_response('Bulk delete completed', results)
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
@@ -1,10 +1,278 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from db import db
-from models.job import Job
-from sqlalchemy import or_, desc, asc
+from models.job import Job, job_row_to_dict, parse_posting_date
+from models.tag import Tag, job_tags, parse_tags
+from models.archive import ArchivedJob
+from search import apply_search, rank_ascending, search_terms
+from cache import response_cache, cached_response
+from serializers import parse_fields, job_columns, row_serializer, json_response
+from facets import job_facet_keys, facet_deltas, unfiltered_facets, filtered_facets
+from changes import claim_job_write, current_change_seq, purged_change_seq, job_changes, apply_to_mirrors, sync_mirrors
+from duplicates import register_jobs, reregister_jobs, release_duplicates, SIGNATURE_FIELDS
+from job_index import job_index, relevance_sort
+from suggest import suggest_index, SUGGEST_FIELDS, MAX_SUGGESTIONS
+from sqlalchemy import or_, and_, desc, asc, func, select, literal, union_all
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+import base64
+import csv
+import io
+import json
+import zlib
 
 job_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
 
+# Upper bound for a single page when paginating with limit/cursor
+MAX_PAGE_LIMIT = 500
+
+# Rows returned per page of /changes unless limit says otherwise, also its upper bound
+CHANGES_PAGE_LIMIT = 1000
+
+# Suggestions returned by /suggest unless limit says otherwise
+DEFAULT_SUGGEST_LIMIT = 10
+
+# Values returned per facet by /facets unless limit says otherwise
+DEFAULT_FACET_LIMIT = 50
+FILTER_PARAMS = ('job_type', 'location', 'tag', 'search', 'posted_after', 'posted_before', 'collapse_duplicates')
+
+# Rows fetched from the server side cursor per batch when exporting
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = ['id', 'title', 'company', 'location', 'posting_date', 'posted_at', 'job_type', 'tags', 'created_at', 'updated_at']
+
+
+def encode_cursor(sort_value, job_id):
+    """Encode the (sort key, id) keyset position of a row as an opaque cursor, a NULL sort key stays null"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, job_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, is_datetime=True):
+    """Decode a cursor back into a (sort key, id) tuple, raises ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, job_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        # null is the position of a row without a sort value
+        if sort_value is not None:
+            sort_value = datetime.fromisoformat(sort_value) if is_datetime else float(sort_value)
+        return sort_value, int(job_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def seek_filter(sort_key, id_column, cursor, ascending):
+    """
+    Keyset condition selecting the rows after a decoded cursor in (sort key, id) order
+
+    NULL sort keys come first in ascending order and last in descending order, as SQLite and
+    MySQL sort them and as the job index does. A plain comparison with NULL is never true, so
+    both sides of a NULL are spelled out.
+    """
+    cursor_value, cursor_id = cursor
+    if cursor_value is None:
+        if ascending:
+            return or_(sort_key.isnot(None), and_(sort_key.is_(None), id_column > cursor_id))
+        return and_(sort_key.is_(None), id_column < cursor_id)
+    if ascending:
+        return or_(sort_key > cursor_value, and_(sort_key == cursor_value, id_column > cursor_id))
+    return or_(sort_key < cursor_value, and_(sort_key == cursor_value, id_column < cursor_id), sort_key.is_(None))
+
+
+def tag_filter_subquery(tags, mode='all'):
+    """Select job ids having all (AND) or any (OR) of the given tags using the tag indexes"""
+    slugs = [Tag.slugify(tag) for tag in tags]
+    subquery = (
+        select(job_tags.c.job_id)
+        .join(Tag, Tag.id == job_tags.c.tag_id)
+        .where(Tag.slug.in_(slugs))
+    )
+    if mode == 'any':
+        return subquery.distinct()
+    return subquery.group_by(job_tags.c.job_id).having(func.count(job_tags.c.tag_id) == len(slugs))
+
+
+# Fields validated on create/update, the required ones can never be empty
+REQUIRED_FIELDS = ['title', 'company', 'location']
+UPDATABLE_COLUMNS = ['title', 'company', 'location', 'posting_date', 'job_type']
+
+
+def validate_job_data(data, partial=False):
+    """Return an error message for invalid job data or None, partial=True validates an update"""
+    if not isinstance(data, dict):
+        return 'Job data must be a JSON object'
+    
+    for field in REQUIRED_FIELDS:
+        if partial:
+            if field in data and not data[field]:
+                return f'{field.capitalize()} cannot be empty'
+        elif not data.get(field):
+            return f'{field} is required'
+    
+    for field in UPDATABLE_COLUMNS:
+        if data.get(field) is not None and not isinstance(data[field], str):
+            return f'{field} must be a string'
+    tags = data.get('tags')
+    if tags is not None and not isinstance(tags, (str, list)):
+        return 'tags must be a list or a comma separated string'
+    return None
+
+
+def filter_jobs(query, args):
+    """
+    Apply the job_type/location/tag/search/posted_* filters from the request args to a Job query
+
+    Deleted jobs are always left out, near duplicates too with collapse_duplicates=true. Returns
+    (query, rank) where rank is the search relevance column or None, raises ValueError for a
+    posted_after/posted_before value that is not a date
+    """
+    query = query.filter(Job.deleted_at.is_(None))
+    
+    # Filter by job_type
+    job_type = args.get('job_type')
+    if job_type:
+        query = query.filter(Job.job_type == job_type)
+    
+    # Filter by location
+    location = args.get('location')
+    if location:
+        query = query.filter(Job.location.ilike(f'%{location}%'))
+    
+    # Filter by tag(s) through the indexed job_tags table, tag=a,b or repeated tag params
+    tags = parse_tags([name for value in args.getlist('tag') for name in value.split(',')])
+    if tags:
+        query = query.filter(Job.id.in_(tag_filter_subquery(tags, args.get('tag_mode', 'all'))))
+    
+    # Date window on the indexed posted_at column, absolute dates or relative ones like "7 days ago"
+    for name, compare in (('posted_after', Job.posted_at.__ge__), ('posted_before', Job.posted_at.__lt__)):
+        value = args.get(name)
+        if value:
+            posted_at = parse_posting_date(value)
+            if posted_at is None:
+                raise ValueError(f'{name} must be a date')
+            query = query.filter(compare(posted_at))
+    
+    # Only the first listing of each group of near duplicates, see duplicates.py
+    if args.get('collapse_duplicates', '').lower() in ('1', 'true', 'yes'):
+        query = query.filter(Job.duplicate_of.is_(None))
+    
+    # Full-text search by keyword over title, company and tags
+    rank = None
+    search = args.get('search')
+    if search:
+        query, rank = apply_search(query, search)
+    
+    return query, rank
+
+
+def include_archived(args):
+    """Whether a request asks for archived jobs too, see archive.py"""
+    return args.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+
+def filter_archived_jobs(query, args):
+    """
+    Apply the filters of filter_jobs to an ArchivedJob query
+
+    The archive has no tag links or full-text index, so tags are matched in the stored tags
+    text and every search term with ilike over title, company and tags.
+    """
+    job_type = args.get('job_type')
+    if job_type:
+        query = query.filter(ArchivedJob.job_type == job_type)
+    
+    location = args.get('location')
+    if location:
+        query = query.filter(ArchivedJob.location.ilike(f'%{location}%'))
+    
+    tags = parse_tags([name for value in args.getlist('tag') for name in value.split(',')])
+    if tags:
+        tag_list = literal(',') + func.lower(ArchivedJob.tags) + literal(',')
+        matches = [tag_list.like(f'%,{tag.lower()},%') for tag in tags]
+        query = query.filter(or_(*matches) if args.get('tag_mode', 'all') == 'any' else and_(*matches))
+    
+    for name, compare in (('posted_after', ArchivedJob.posted_at.__ge__), ('posted_before', ArchivedJob.posted_at.__lt__)):
+        value = args.get(name)
+        if value:
+            posted_at = parse_posting_date(value)
+            if posted_at is None:
+                raise ValueError(f'{name} must be a date')
+            query = query.filter(compare(posted_at))
+    
+    if args.get('collapse_duplicates', '').lower() in ('1', 'true', 'yes'):
+        query = query.filter(ArchivedJob.duplicate_of.is_(None))
+    
+    for term in search_terms(args.get('search') or ''):
+        query = query.filter(or_(
+            ArchivedJob.title.ilike(f'%{term}%'),
+            ArchivedJob.company.ilike(f'%{term}%'),
+            ArchivedJob.tags.ilike(f'%{term}%')
+        ))
+    
+    return query
+
+
+def with_archived(query, args, columns):
+    """
+    Rows of a filtered Job query followed by the matching archived jobs, as one UNION ALL
+
+    Returns (query, sort column, id column), the rows hold `columns` plus posted_at as their
+    sort value like the rows of a live-only list.
+    """
+    archived = filter_archived_jobs(ArchivedJob.query, args)
+    jobs = union_all(
+        query.with_entities(*columns, Job.posted_at.label('sort_value')).statement,
+        archived.with_entities(
+            *[ArchivedJob.job_id if column.key == 'id' else getattr(ArchivedJob, column.key) for column in columns],
+            ArchivedJob.posted_at.label('sort_value')
+        ).statement
+    ).subquery()
+    return db.session.query(*[jobs.c[column.key] for column in columns], jobs.c.sort_value), jobs.c.sort_value, jobs.c.id
+
+
+def page_args(args):
+    """(limit, cursor, include_count) of a list request, limit is None without pagination, raises ValueError"""
+    limit = args.get('limit')
+    cursor = args.get('cursor')
+    if not limit and not cursor:
+        return None, None, False
+    
+    try:
+        limit = int(limit) if limit else 50
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    include_count = args.get('include_count', '').lower() in ('1', 'true', 'yes')
+    return min(limit, MAX_PAGE_LIMIT), cursor, include_count
+
+
+def jobs_page(rows, has_more, total, limit, serialize, change_seq):
+    """GET /api/jobs response for rows ending with their sort value, the full list shape when limit is None"""
+    jobs = [serialize(row) for row in rows]
+    if limit is None:
+        return json_response({
+            'count': len(jobs),
+            'jobs': jobs,
+            'change_seq': change_seq
+        }), 200
+    
+    # id is the first selected column (job_columns follows JOB_FIELDS order)
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(rows[-1][-1], rows[-1][0])
+    
+    response = {
+        'count': len(jobs),
+        'jobs': jobs,
+        'next_cursor': next_cursor,
+        'change_seq': change_seq
+    }
+    if total is not None:
+        response['total'] = total
+    return json_response(response), 200
+
+
 # CREATE Add a new job
 @job_bp.route('', methods=['POST'])
 def create_job():
@@ -12,81 +280,276 @@ def create_job():
         data = request.get_json()
         
         # Validate required fields
-        required_fields = ['title', 'company', 'location']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'{field} is required'}), 400
-        
-        # Handle tags convert list to comma separated string if needed
-        tags = data.get('tags', '')
-        if isinstance(tags, list):
-            tags = ','.join(tags)
-        
-        # Create new job
-        new_job = Job(
-            title=data['title'],
-            company=data['company'],
-            location=data['location'],
-            posting_date=data.get('posting_date', 'Just posted'),
-            job_type=data.get('job_type', 'Full-time'),
-            tags=tags
-        )
-        
-        db.session.add(new_job)
+        error = validate_job_data(data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        # A deleted job with the same title and company comes back under its old id
+        new_job = Job.query.filter(
+            Job.title == data['title'], Job.company == data['company'], Job.deleted_at.isnot(None)
+        ).first()
+        # Nothing is written before claim_job_write, see changes.py
+        with db.session.no_autoflush:
+            if new_job is None:
+                new_job = Job(title=data['title'], company=data['company'])
+            else:
+                new_job.deleted_at = None
+                new_job.created_at = new_job.last_seen_at = datetime.utcnow()
+            
+            new_job.location = data['location']
+            new_job.job_type = data.get('job_type', 'Full-time')
+            new_job.set_posting_date(data.get('posting_date', 'Just posted'))
+            
+            # Tags can be a list or comma separated string
+            new_job.set_tags(data.get('tags', ''))
+            
+            db.session.add(new_job)
+            new_job.change_seq = claim_job_write(1, facet_deltas(new_keys=job_facet_keys(new_job)))[0]
+        if new_job.id is not None:
+            ArchivedJob.discard([new_job.id])
+        db.session.flush()
+        register_jobs([{name: getattr(new_job, name) for name in SIGNATURE_FIELDS}])
         db.session.commit()
+        apply_to_mirrors(new_job)
         
         return jsonify({
             'message': 'Job created successfully',
             'job': new_job.to_dict()
         }), 201
         
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'A job with this title and company already exists'}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 # READ Get all jobs with optional filtering and sorting
 @job_bp.route('', methods=['GET'])
+@cached_response
 def get_jobs():
     try:
-        query = Job.query
-        
-        # Filter by job_type
-        job_type = request.args.get('job_type')
-        if job_type:
-            query = query.filter(Job.job_type == job_type)
-        
-        # Filter by location
-        location = request.args.get('location')
-        if location:
-            query = query.filter(Job.location.ilike(f'%{location}%'))
-        
-        # Filter by tag
-        tag = request.args.get('tag')
-        if tag:
-            query = query.filter(Job.tags.ilike(f'%{tag}%'))
-        
-        # Search by keyword i.e title or company
-        search = request.args.get('search')
-        if search:
-            query = query.filter(
-                or_(
-                    Job.title.ilike(f'%{search}%'),
-                    Job.company.ilike(f'%{search}%')
-                )
+        # Sparse fieldset, e.g. fields=id,title,company, all fields when omitted
+        fields = parse_fields(request.args.get('fields'))
+        columns = job_columns(fields, 'id', 'posted_at')
+        serialize = row_serializer(fields, columns)
+        limit, cursor, include_count = page_args(request.args)
+        
+        # Answered from the in-memory index when it is loaded, same rows and order as SQL
+        if job_index.can_answer(request.args):
+            if cursor:
+                cursor = decode_cursor(cursor, is_datetime=not relevance_sort(request.args))
+            rows, has_more, total = job_index.list_jobs(
+                request.args, [column.key for column in columns], limit, cursor, include_count
             )
+            return jobs_page(rows, has_more, total, limit, serialize, job_index.seq)
+        
+        query, rank = filter_jobs(Job.query, request.args)
+        
+        # Change feed position the list is current up to, read first so that a write racing
+        # with the list query shows up again in /changes rather than being skipped
+        change_seq = current_change_seq()
+        
+        # Sorting, relevance is the default when searching and id is the tie breaker
+        # so that the keyset order is stable. Archived jobs have no rank, lists including
+        # them are sorted by date
+        if include_archived(request.args):
+            rank = None
+        sort = request.args.get('sort') or ('relevance' if rank is not None else 'posting_date_desc')
+        if sort == 'relevance' and rank is not None:
+            sort_key, ascending = rank, rank_ascending()
+        else:
+            rank = None
+            sort_key, ascending = Job.posted_at, sort == 'posting_date_asc'
+        
+        # Plain column rows instead of Job objects, the keyset columns are always selected
+        # and the sort value comes last
+        id_column = Job.id
+        if include_archived(request.args):
+            query, sort_key, id_column = with_archived(query, request.args, columns)
+        else:
+            query = query.with_entities(*columns).add_columns(sort_key.label('sort_value'))
+        
+        direction = asc if ascending else desc
+        query = query.order_by(direction(sort_key), direction(id_column))
+        
+        # No pagination requested so return the full list as before
+        if limit is None:
+            return jobs_page(query.all(), False, None, limit, serialize, change_seq)
+        
+        # Total count is only computed on request since it costs a full scan
+        total = None
+        if include_count:
+            total = query.order_by(None).with_entities(func.count(id_column)).scalar()
+        
+        # Seek past the cursor position instead of using OFFSET
+        if cursor:
+            query = query.filter(seek_filter(sort_key, id_column, decode_cursor(cursor, is_datetime=rank is None), ascending))
+        
+        # Fetch one extra row to know whether there is a next page
+        rows = query.limit(limit + 1).all()
+        has_more = len(rows) > limit
+        return jobs_page(rows[:limit], has_more, total, limit, serialize, change_seq)
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# READ Stream every matching job as NDJSON or CSV
+@job_bp.route('/export', methods=['GET'])
+def export_jobs():
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in ('ndjson', 'csv'):
+            return jsonify({'error': 'format must be ndjson or csv'}), 400
+        use_gzip = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+        
+        # Plain column rows, no ORM objects, streamed from a server side cursor in batches
+        query, _ = filter_jobs(Job.query, request.args)
+        statement = (
+            query.with_entities(*[getattr(Job, name) for name in EXPORT_COLUMNS])
+            .order_by(asc(Job.id))
+            .statement
+        )
         
-        # Sorting
-        sort = request.args.get('sort', 'posting_date_desc')
-        if sort == 'posting_date_desc':
-            query = query.order_by(desc(Job.created_at))
-        elif sort == 'posting_date_asc':
-            query = query.order_by(asc(Job.created_at))
-        
-        jobs = query.all()
+        def generate_chunks():
+            buffer = io.StringIO()
+            if export_format == 'csv':
+                writer = csv.writer(buffer)
+                writer.writerow(EXPORT_COLUMNS)
+            
+            result = db.session.execute(statement, execution_options={'yield_per': EXPORT_BATCH_SIZE})
+            for batch in result.partitions():
+                for row in batch:
+                    if export_format == 'csv':
+                        writer.writerow([
+                            value.isoformat() if isinstance(value, datetime) else value
+                            for value in row
+                        ])
+                    else:
+                        buffer.write(json.dumps(job_row_to_dict(row)))
+                        buffer.write('\n')
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+            
+            # CSV header still has to go out for an empty export
+            if buffer.tell():
+                yield buffer.getvalue().encode('utf-8')
+        
+        def generate():
+            if not use_gzip:
+                yield from generate_chunks()
+                return
+            compressor = zlib.compressobj(wbits=31)  # gzip container
+            for chunk in generate_chunks():
+                compressed = compressor.compress(chunk)
+                if compressed:
+                    yield compressed
+            yield compressor.flush()
+        
+        mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+        response = Response(stream_with_context(generate()), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename=jobs.{export_format}'
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# READ Count jobs per job_type, location and tag for the filter UI
+@job_bp.route('/facets', methods=['GET'])
+@cached_response
+def get_facets():
+    try:
+        try:
+            limit = int(request.args.get('limit', DEFAULT_FACET_LIMIT))
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        if limit < 1:
+            return jsonify({'error': 'limit must be positive'}), 400
+        
+        # Unfiltered counts come from the summary table, filtered ones are grouped on the fly
+        if any(request.args.get(name) for name in FILTER_PARAMS):
+            query, _ = filter_jobs(Job.query, request.args)
+            total, facets = filtered_facets(query, limit)
+        else:
+            total, facets = unfiltered_facets(limit)
+        
+        return jsonify({'total': total, 'facets': facets}), 200
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# READ Jobs created, updated or deleted after a change feed position. Not cached, a response
+# cached by one worker would hide the writes other workers make until the TTL expires
+@job_bp.route('/changes', methods=['GET'])
+def get_changes():
+    try:
+        try:
+            since = int(request.args.get('since', 0))
+            limit = int(request.args.get('limit', CHANGES_PAGE_LIMIT))
+        except ValueError:
+            return jsonify({'error': 'since and limit must be integers'}), 400
+        if since < 0:
+            return jsonify({'error': 'since must not be negative'}), 400
+        if limit < 1:
+            return jsonify({'error': 'limit must be positive'}), 400
+        limit = min(limit, CHANGES_PAGE_LIMIT)
+        
+        # Deletes before the purge horizon are gone, such a client has to refetch the list
+        if since and since < purged_change_seq():
+            return jsonify({'error': 'since is older than the retained change history, refetch the job list'}), 410
+        
+        fields = parse_fields(request.args.get('fields'))
+        columns = job_columns(fields, 'id')
+        serialize = row_serializer(fields, columns)
+        rows, has_more = job_changes(columns, since, limit)
+        
+        # Each job appears once with its latest state, apply jobs as upserts and deleted as removals
+        return json_response({
+            'jobs': [serialize(row) for row in rows if row.deleted_at is None],
+            'deleted': [row.id for row in rows if row.deleted_at is not None],
+            'next_since': rows[-1].change_seq if rows else since,
+            'has_more': has_more
+        }), 200
         
-        return jsonify({
-            'count': len(jobs),
-            'jobs': [job.to_dict() for job in jobs]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# READ Typeahead suggestions for the search, location and tag inputs
+@job_bp.route('/suggest', methods=['GET'])
+def suggest_values():
+    try:
+        field = request.args.get('field', 'title')
+        if field not in SUGGEST_FIELDS:
+            return jsonify({'error': f"field must be one of {', '.join(SUGGEST_FIELDS)}"}), 400
+        prefix = request.args.get('prefix', '')
+        
+        try:
+            limit = int(request.args.get('limit', DEFAULT_SUGGEST_LIMIT))
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        if limit < 1:
+            return jsonify({'error': 'limit must be positive'}), 400
+        
+        # Answered from memory, from SQL while the values are still loading
+        suggest_index.refresh()
+        suggestions = suggest_index.suggest(field, prefix, min(limit, MAX_SUGGESTIONS))
+        
+        return json_response({
+            'field': field,
+            'prefix': prefix,
+            'suggestions': [{'value': value, 'count': count} for value, count in suggestions]
         }), 200
         
     except Exception as e:
@@ -94,12 +557,16 @@ def get_jobs():
 
 # READ Get single job by ID
 @job_bp.route('/<int:job_id>', methods=['GET'])
+@cached_response
 def get_job(job_id):
     try:
         job = Job.query.get(job_id)
         
-        if not job:
-            return jsonify({'error': 'Job not found'}), 404
+        if not job or job.deleted_at is not None:
+            # Archived jobs keep their id
+            job = ArchivedJob.query.filter_by(job_id=job_id).first() if include_archived(request.args) else None
+            if job is None:
+                return jsonify({'error': 'Job not found'}), 404
         
         return jsonify(job.to_dict()), 200
         
@@ -112,46 +579,53 @@ def update_job(job_id):
     try:
         job = Job.query.get(job_id)
         
-        if not job:
+        if not job or job.deleted_at is not None:
             return jsonify({'error': 'Job not found'}), 404
         
         data = request.get_json()
         
-        # Update fields if provided
-        if 'title' in data:
-            if not data['title']:
-                return jsonify({'error': 'Title cannot be empty'}), 400
-            job.title = data['title']
-        
-        if 'company' in data:
-            if not data['company']:
-                return jsonify({'error': 'Company cannot be empty'}), 400
-            job.company = data['company']
-        
-        if 'location' in data:
-            if not data['location']:
-                return jsonify({'error': 'Location cannot be empty'}), 400
-            job.location = data['location']
-        
-        if 'posting_date' in data:
-            job.posting_date = data['posting_date']
-        
-        if 'job_type' in data:
-            job.job_type = data['job_type']
-        
-        if 'tags' in data:
-            tags = data['tags']
-            if isinstance(tags, list):
-                tags = ','.join(tags)
-            job.tags = tags
-        
+        # Required fields may be omitted but not emptied
+        error = validate_job_data(data, partial=True)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        old_facet_keys = job_facet_keys(job)
+        old_signature = [getattr(job, name) for name in SIGNATURE_FIELDS]
+        
+        # Nothing is written before claim_job_write, see changes.py
+        with db.session.no_autoflush:
+            # Update fields if provided
+            for field in UPDATABLE_COLUMNS:
+                if field in data:
+                    setattr(job, field, data[field])
+            
+            if 'posting_date' in data:
+                job.set_posting_date(data['posting_date'])
+            
+            if 'tags' in data:
+                job.set_tags(data['tags'])
+            
+            job.change_seq = claim_job_write(1, facet_deltas(old_facet_keys, job_facet_keys(job)))[0]
+        
+        # A reworded job may join or leave a near duplicate group
+        released = 0
+        signature = {name: getattr(job, name) for name in SIGNATURE_FIELDS}
+        if list(signature.values()) != old_signature:
+            db.session.flush()
+            released = reregister_jobs([signature])
         db.session.commit()
+        apply_to_mirrors(job)
+        if released:
+            sync_mirrors()
         
         return jsonify({
             'message': 'Job updated successfully',
             'job': job.to_dict()
         }), 200
         
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'A job with this title and company already exists'}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -162,14 +636,27 @@ def delete_job(job_id):
     try:
         job = Job.query.get(job_id)
         
-        if not job:
+        if not job or job.deleted_at is not None:
             return jsonify({'error': 'Job not found'}), 404
         
-        db.session.delete(job)
+        # Keep the row as a tombstone so the change feed can report the delete
+        with db.session.no_autoflush:
+            job.tag_objects = []
+            job.deleted_at = datetime.utcnow()
+            job.change_seq = claim_job_write(1, facet_deltas(old_keys=job_facet_keys(job)))[0]
+        released = release_duplicates([job.id])
         db.session.commit()
+        apply_to_mirrors(job)
+        if released:
+            sync_mirrors()
         
         return jsonify({'message': 'Job deleted successfully'}), 200
         
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+# Response cache counters
+@job_bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(response_cache.stats()), 200
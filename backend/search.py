@@ -0,0 +1,125 @@
+"""
+Full-text search over job title, company and tags
+
+MySQL uses a FULLTEXT index queried in boolean mode, SQLite uses an FTS5 external content
+table kept in sync with triggers. Any other database falls back to the ilike search.
+"""
+
+import re
+from sqlalchemy import or_, text, table, column, literal_column
+from db import db
+from models.job import Job
+
+FTS_TABLE = 'jobs_fts'
+MYSQL_FULLTEXT_INDEX = 'ft_jobs_title_company_tags'
+
+SQLITE_FTS_SETUP = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, company, tags, content='jobs', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, company, tags) VALUES (new.id, new.title, new.company, new.tags);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, tags) VALUES ('delete', old.id, old.title, old.company, old.tags);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF title, company, tags ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, tags) VALUES ('delete', old.id, old.title, old.company, old.tags);
+        INSERT INTO {FTS_TABLE}(rowid, title, company, tags) VALUES (new.id, new.title, new.company, new.tags);
+    END""",
+]
+
+# Lightweight handle on the FTS5 table, not part of the metadata so create_all ignores it
+jobs_fts = table(FTS_TABLE, column('rowid'), column('rank'))
+
+
+def search_backend():
+    """Name of the search implementation available for the current database"""
+    dialect = db.engine.dialect.name
+    if dialect in ('mysql', 'mariadb'):
+        return 'mysql'
+    if dialect == 'sqlite':
+        return 'sqlite'
+    return 'like'
+
+
+def init_search():
+    """Create the full-text index for the current database if missing (call inside app context)"""
+    backend = search_backend()
+
+    if backend == 'sqlite':
+        with db.engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {'name': FTS_TABLE}
+            ).first()
+            for statement in SQLITE_FTS_SETUP:
+                conn.execute(text(statement))
+            # Index rows that existed before the FTS table was created
+            if not exists:
+                conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+    elif backend == 'mysql':
+        with db.engine.begin() as conn:
+            exists = conn.execute(
+                text(
+                    "SELECT 1 FROM information_schema.statistics "
+                    "WHERE table_schema = DATABASE() AND table_name = 'jobs' AND index_name = :name"
+                ),
+                {'name': MYSQL_FULLTEXT_INDEX}
+            ).first()
+            if not exists:
+                conn.execute(text(
+                    f"ALTER TABLE jobs ADD FULLTEXT INDEX {MYSQL_FULLTEXT_INDEX} (title, company, tags)"
+                ))
+
+
+def search_terms(search):
+    """Split a user query into plain word terms, dropping full-text operator characters"""
+    return re.findall(r'\w+', search.lower())
+
+
+def apply_search(query, search):
+    """
+    Filter a Job query to rows matching every term of the search (each term is prefix matched)
+
+    Returns (query, rank) where rank is a column to order by for relevance, or None when the
+    ilike fallback is used. The rank sorts best first in ascending order for SQLite (bm25) and
+    in descending order for MySQL (MATCH score), see rank_ascending().
+    """
+    terms = search_terms(search)
+    if not terms:
+        return like_search(query, search), None
+
+    backend = search_backend()
+
+    if backend == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        query = query.join(jobs_fts, jobs_fts.c.rowid == Job.id).filter(
+            literal_column(FTS_TABLE).op('MATCH')(match)
+        )
+        return query, jobs_fts.c.rank
+
+    if backend == 'mysql':
+        from sqlalchemy.dialects.mysql import match as mysql_match
+
+        against = ' '.join(f'+{term}*' for term in terms)
+        rank = mysql_match(Job.title, Job.company, Job.tags, against=against).in_boolean_mode()
+        return query.filter(rank > 0), rank
+
+    return like_search(query, search), None
+
+
+def rank_ascending():
+    """Whether lower rank values are better for the current search backend"""
+    return search_backend() == 'sqlite'
+
+
+def like_search(query, search):
+    """Original unindexed search, leading wildcard ilike over title and company"""
+    return query.filter(
+        or_(
+            Job.title.ilike(f'%{search}%'),
+            Job.company.ilike(f'%{search}%')
+        )
+    )
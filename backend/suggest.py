@@ -0,0 +1,245 @@
+"""
+Typeahead suggestions for the search, location and tag inputs
+
+Keeps the distinct titles, companies, locations and tags of the live jobs in memory with the
+number of jobs having each one. A value is filed under every word it contains, so "york" and
+"new y" both find "New York, USA", in one sorted array per field searched with bisect. The
+best values for a prefix are cached until a write changes a value filed under it.
+
+Loaded in a background thread started with the app, requests arriving before it is ready are
+answered by a GROUP BY query instead. Then it is kept current like the job index: writes made
+through the API are applied as they happen, writes of other processes (the scraper's
+save_to_database) are pulled from the change feed at most every SUGGEST_SYNC_SECONDS.
+"""
+
+import heapq
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+import click
+from sqlalchemy import select, func, or_
+from db import db
+from changes import ChangeFeedMirror, register_mirror
+from models.job import Job
+from models.tag import Tag, job_tags, parse_tags
+
+SUGGEST_FIELDS = ('title', 'company', 'location', 'tag')
+
+# Upper bound for limit, the cached best values per prefix are this many
+MAX_SUGGESTIONS = 50
+MAX_CACHED_PREFIXES = 2048
+
+WORD_RE = re.compile(r'\w+')
+
+
+def value_keys(value):
+    """Lowercased suffixes of a value starting at each of its words"""
+    lowered = value.lower()
+    return {lowered[match.start():] for match in WORD_RE.finditer(lowered)}
+
+
+class SuggestIndex(ChangeFeedMirror):
+    name = 'Suggest index'
+    fields = ('id', 'title', 'company', 'location', 'tags')
+
+    def __init__(self, sync_seconds=2.0):
+        super().__init__(sync_seconds)
+        self._app = None
+        self._loader = None
+        self._reset()
+
+    def init_app(self, app):
+        """Read the settings and start loading the values, CLI commands leave them unloaded"""
+        self.sync_seconds = app.config.get('SUGGEST_SYNC_SECONDS', self.sync_seconds)
+        self._app = app
+        self._loader = None
+        self._reset()
+        if click.get_current_context(silent=True) is None:
+            self.start_loading()
+
+    def start_loading(self):
+        """Load the values in a background thread unless one is already running in this process"""
+        with self._lock:
+            if self.ready or self._app is None or (self._loader is not None and self._loader.is_alive()):
+                return
+            self._loader = threading.Thread(target=self._load_in_background, name='suggest-loader', daemon=True)
+            self._loader.start()
+
+    def _load_in_background(self):
+        with self._app.app_context():
+            try:
+                self.load()
+            except Exception as e:
+                # Requests keep being answered from SQL, the next one tries again
+                print(f"Suggest index not loaded: {str(e)}")
+            finally:
+                db.session.remove()
+
+    def wait_until_loaded(self, timeout=None):
+        """Block until the background load ends, wsgi.py waits so forked workers inherit the values"""
+        loader = self._loader
+        if loader is not None:
+            loader.join(timeout)
+        return self.ready
+
+    def _reset(self):
+        self.ready = False
+        self.versions = {}  # Job id -> change_seq of the version applied, deleted jobs included
+        self.jobs = {}  # Job id -> values per field of the live jobs
+        self.counts = {field: {} for field in SUGGEST_FIELDS}  # Value -> jobs
+        self.entries = {field: [] for field in SUGGEST_FIELDS}  # Sorted (key, value) pairs
+        self.tag_names = {}  # Tag slug -> name shown, tags are counted by slug
+        self._best = {}  # (field, prefix) -> best (name, count) pairs
+
+    def refresh(self):
+        """Sync when the last sync is older than sync_seconds, restarts the load when it is not running"""
+        if not self.ready:
+            # A thread started before a fork does not run in the child
+            self.start_loading()
+            return
+        with self._lock:
+            self.sync_if_stale()
+
+    def _job_values(self, job):
+        slugs = []
+        for name in parse_tags(job.tags):
+            slug = Tag.slugify(name)
+            if slug not in slugs:
+                slugs.append(slug)
+                self.tag_names.setdefault(slug, name)
+        return (job.title,), (job.company,), (job.location,), tuple(slugs)
+
+    def _name(self, field, value):
+        return self.tag_names[value] if field == 'tag' else value
+
+    def _rebuild(self, jobs):
+        self._reset()
+        counters = {field: Counter() for field in SUGGEST_FIELDS}
+        for job in jobs:
+            self.versions[job.id] = job.change_seq or 0
+            values = self.jobs[job.id] = self._job_values(job)
+            for field, field_values in zip(SUGGEST_FIELDS, values):
+                counters[field].update(value for value in field_values if value)
+
+        for field, counter in counters.items():
+            self.counts[field] = dict(counter)
+            self.entries[field] = sorted(
+                (key, value) for value in counter for key in value_keys(self._name(field, value))
+            )
+        self.tag_names = {slug: name for slug, name in self.tag_names.items() if slug in self.counts['tag']}
+
+    def apply(self, job):
+        """Update the counts from a Job object or a change feed row, older versions are ignored"""
+        if not self.ready:
+            return
+        with self._lock:
+            seq = job.change_seq or 0
+            if self.versions.get(job.id, -1) > seq:
+                return
+            self.versions[job.id] = seq
+
+            before = self.jobs.pop(job.id, None)
+            after = None
+            if job.deleted_at is None:
+                after = self.jobs[job.id] = self._job_values(job)
+            for index, field in enumerate(SUGGEST_FIELDS):
+                old = before[index] if before else ()
+                new = after[index] if after else ()
+                if old == new:
+                    continue
+                # Adding first keeps a value both versions have from dropping to zero on the way
+                for value in new:
+                    if value:
+                        self._count(field, value, 1)
+                for value in old:
+                    if value:
+                        self._count(field, value, -1)
+
+    def _count(self, field, value, delta):
+        counts, entries = self.counts[field], self.entries[field]
+        keys = value_keys(self._name(field, value))
+        count = counts.get(value, 0) + delta
+        if count > 0:
+            if value not in counts:
+                for key in keys:
+                    insort(entries, (key, value))
+            counts[value] = count
+        else:
+            counts.pop(value, None)
+            for key in keys:
+                position = bisect_left(entries, (key, value))
+                if position < len(entries) and entries[position] == (key, value):
+                    del entries[position]
+            if field == 'tag':
+                self.tag_names.pop(value, None)
+
+        stale = [
+            cached for cached in self._best
+            if cached[0] == field and any(key.startswith(cached[1]) for key in keys)
+        ]
+        for cached in stale:
+            del self._best[cached]
+
+    def suggest(self, field, prefix, limit=10):
+        """Up to `limit` (value, jobs) pairs of a field with a word starting with prefix, most jobs first"""
+        prefix = prefix.lower().lstrip()
+        if not self.ready:
+            return query_suggestions(field, prefix, limit)
+        with self._lock:
+            best = self._best.get((field, prefix))
+            if best is None:
+                best = self._find(field, prefix)
+                if len(self._best) >= MAX_CACHED_PREFIXES:
+                    self._best.clear()
+                self._best[(field, prefix)] = best
+            return best[:limit]
+
+    def _find(self, field, prefix):
+        counts, entries = self.counts[field], self.entries[field]
+        if prefix:
+            values = set()
+            position = bisect_left(entries, (prefix,))
+            while position < len(entries) and entries[position][0].startswith(prefix):
+                values.add(entries[position][1])
+                position += 1
+        else:
+            values = counts
+
+        best = heapq.nsmallest(
+            MAX_SUGGESTIONS, values, key=lambda value: (-counts[value], self._name(field, value))
+        )
+        return [(self._name(field, value), counts[value]) for value in best]
+
+
+def query_suggestions(field, prefix, limit):
+    """
+    suggest() answered in SQL while the values are loading
+
+    Counts the live jobs per value, matching the prefix at the start of the value or after a
+    space. Words after other separators, as in "(Remote)", are only found by the index.
+    """
+    if field == 'tag':
+        value, name = Tag.slug, Tag.name
+        query = (
+            select(name, func.count())
+            .select_from(job_tags)
+            .join(Tag, Tag.id == job_tags.c.tag_id)
+            .join(Job, Job.id == job_tags.c.job_id)
+            .group_by(Tag.id, value, name)
+        )
+    else:
+        value = name = getattr(Job, field)
+        query = select(value, func.count()).group_by(value)
+
+    query = query.where(Job.deleted_at.is_(None))
+    if prefix:
+        query = query.where(or_(
+            func.lower(value).startswith(prefix, autoescape=True),
+            func.lower(value).contains(f' {prefix}', autoescape=True)
+        ))
+    rows = db.session.execute(query.order_by(func.count().desc(), name).limit(limit)).all()
+    return [(row[0], row[1]) for row in rows]
+
+
+suggest_index = register_mirror(SuggestIndex())
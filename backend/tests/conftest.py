@@ -0,0 +1,49 @@
+"""
+Shared pytest setup for the backend, run from the backend directory: python -m pytest tests
+
+Each test module gets apps on its own scratch SQLite databases.
+"""
+
+import os
+import sys
+
+import pytest
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.join(backend_dir, 'benchmarks'))
+
+
+@pytest.fixture(scope='module')
+def make_app(tmp_path_factory):
+    """
+    Build an app on a new scratch SQLite database, keyword arguments override config settings
+
+    The response cache and SQL logging are off unless a test turns them on.
+    """
+    import config
+    from app import create_app
+
+    def make(**settings):
+        database = tmp_path_factory.mktemp('db') / 'jobs.db'
+        settings = dict({
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database}',
+            'SQLALCHEMY_ENGINE_OPTIONS': config.engine_options('sqlite', 0, 0, 0),
+            'SQLALCHEMY_ECHO': False,
+            'CACHE_ENABLED': False,
+        }, **settings)
+        config.CONFIGS['testing'] = type('TestingConfig', (config.Config,), settings)
+        return create_app('testing')
+
+    yield make
+    config.CONFIGS.pop('testing', None)
+
+
+@pytest.fixture(scope='module')
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,57 @@
+"""
+Archiving: archived jobs leave the default lists and are read back with include_archived=true
+"""
+
+import pytest
+
+COMPANY = 'Archive Re'
+
+
+@pytest.fixture(scope='module')
+def archived(app):
+    """Ids of an old job moved to jobs_archive by archive-jobs and of a recent one left in jobs"""
+    client = app.test_client()
+    ids = {}
+    for title, posting_date in (('Old Actuary', '90 days ago'), ('New Actuary', '2 days ago')):
+        response = client.post('/api/jobs', json={
+            'title': title, 'company': COMPANY, 'location': 'London, UK', 'posting_date': posting_date
+        })
+        assert response.status_code == 201
+        ids[title] = response.get_json()['job']['id']
+
+    result = app.test_cli_runner().invoke(args=['archive-jobs', '--days', '30'])
+    assert result.exit_code == 0, result.output
+    assert '1 jobs moved to jobs_archive' in result.output
+    return ids['Old Actuary'], ids['New Actuary']
+
+
+def listed_ids(client, **args):
+    response = client.get('/api/jobs', query_string=dict(args, company=COMPANY))
+    assert response.status_code == 200
+    return [job['id'] for job in response.get_json()['jobs']]
+
+
+def test_list_excludes_archived(client, archived):
+    old_id, new_id = archived
+    assert listed_ids(client) == [new_id]
+    assert listed_ids(client, include_archived='false') == [new_id]
+
+
+def test_list_includes_archived(client, archived):
+    old_id, new_id = archived
+    # Sorted by posting date, newest first, an archived job keeps its id
+    assert listed_ids(client, include_archived='true') == [new_id, old_id]
+    assert listed_ids(client, include_archived='true', sort='posting_date_asc') == [old_id, new_id]
+    assert listed_ids(client, include_archived='true', limit=1) == [new_id]
+
+
+def test_get_job(client, archived):
+    old_id, new_id = archived
+    assert client.get(f'/api/jobs/{old_id}').status_code == 404
+
+    response = client.get(f'/api/jobs/{old_id}', query_string={'include_archived': 'true'})
+    assert response.status_code == 200
+    assert (response.get_json()['id'], response.get_json()['title']) == (old_id, 'Old Actuary')
+
+    response = client.get(f'/api/jobs/{new_id}', query_string={'include_archived': 'true'})
+    assert response.get_json()['title'] == 'New Actuary'
@@ -0,0 +1,79 @@
+"""
+Response cache of the read endpoints: ETags, conditional requests and invalidation by writes
+"""
+
+import time
+
+import pytest
+
+from replica import READ_PRIMARY_COOKIE
+
+
+@pytest.fixture(scope='module')
+def app(make_app):
+    return make_app(CACHE_ENABLED=True)
+
+
+def create_job(client, title):
+    response = client.post('/api/jobs', json={'title': title, 'company': 'Cache Re', 'location': 'London, UK'})
+    assert response.status_code == 201
+    return response
+
+
+def test_etag_and_not_modified(client):
+    create_job(client, 'Reserving Actuary')
+
+    first = client.get('/api/jobs')
+    assert first.status_code == 200
+    assert first.headers['X-Cache'] == 'MISS'
+    assert first.headers['ETag']
+
+    second = client.get('/api/jobs')
+    assert second.headers['X-Cache'] == 'HIT'
+    assert second.headers['ETag'] == first.headers['ETag']
+    assert second.get_data() == first.get_data()
+
+    response = client.get('/api/jobs', headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+
+
+def test_write_invalidates(client):
+    before = client.get('/api/jobs')
+    assert client.get('/api/jobs').headers['X-Cache'] == 'HIT'
+
+    create_job(client, 'Capital Actuary')
+
+    after = client.get('/api/jobs', headers={'If-None-Match': before.headers['ETag']})
+    assert after.status_code == 200
+    assert after.headers['X-Cache'] == 'MISS'
+    assert after.headers['ETag'] != before.headers['ETag']
+    assert 'Capital Actuary' in [job['title'] for job in after.get_json()['jobs']]
+
+
+def test_failed_write_keeps_entries(client):
+    client.get('/api/jobs/facets')
+    assert client.post('/api/jobs', json={'title': 'No company'}).status_code == 400
+    assert client.get('/api/jobs/facets').headers['X-Cache'] == 'HIT'
+
+
+def test_no_cache_control(client):
+    # Write responses are never cached or made conditional
+    response = create_job(client, 'Pricing Actuary')
+    assert 'Cache-Control' not in response.headers
+    assert 'ETag' not in response.headers
+    job_id = response.get_json()['job']['id']
+
+    # Cached reads are only cached in the process, clients are not told to keep them
+    client.get(f'/api/jobs/{job_id}')
+    response = client.get(f'/api/jobs/{job_id}')
+    assert response.headers['X-Cache'] == 'HIT'
+    assert 'Cache-Control' not in response.headers
+
+    # A client inside its read-your-writes window bypasses the cache
+    client.set_cookie(READ_PRIMARY_COOKIE, f'{time.time() + 30:.3f}')
+    response = client.get(f'/api/jobs/{job_id}')
+    assert response.status_code == 200
+    assert 'X-Cache' not in response.headers
+    assert 'ETag' not in response.headers
+    assert 'Cache-Control' not in response.headers
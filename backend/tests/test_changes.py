@@ -0,0 +1,103 @@
+"""
+Change feed: the cursor only moves forward, deletes come back as tombstones and revived jobs
+reappear under their old id
+"""
+
+from datetime import datetime, timedelta
+
+
+def create_job(client, title, company='Feed Re'):
+    response = client.post('/api/jobs', json={'title': title, 'company': company, 'location': 'London, UK'})
+    assert response.status_code == 201
+    return response.get_json()['job']['id']
+
+
+def feed(client, since, **args):
+    response = client.get('/api/jobs/changes', query_string=dict(args, since=since))
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def read_all(client, since):
+    """Follow the feed from since until has_more is false, returns (pages, final cursor)"""
+    pages = []
+    while True:
+        page = feed(client, since, limit=2)
+        assert page['next_since'] >= since
+        pages.append(page)
+        since = page['next_since']
+        if not page['has_more']:
+            return pages, since
+
+
+def current_seq(client):
+    return client.get('/api/jobs').get_json()['change_seq']
+
+
+def test_cursor_moves_forward(client):
+    start = current_seq(client)
+    ids = [create_job(client, f'Cursor Actuary {i}') for i in range(5)]
+
+    pages, cursor = read_all(client, start)
+    cursors = [start] + [page['next_since'] for page in pages]
+    assert cursors == sorted(set(cursors))
+    assert [job['id'] for page in pages for job in page['jobs']] == ids
+    assert cursor == current_seq(client)
+
+    # Nothing new, the cursor stays where it is
+    page = feed(client, cursor)
+    assert page == {'jobs': [], 'deleted': [], 'next_since': cursor, 'has_more': False}
+
+    # An update moves the job past the cursor, it appears once with its new state
+    assert client.put(f'/api/jobs/{ids[1]}', json={'location': 'Remote'}).status_code == 200
+    page = feed(client, cursor)
+    assert [(job['id'], job['location']) for job in page['jobs']] == [(ids[1], 'Remote')]
+    assert page['next_since'] > cursor
+
+
+def test_delete_is_tombstone(client):
+    job_id = create_job(client, 'Tombstone Actuary')
+    cursor = current_seq(client)
+
+    assert client.delete(f'/api/jobs/{job_id}').status_code == 200
+    page = feed(client, cursor)
+    assert page['deleted'] == [job_id]
+    assert page['jobs'] == []
+    assert page['next_since'] > cursor
+
+    # A first sync has nothing to delete and gets no tombstones
+    assert job_id not in feed(client, 0)['deleted']
+
+
+def test_revived_job_reappears(client):
+    job_id = create_job(client, 'Revived Actuary')
+    assert client.delete(f'/api/jobs/{job_id}').status_code == 200
+    cursor = current_seq(client)
+
+    assert create_job(client, 'Revived Actuary') == job_id
+    page = feed(client, cursor)
+    assert [job['id'] for job in page['jobs']] == [job_id]
+    assert page['deleted'] == []
+    assert job_id in [job['id'] for job in feed(client, 0)['jobs']]
+
+
+def test_purged_history(app, client):
+    from changes import purge_tombstones
+    from db import db
+
+    cursor = current_seq(client)
+    job_id = create_job(client, 'Purged Actuary')
+    assert client.delete(f'/api/jobs/{job_id}').status_code == 200
+    with app.app_context():
+        assert purge_tombstones(datetime.utcnow() + timedelta(minutes=1)) > 0
+        db.session.commit()
+
+    response = client.get('/api/jobs/changes', query_string={'since': cursor})
+    assert response.status_code == 410
+    assert feed(client, current_seq(client))['has_more'] is False
+
+
+def test_bad_arguments(client):
+    assert client.get('/api/jobs/changes?since=abc').status_code == 400
+    assert client.get('/api/jobs/changes?since=-1').status_code == 400
+    assert client.get('/api/jobs/changes?limit=0').status_code == 400
@@ -0,0 +1,100 @@
+"""
+Streaming export: filters, CSV and NDJSON bodies spread over several batches, download headers
+"""
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from query_plan_check import seed_jobs
+
+SEED_ROWS = 120
+BATCH_SIZE = 10
+
+
+@pytest.fixture(scope='module')
+def app(make_app):
+    from bulk import upsert_jobs
+
+    app = make_app()
+    with app.app_context():
+        upsert_jobs(seed_jobs(SEED_ROWS))
+    return app
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setattr('routes.job_routes.EXPORT_BATCH_SIZE', BATCH_SIZE)
+
+
+def expected_titles(job_type=None, tag=None):
+    return sorted(
+        job['title'] for job in seed_jobs(SEED_ROWS)
+        if (job_type is None or job['job_type'] == job_type)
+        and (tag is None or tag in job['tags'].split(','))
+    )
+
+
+def export(client, **args):
+    """The response and its body chunks as they were streamed"""
+    response = client.get('/api/jobs/export', query_string=args, buffered=False)
+    assert response.status_code == 200
+    chunks = list(response.response)
+    response.close()
+    return response, chunks
+
+
+def test_ndjson(client):
+    response, chunks = export(client)
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=jobs.ndjson'
+    assert len(chunks) > 1
+
+    # Every chunk ends on a row boundary
+    assert all(chunk.endswith(b'\n') for chunk in chunks)
+    rows = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+    assert sorted(row['title'] for row in rows) == expected_titles()
+    assert [row['id'] for row in rows] == sorted(row['id'] for row in rows)
+
+
+def test_csv(client):
+    response, chunks = export(client, format='csv')
+    assert response.mimetype == 'text/csv'
+    assert response.headers['Content-Disposition'] == 'attachment; filename=jobs.csv'
+    assert len(chunks) > 1
+
+    rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode())))
+    assert sorted(row['title'] for row in rows) == expected_titles()
+    assert {row['tags'] for row in rows} == {'Life,SQL', 'Life,Pricing', 'P&C', 'Health,SQL'}
+
+
+@pytest.mark.parametrize('export_format', ['ndjson', 'csv'])
+def test_filters(client, export_format):
+    _, chunks = export(client, format=export_format, job_type='Contract', tag='SQL')
+    body = b''.join(chunks).decode()
+    if export_format == 'csv':
+        rows = list(csv.DictReader(io.StringIO(body)))
+    else:
+        rows = [json.loads(line) for line in body.splitlines()]
+    assert sorted(row['title'] for row in rows) == expected_titles('Contract', 'SQL')
+
+
+def test_empty_csv_has_header(client):
+    _, chunks = export(client, format='csv', location='Atlantis')
+    assert b''.join(chunks).decode().splitlines() == [
+        'id,title,company,location,posting_date,posted_at,job_type,tags,created_at,updated_at'
+    ]
+
+
+def test_gzip(client):
+    response, chunks = export(client, gzip='true')
+    assert response.headers['Content-Encoding'] == 'gzip'
+    lines = gzip.decompress(b''.join(chunks)).decode().splitlines()
+    assert sorted(json.loads(line)['title'] for line in lines) == expected_titles()
+
+
+def test_bad_format(client):
+    assert client.get('/api/jobs/export?format=xml').status_code == 400
@@ -0,0 +1,84 @@
+"""
+Query plans of the job list, the change feed and the scraper's upsert lookup
+
+The pytest form of benchmarks/query_plan_check.py, one test per request shape. A request fails
+when one of its SELECT statements reads jobs, tags or job_tags with a full table scan, or walks
+all of jobs and then sorts it.
+"""
+
+import itertools
+from urllib.parse import urlencode
+
+import pytest
+
+from query_plan_check import FILTERS, SORTS, PAGING, seed_jobs, plan_problems, capture_selects, explain, list_request
+
+SEED_ROWS = 2000
+
+
+@pytest.fixture(scope='module')
+def seeded(app):
+    """The app with SEED_ROWS jobs and the list its SELECT statements are recorded to"""
+    from db import db
+    from bulk import upsert_jobs
+
+    with app.app_context():
+        upsert_jobs(seed_jobs(SEED_ROWS))
+        statements = capture_selects(db.engine)
+    return app, statements
+
+
+def plan_failures(app, statements, run):
+    """Run a request and describe each SELECT it ran with a full scan in its plan"""
+    with app.app_context():
+        statements.clear()
+        response = run()
+        if response is not None:
+            assert response.status_code == 200, response.get_json()
+
+        failures = []
+        for statement, parameters in list(statements):
+            plan = explain(statement, parameters)
+            problems = plan_problems(plan)
+            if problems:
+                failures.append('\n'.join(['; '.join(problems), statement, *plan]))
+        return failures
+
+
+def shape_id(shape):
+    filters, sort, paging = shape
+    return f"{urlencode(filters) or 'unfiltered'}-{sort or 'default'}-{paging}"
+
+
+@pytest.mark.parametrize('shape', list(itertools.product(FILTERS, SORTS, PAGING)), ids=shape_id)
+def test_job_list(seeded, shape):
+    app, statements = seeded
+    client = app.test_client()
+    request = list_request(client, *shape)
+    if request is None:
+        pytest.skip('no second page to follow')
+
+    _, url, scan_expected = request
+    failures = plan_failures(app, statements, lambda: client.get(url))
+    if not scan_expected:
+        assert not failures, '\n\n'.join(failures)
+
+
+@pytest.mark.parametrize('since', [0, SEED_ROWS // 2])
+def test_changes(seeded, since):
+    app, statements = seeded
+    client = app.test_client()
+    failures = plan_failures(app, statements, lambda: client.get(f'/api/jobs/changes?since={since}'))
+    assert not failures, '\n\n'.join(failures)
+
+
+def test_upsert_lookup(seeded):
+    from bulk import upsert_jobs
+
+    def rescrape():
+        # Known jobs with a new posting date go through the scraper's (title, company) lookups
+        upsert_jobs([dict(job, posting_date='Recently posted') for job in seed_jobs(SEED_ROWS)[:500]])
+
+    app, statements = seeded
+    failures = plan_failures(app, statements, rescrape)
+    assert not failures, '\n\n'.join(failures)
@@ -0,0 +1,67 @@
+"""
+Read replica routing with a primary and a replica SQLite file
+
+The replica is a copy made with sync-replica and is not updated by writes, so a job created
+afterwards shows which file a request read from.
+"""
+
+import sqlite3
+
+import pytest
+
+from replica import READ_PRIMARY_COOKIE
+
+NEW_JOB = {'title': 'Pricing Actuary', 'company': 'Replica Re', 'location': 'London, UK'}
+
+
+@pytest.fixture(scope='module')
+def replicated(make_app, tmp_path_factory):
+    """The app with its replica file, the replica is copied before any job exists"""
+    replica = tmp_path_factory.mktemp('replica') / 'replica.db'
+    app = make_app(SQLALCHEMY_BINDS={'replica': f'sqlite:///{replica}'}, READ_YOUR_WRITES_SECONDS=30)
+    result = app.test_cli_runner().invoke(args=['sync-replica'])
+    assert result.exit_code == 0, result.output
+    return app, replica
+
+
+def stored_titles(path):
+    with sqlite3.connect(path) as connection:
+        return [title for (title,) in connection.execute('SELECT title FROM jobs WHERE deleted_at IS NULL')]
+
+
+def test_routing(replicated):
+    app, replica = replicated
+    primary = app.config['SQLALCHEMY_DATABASE_URI'].removeprefix('sqlite:///')
+    writer = app.test_client()
+
+    # Writes go to the primary
+    response = writer.post('/api/jobs', json=NEW_JOB)
+    assert response.status_code == 201
+    assert response.headers['X-DB-Bind'] == 'primary'
+    assert stored_titles(primary) == [NEW_JOB['title']]
+    assert stored_titles(replica) == []
+
+    # Other clients read from the replica, which has not seen the write
+    response = app.test_client().get('/api/jobs')
+    assert response.headers['X-DB-Bind'] == 'replica'
+    assert response.get_json()['jobs'] == []
+
+    # The writer's cookie pins its next reads to the primary
+    assert writer.get_cookie(READ_PRIMARY_COOKIE) is not None
+    response = writer.get('/api/jobs')
+    assert response.headers['X-DB-Bind'] == 'primary'
+    assert [job['title'] for job in response.get_json()['jobs']] == [NEW_JOB['title']]
+
+    # Until the replica catches up
+    app.test_cli_runner().invoke(args=['sync-replica'])
+    response = app.test_client().get('/api/jobs')
+    assert response.headers['X-DB-Bind'] == 'replica'
+    assert [job['title'] for job in response.get_json()['jobs']] == [NEW_JOB['title']]
+
+
+def test_failed_write_sets_no_cookie(replicated):
+    app, _ = replicated
+    client = app.test_client()
+    assert client.post('/api/jobs', json={'title': 'No company'}).status_code == 400
+    assert client.get_cookie(READ_PRIMARY_COOKIE) is None
+    assert client.get('/api/jobs').headers['X-DB-Bind'] == 'replica'
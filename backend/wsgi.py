@@ -0,0 +1,86 @@
+"""
+Production entry point
+
+Serves create_app() with the production profile (APP_ENV=production unless set otherwise).
+Running this file starts gunicorn with several worker processes, each with a thread pool, or
+waitress with a thread pool on Windows where gunicorn does not run:
+
+    python wsgi.py --workers 4 --threads 8 --port 5000
+
+WEB_WORKERS, WEB_THREADS, HOST and PORT set the defaults. Any other WSGI server can load
+`wsgi:app`, e.g. gunicorn --preload -w 4 --threads 8 -b 0.0.0.0:5000 wsgi:app
+"""
+
+import argparse
+import os
+
+os.environ.setdefault('APP_ENV', 'production')
+
+from app import create_app
+from db import db
+from suggest import suggest_index
+
+app = create_app()
+
+# Forked workers do not inherit the loading thread, finish the typeahead values first so they
+# start with a copy
+suggest_index.wait_until_loaded()
+
+# Startup (create_all, migrations, the suggest load) used pooled connections of the primary and
+# the replica, close them so every forked worker opens its own instead of sharing the parent's sockets
+with app.app_context():
+    for engine in db.engines.values():
+        engine.dispose()
+
+
+def serve_gunicorn(host, port, workers, threads):
+    from gunicorn.app.base import BaseApplication
+
+    class ProductionServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('preload_app', True)  # app is created once above, not in every worker
+
+        def load(self):
+            return app
+
+    ProductionServer().run()
+
+
+def serve_waitress(host, port, threads):
+    from waitress import serve
+    serve(app, host=host, port=port, threads=threads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the API with a production WSGI server')
+    parser.add_argument('--host', default=os.getenv('HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(os.getenv('PORT', '5000')))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('WEB_WORKERS', str(os.cpu_count() * 2 + 1))),
+                        help='Worker processes (gunicorn only)')
+    parser.add_argument('--threads', type=int, default=app.config['WEB_THREADS'],
+                        help='Threads per worker, keep at or below the DB_POOL_SIZE connections of each worker')
+    args = parser.parse_args()
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        gunicorn = None
+
+    if gunicorn is not None and os.name != 'nt':
+        print(f"Serving on http://{args.host}:{args.port} with gunicorn, {args.workers} workers x {args.threads} threads")
+        serve_gunicorn(args.host, args.port, args.workers, args.threads)
+        return
+
+    try:
+        import waitress  # noqa: F401
+    except ImportError:
+        raise SystemExit('Install a production server first: pip install gunicorn (Linux/macOS) or pip install waitress')
+    print(f"Serving on http://{args.host}:{args.port} with waitress, {args.threads} threads")
+    serve_waitress(args.host, args.port, args.threads)
+
+
+if __name__ == '__main__':
+    main()
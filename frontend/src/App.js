@@ -3,7 +3,18 @@ import './App.css';
 import JobList from './components/JobList';
 import JobForm from './components/JobForm';
 import FilterSort from './components/FilterSort';
-import { getJobs, createJob, updateJob, deleteJob } from './api';
+import { getJobs, getChanges, createJob, updateJob, deleteJob } from './api';
+
+// Filters the change feed cannot be applied under, a changed job may move in or out of them
+const SERVER_FILTERS = ['job_type', 'location', 'tag', 'search'];
+
+// Same order as the API's posting date sort, newest first unless sorting ascending
+const sortJobs = (jobs, sort) => {
+  const direction = sort === 'posting_date_asc' ? 1 : -1;
+  return [...jobs].sort((a, b) => direction * (
+    (a.posted_at || '').localeCompare(b.posted_at || '') || a.id - b.id
+  ));
+};
 
 function App() {
   const [jobs, setJobs] = useState([]);
@@ -14,6 +25,7 @@ function App() {
   const [jobToEdit, setJobToEdit] = useState(null);
   const [successMessage, setSuccessMessage] = useState('');
   const [currentFilters, setCurrentFilters] = useState({});
+  const [changeSeq, setChangeSeq] = useState(null);
 
   // Fetch jobs on component mount
   useEffect(() => {
@@ -28,6 +40,7 @@ function App() {
       const response = await getJobs(filters);
       setJobs(response.jobs);
       setFilteredJobs(response.jobs);
+      setChangeSeq(response.change_seq ?? null);
     } catch (err) {
       setError(err.message || 'Failed to fetch jobs. Please try again.');
     } finally {
@@ -35,6 +48,34 @@ function App() {
     }
   };
 
+  // Pull only the jobs changed since the last fetch and merge them into the list,
+  // filtered lists and an expired change history fall back to a full refetch
+  const syncJobs = async () => {
+    if (changeSeq === null || SERVER_FILTERS.some((name) => currentFilters[name])) {
+      await fetchJobs(currentFilters);
+      return;
+    }
+    
+    try {
+      let since = changeSeq;
+      let merged = jobs;
+      let changes;
+      do {
+        changes = await getChanges(since);
+        const gone = new Set([...changes.jobs.map((job) => job.id), ...changes.deleted]);
+        merged = merged.filter((job) => !gone.has(job.id)).concat(changes.jobs);
+        since = changes.next_since;
+      } while (changes.has_more);
+      
+      merged = sortJobs(merged, currentFilters.sort);
+      setJobs(merged);
+      setFilteredJobs(merged);
+      setChangeSeq(since);
+    } catch (err) {
+      await fetchJobs(currentFilters);
+    }
+  };
+
   // Handle filter changes
   const handleFilterChange = (filters) => {
     setCurrentFilters(filters);
@@ -60,8 +101,8 @@ function App() {
     try {
       const response = await createJob(jobData);
       
-      // Refresh job list with current filters
-      await fetchJobs(currentFilters);
+      // Bring the job list up to date with the changes since it was fetched
+      await syncJobs();
       
       setShowForm(false);
       showSuccessMessage('Job created successfully!');
@@ -77,8 +118,8 @@ function App() {
       
       await updateJob(jobToEdit.id, jobData);
       
-      // Refresh job list with current filters
-      await fetchJobs(currentFilters);
+      // Bring the job list up to date with the changes since it was fetched
+      await syncJobs();
       
       setJobToEdit(null);
       setShowForm(false);
@@ -93,8 +134,8 @@ function App() {
     try {
       await deleteJob(jobId);
       
-      // Refresh job list with current filters
-      await fetchJobs(currentFilters);
+      // Bring the job list up to date with the changes since it was fetched
+      await syncJobs();
       
       showSuccessMessage('Job deleted successfully!');
     } catch (err) {
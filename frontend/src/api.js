@@ -24,11 +24,14 @@ export const getJobs = async (filters = {}) => {
     if (filters.tag) queryParams.append('tag', filters.tag);
     if (filters.search) queryParams.append('search', filters.search);
     if (filters.sort) queryParams.append('sort', filters.sort);
+    if (filters.limit) queryParams.append('limit', filters.limit);
+    if (filters.cursor) queryParams.append('cursor', filters.cursor);
     
     const url = `${API_BASE_URL}/jobs${queryParams.toString() ? '?' + queryParams.toString() : ''}`;
     
     const response = await fetch(url, {
       method: 'GET',
+      credentials: 'include',
       headers: {
         'Content-Type': 'application/json',
       },
@@ -41,11 +44,87 @@ export const getJobs = async (filters = {}) => {
   }
 };
 
+// GET job counts per job_type, location and tag for the current filters
+export const getFacets = async (filters = {}) => {
+  try {
+    const queryParams = new URLSearchParams();
+    
+    if (filters.job_type) queryParams.append('job_type', filters.job_type);
+    if (filters.location) queryParams.append('location', filters.location);
+    if (filters.tag) queryParams.append('tag', filters.tag);
+    if (filters.search) queryParams.append('search', filters.search);
+    
+    const url = `${API_BASE_URL}/jobs/facets${queryParams.toString() ? '?' + queryParams.toString() : ''}`;
+    
+    const response = await fetch(url, {
+      method: 'GET',
+      credentials: 'include',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+    });
+    
+    return await handleResponse(response);
+  } catch (error) {
+    console.error('Error fetching facets:', error);
+    throw error;
+  }
+};
+
+// GET the most common titles, companies, locations or tags with a word starting with prefix
+export const getSuggestions = async (field, prefix, limit) => {
+  try {
+    const queryParams = new URLSearchParams();
+    
+    queryParams.append('field', field);
+    queryParams.append('prefix', prefix);
+    if (limit) queryParams.append('limit', limit);
+    
+    const response = await fetch(`${API_BASE_URL}/jobs/suggest?${queryParams.toString()}`, {
+      method: 'GET',
+      credentials: 'include',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+    });
+    
+    return await handleResponse(response);
+  } catch (error) {
+    console.error('Error fetching suggestions:', error);
+    throw error;
+  }
+};
+
+// GET jobs created, updated or deleted after a change sequence, e.g. the change_seq of a
+// getJobs response. Answers 410 when that point is older than the kept change history
+export const getChanges = async (since, limit) => {
+  try {
+    const queryParams = new URLSearchParams();
+    
+    queryParams.append('since', since);
+    if (limit) queryParams.append('limit', limit);
+    
+    const response = await fetch(`${API_BASE_URL}/jobs/changes?${queryParams.toString()}`, {
+      method: 'GET',
+      credentials: 'include',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+    });
+    
+    return await handleResponse(response);
+  } catch (error) {
+    console.error('Error fetching job changes:', error);
+    throw error;
+  }
+};
+
 // GET single job by ID
 export const getJobById = async (jobId) => {
   try {
     const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`, {
       method: 'GET',
+      credentials: 'include',
       headers: {
         'Content-Type': 'application/json',
       },
@@ -63,6 +142,7 @@ export const createJob = async (jobData) => {
   try {
     const response = await fetch(`${API_BASE_URL}/jobs`, {
       method: 'POST',
+      credentials: 'include',
       headers: {
         'Content-Type': 'application/json',
       },
@@ -81,6 +161,7 @@ export const updateJob = async (jobId, jobData) => {
   try {
     const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`, {
       method: 'PUT',
+      credentials: 'include',
       headers: {
         'Content-Type': 'application/json',
       },
@@ -99,6 +180,7 @@ export const deleteJob = async (jobId) => {
   try {
     const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`, {
       method: 'DELETE',
+      credentials: 'include',
       headers: {
         'Content-Type': 'application/json',
       },
@@ -114,6 +196,9 @@ export const deleteJob = async (jobId) => {
 export default {
   getJobs,
   getJobById,
+  getFacets,
+  getSuggestions,
+  getChanges,
   createJob,
   updateJob,
   deleteJob,
@@ -1,6 +1,16 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
+import { getSuggestions, getFacets } from '../api';
 import './FilterSort.css';
 
+// Inputs offering typeahead values and the suggest field each one reads
+const SUGGEST_FIELDS = {
+  search: 'title',
+  location: 'location',
+  tag: 'tag'
+};
+
+const JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship'];
+
 const FilterSort = ({ onFilterChange, onReset }) => {
   const [filters, setFilters] = useState({
     search: '',
@@ -11,6 +21,44 @@ const FilterSort = ({ onFilterChange, onReset }) => {
   });
 
   const [isExpanded, setIsExpanded] = useState(false);
+  const [suggestions, setSuggestions] = useState({ search: [], location: [], tag: [] });
+  const [facets, setFacets] = useState(null);
+  const facetRequest = useRef(0);
+
+  // Job counts per option under the current filters. The job type counts leave the job type
+  // filter out, picking another type replaces it rather than narrowing it
+  const loadFacets = async (current) => {
+    const request = ++facetRequest.current;
+    try {
+      const data = await getFacets(current);
+      const typeData = current.job_type ? await getFacets({ ...current, job_type: '' }) : data;
+      // A slower response to an earlier change must not overwrite a newer one
+      if (request === facetRequest.current) {
+        setFacets({ ...data.facets, job_type: typeData.facets.job_type });
+      }
+    } catch (error) {
+      // Counts are optional, the filters keep working without them
+    }
+  };
+
+  useEffect(() => {
+    loadFacets(filters);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  const facetCount = (facet, value) => {
+    const entry = facets && facets[facet].find((item) => item.value === value);
+    return entry ? entry.count : 0;
+  };
+
+  const loadSuggestions = async (name, value) => {
+    try {
+      const data = await getSuggestions(SUGGEST_FIELDS[name], value, 8);
+      setSuggestions((current) => ({ ...current, [name]: data.suggestions }));
+    } catch (error) {
+      // Suggestions are optional, the input keeps working without them
+    }
+  };
 
   const handleChange = (e) => {
     const { name, value } = e.target;
@@ -20,6 +68,27 @@ const FilterSort = ({ onFilterChange, onReset }) => {
     };
     setFilters(newFilters);
     onFilterChange(newFilters);
+    if (SUGGEST_FIELDS[name] && value.trim()) {
+      loadSuggestions(name, value);
+    }
+    if (name !== 'sort') {
+      loadFacets(newFilters);
+    }
+  };
+
+  // Typed text gets typeahead values, an empty location or tag input the values most common
+  // under the other filters
+  const renderSuggestions = (name) => {
+    const options = filters[name].trim() || !facets || !facets[name] ? suggestions[name] : facets[name];
+    return (
+      <datalist id={`${name}-suggestions`}>
+        {options.map((option) => (
+          <option key={option.value} value={option.value}>
+            {option.count} jobs
+          </option>
+        ))}
+      </datalist>
+    );
   };
 
   const handleReset = () => {
@@ -32,6 +101,7 @@ const FilterSort = ({ onFilterChange, onReset }) => {
     };
     setFilters(resetFilters);
     onReset();
+    loadFacets(resetFilters);
   };
 
   const hasActiveFilters = filters.search || filters.job_type || filters.location || filters.tag;
@@ -59,11 +129,13 @@ const FilterSort = ({ onFilterChange, onReset }) => {
             type="text"
             id="search"
             name="search"
+            list="search-suggestions"
             value={filters.search}
             onChange={handleChange}
             placeholder="e.g. Actuary, Pricing Analyst..."
             className="filter-input"
           />
+          {renderSuggestions('search')}
         </div>
 
         <div className="filter-row">
@@ -80,10 +152,11 @@ const FilterSort = ({ onFilterChange, onReset }) => {
               className="filter-select"
             >
               <option value="">All Types</option>
-              <option value="Full-time">Full-time</option>
-              <option value="Part-time">Part-time</option>
-              <option value="Contract">Contract</option>
-              <option value="Internship">Internship</option>
+              {JOB_TYPES.map((jobType) => (
+                <option key={jobType} value={jobType}>
+                  {facets ? `${jobType} (${facetCount('job_type', jobType)})` : jobType}
+                </option>
+              ))}
             </select>
           </div>
 
@@ -96,11 +169,13 @@ const FilterSort = ({ onFilterChange, onReset }) => {
               type="text"
               id="location"
               name="location"
+              list="location-suggestions"
               value={filters.location}
               onChange={handleChange}
               placeholder="e.g. London, Remote..."
               className="filter-input"
             />
+            {renderSuggestions('location')}
           </div>
 
           {/* Tag Filter */}
@@ -112,11 +187,13 @@ const FilterSort = ({ onFilterChange, onReset }) => {
               type="text"
               id="tag"
               name="tag"
+              list="tag-suggestions"
               value={filters.tag}
               onChange={handleChange}
               placeholder="e.g. Life, Health, Pricing..."
               className="filter-input"
             />
+            {renderSuggestions('tag')}
           </div>
 
           {/* Sort Options */}
@@ -133,6 +210,7 @@ const FilterSort = ({ onFilterChange, onReset }) => {
             >
               <option value="posting_date_desc">Date: Newest First</option>
               <option value="posting_date_asc">Date: Oldest First</option>
+              <option value="relevance">Most Relevant (when searching)</option>
             </select>
           </div>
         </div>